@@ -9,7 +9,8 @@ class PlaywrightCodeGenerator:
     Generate a Playwright Python test that:
       - replays the given test plan,
       - prints detailed logs to the console,
-      - saves a JSON log file with per-step execution data into ../logs
+      - streams a JSONL log with per-step execution data into ../logs
+        and a JUnit XML report into ../logs/junit
         (i.e. the logs directory inside playwright_ai).
     """
 
@@ -24,27 +25,65 @@ class PlaywrightCodeGenerator:
         lines.extend(
             [
                 "from playwright.sync_api import sync_playwright\n",
+                "from contextlib import contextmanager\n",
+                "import xml.etree.ElementTree as ET\n",
                 "import time\n",
                 "import os\n",
                 "import json\n",
                 "\n",
-                "def _write_json_log(test_name, step_results):\n",
-                "    \"\"\"Write step_results as JSON into ../logs/<test_name>.json\"\"\"\n",
+                "def _write_junit(test_name, step_results, junit_path):\n",
+                "    \"\"\"Write one JUnit <testsuite> with a <testcase> per step.\"\"\"\n",
+                "    failures = sum(1 for r in step_results if r['status'] == 'failed')\n",
+                "    total = sum(r['duration'] for r in step_results)\n",
+                "    suite = ET.Element('testsuite', name=test_name, tests=str(len(step_results)),\n",
+                "                       failures=str(failures), time=f'{total:.3f}')\n",
+                "    # tells web_complexity_lab that the testcases below are steps of one test\n",
+                "    props = ET.SubElement(suite, 'properties')\n",
+                "    ET.SubElement(props, 'property', name='wcx.granularity', value='steps')\n",
+                "    for r in step_results:\n",
+                "        case = ET.SubElement(suite, 'testcase', classname=test_name,\n",
+                "                             name=f\"step {r['step']}: {r['action']} {r['selector']}\",\n",
+                "                             time=f\"{r['duration']:.3f}\")\n",
+                "        if r['status'] == 'failed':\n",
+                "            failure = ET.SubElement(case, 'failure', message=r['error'].splitlines()[0] if r['error'] else '')\n",
+                "            failure.text = r['error']\n",
+                "    ET.ElementTree(suite).write(junit_path, encoding='utf-8', xml_declaration=True)\n",
+                "    print(f'JUnit XML written to: {junit_path}')\n",
+                "\n",
+                "@contextmanager\n",
+                "def _step_log(test_name):\n",
+                "    \"\"\"\n",
+                "    Stream steps into ../logs/<test_name>.jsonl (one compact line per step,\n",
+                "    flushed immediately) and write ../logs/junit/<test_name>.xml on exit,\n",
+                "    also when the test crashes midway.\n",
+                "    \"\"\"\n",
                 "    # __file__ points to tests/generated/test_*.py\n",
                 "    root_dir = os.path.dirname(os.path.dirname(__file__))  # .../playwright_ai\n",
                 "    logs_dir = os.path.join(root_dir, 'logs')\n",
-                "    os.makedirs(logs_dir, exist_ok=True)\n",
-                "    log_path = os.path.join(logs_dir, f'{test_name}.json')\n",
+                "    os.makedirs(os.path.join(logs_dir, 'junit'), exist_ok=True)\n",
+                "    log_path = os.path.join(logs_dir, f'{test_name}.jsonl')\n",
+                "    step_results = []\n",
                 "    with open(log_path, 'w', encoding='utf-8') as f:\n",
-                "        json.dump(step_results, f, indent=2)\n",
-                "    print(f'JSON log written to: {log_path}')\n",
+                "        def log_step(result):\n",
+                "            f.write(json.dumps(result, separators=(',', ':')) + '\\n')\n",
+                "            f.flush()\n",
+                "            step_results.append(result)\n",
+                "        try:\n",
+                "            yield log_step\n",
+                "        finally:\n",
+                "            print(f'JSONL log written to: {log_path}')\n",
+                "            _write_junit(test_name, step_results, os.path.join(logs_dir, 'junit', f'{test_name}.xml'))\n",
                 "\n",
                 "def test_generated_ui():\n",
-                "    # Use the filename (without .py) as the name for the JSON log.\n",
+                "    # Use the filename (without .py) as the name for the logs.\n",
                 "    test_name = os.path.splitext(os.path.basename(__file__))[0]\n",
-                "    step_results = []  # one entry per click step\n",
-                "    with sync_playwright() as p:\n",
-                "        browser = p.chromium.launch(headless=False)\n",
+                "    with _step_log(test_name) as log_step, sync_playwright() as p:\n",
+                "        # Attach to a shared browser server when run by `wcx run-tests`\n",
+                "        ws_endpoint = os.environ.get('PW_WS_ENDPOINT')\n",
+                "        if ws_endpoint:\n",
+                "            browser = p.chromium.connect(ws_endpoint)\n",
+                "        else:\n",
+                "            browser = p.chromium.launch(headless=False)\n",
                 "        context = browser.new_context()\n",
                 "        page = context.new_page()\n",
                 f"        page.goto('{base_url}', wait_until='domcontentloaded')\n",
@@ -85,7 +124,7 @@ class PlaywrightCodeGenerator:
             lines.append("            print('ERROR:', error)\n")
             lines.append("        print('New URL:', url)\n")
             lines.append("        print('DOM length:', dom_length)\n")
-            lines.append("        step_results.append({\n")
+            lines.append("        log_step({\n")
             lines.append("            'step': %d,\n" % step_index)
             lines.append("            'action': 'click',\n")
             lines.append("            'selector': selector,\n")
@@ -102,7 +141,6 @@ class PlaywrightCodeGenerator:
         lines.extend(
             [
                 "        print('\\n=== FINISHED GENERATED COFFEE SHOP TEST ===')\n",
-                "        _write_json_log(test_name, step_results)\n",
                 "        browser.close()\n",
                 "\n",
                 "if __name__ == '__main__':\n",
@@ -2,6 +2,7 @@ from env.coffee_env import CoffeePlaywrightEnv
 from agents.random_agent import RandomAgent
 from generation.test_plan_builder import TestPlanBuilder
 from generation.playwright_code_generator import PlaywrightCodeGenerator
+from generation.selector_ranker import SelectorRanker
 import os
 
 BASE_URL = "http://localhost:5500/dist/index.html"
@@ -13,6 +14,9 @@ trace = agent.run()
 builder = TestPlanBuilder()
 test_plan = builder.build_test_plan(trace)
 
+# Swap brittle selectors (bare "a", has-text, nth) for the most stable unique locator
+SelectorRanker(env.page).rank_plan(test_plan, BASE_URL)
+
 print("Generated Test Plan:", test_plan)
 
 output_file = os.path.join("tests", "generated", "test_generated_ui.py")
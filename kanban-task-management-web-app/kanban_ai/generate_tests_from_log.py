@@ -1,8 +1,10 @@
+import argparse
 import json
 from pathlib import Path
 
 LOG_PATH = Path("logs/kanban_explore.jsonl")
 OUT_TEST_PATH = Path("tests_generated/test_kanban_generated.py")
+OUT_SPEC_PATH = Path("tests_generated/kanban-generated.spec.ts")
 BASE_URL = "http://localhost:3000"
 
 
@@ -25,22 +27,123 @@ def load_log():
 
 def action_to_code(step_index, action):
     """
-    Turn a logged action into a Playwright line of code.
+    Turn a logged action into a timed, logged Playwright step.
     """
-    comment = f"    # Step {step_index}: {action.get('description', '').replace('#', '').strip()}\n"
+    comment = f"        # Step {step_index}: {action.get('description', '').replace('#', '').strip()}\n"
 
     if action["strategy"] == "role":
         role = action["role"]
         name = action["name"].replace('"', '\\"')
-        line = f'    page.get_by_role("{role}", name="{name}").click()\n'
+        locator = f'page.get_by_role("{role}", name="{name}")'
+        selector = f"role={role}[name={json.dumps(action['name'], ensure_ascii=False)}]"
     else:
-        selector = action["selector"].replace('"', '\\"')
-        line = f'    page.locator("{selector}").first.click()\n'
+        selector = action["selector"]
+        locator = f'page.locator({json.dumps(selector, ensure_ascii=False)}).first'
 
-    return comment + line
+    return comment + (
+        f"        selector = {json.dumps(selector, ensure_ascii=False)}\n"
+        "        start = time.time()\n"
+        "        try:\n"
+        f"            {locator}.click()\n"
+        "            status = 'passed'\n"
+        "            error = ''\n"
+        "        except Exception as e:\n"
+        "            status = 'failed'\n"
+        "            error = str(e)\n"
+        "        log_step({\n"
+        f"            'step': {step_index},\n"
+        "            'action': 'click',\n"
+        "            'selector': selector,\n"
+        "            'status': status,\n"
+        "            'error': error,\n"
+        "            'duration': time.time() - start,\n"
+        "            'url': page.url,\n"
+        "            'dom_length': len(page.content()),\n"
+        "        })\n\n"
+    )
 
 
-def generate():
+# Written at the top of every generated test: the same JSONL step log and
+# JUnit report as the Movies and Coffee Shop generators, under ../logs.
+STEP_LOG_HELPERS = """\
+def _write_junit(test_name, step_results, junit_path):
+    \"\"\"Write one JUnit <testsuite> with a <testcase> per step.\"\"\"
+    failures = sum(1 for r in step_results if r['status'] == 'failed')
+    total = sum(r['duration'] for r in step_results)
+    suite = ET.Element('testsuite', name=test_name, tests=str(len(step_results)),
+                       failures=str(failures), time=f'{total:.3f}')
+    # tells web_complexity_lab that the testcases below are steps of one test
+    props = ET.SubElement(suite, 'properties')
+    ET.SubElement(props, 'property', name='wcx.granularity', value='steps')
+    for r in step_results:
+        case = ET.SubElement(suite, 'testcase', classname=test_name,
+                             name=f"step {r['step']}: {r['action']} {r['selector']}",
+                             time=f"{r['duration']:.3f}")
+        if r['status'] == 'failed':
+            failure = ET.SubElement(case, 'failure', message=r['error'].splitlines()[0] if r['error'] else '')
+            failure.text = r['error']
+    ET.ElementTree(suite).write(junit_path, encoding='utf-8', xml_declaration=True)
+    print(f'JUnit XML written to: {junit_path}')
+
+
+@contextmanager
+def _step_log(test_name):
+    \"\"\"
+    Stream steps into ../logs/<test_name>.jsonl (one compact line per step,
+    flushed immediately) and write ../logs/junit/<test_name>.xml on exit,
+    also when the test fails midway.
+    \"\"\"
+    # __file__ points to kanban_ai/tests_generated/test_*.py
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # .../kanban_ai
+    logs_dir = os.path.join(root_dir, 'logs')
+    os.makedirs(os.path.join(logs_dir, 'junit'), exist_ok=True)
+    log_path = os.path.join(logs_dir, f'{test_name}.jsonl')
+    step_results = []
+    with open(log_path, 'w', encoding='utf-8') as f:
+        def log_step(result):
+            f.write(json.dumps(result, separators=(',', ':')) + '\\n')
+            f.flush()
+            step_results.append(result)
+        try:
+            yield log_step
+        finally:
+            print(f'JSONL log written to: {log_path}')
+            _write_junit(test_name, step_results, os.path.join(logs_dir, 'junit', f'{test_name}.xml'))
+
+
+"""
+
+
+def ts_string(value):
+    """Quote a string as a single-quoted TypeScript literal."""
+    escaped = (
+        value.replace("\\", "\\\\")
+        .replace("'", "\\'")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+    return f"'{escaped}'"
+
+
+def action_to_ts(step_index, action):
+    """
+    Turn a logged action into a Playwright Test (TypeScript) step.
+    """
+    title = f"Step {step_index}: {action.get('description', '').replace('#', '').strip()}"
+
+    if action["strategy"] == "role":
+        locator = f"page.getByRole({ts_string(action['role'])}, {{ name: {ts_string(action['name'])} }})"
+    else:
+        locator = f"page.locator({ts_string(action['selector'])})"
+
+    return (
+        f"  await test.step({ts_string(title)}, async () => {{\n"
+        f"    await {locator}.first().click();\n"
+        "  });\n"
+    )
+
+
+def load_ok_steps():
     steps = load_log()
 
     # Filter out only successful actions
@@ -48,14 +151,70 @@ def generate():
 
     if not ok_steps:
         raise RuntimeError("No successful steps found in log; nothing to generate.")
+    return ok_steps
+
+
+def rank_selectors(ok_steps):
+    """
+    Replay the successful steps on the live app and replace each locator with
+    the most stable unique one (see selector_ranker.SelectorRanker).
+    Role actions are ranked as role= selectors; steps with a unique winner
+    become css-strategy actions, the rest are kept and marked ambiguous.
+    """
+    from playwright.sync_api import sync_playwright
+    from selector_ranker import SelectorRanker
+
+    plan = []
+    for s in ok_steps:
+        action = s["action"]
+        if action["strategy"] == "role":
+            name = json.dumps(action["name"], ensure_ascii=False)
+            selector = f"role={action['role']}[name={name}]"
+        else:
+            selector = action["selector"]
+        plan.append({"action": "click", "selector": selector})
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page()
+        SelectorRanker(page).rank_plan(plan, BASE_URL)
+        browser.close()
+
+    for s, step in zip(ok_steps, plan):
+        if step["selector_matches"] == 1:
+            s["action"] = {**s["action"], "strategy": "css", "selector": step["selector"]}
+        s["action"]["ambiguous"] = step["ambiguous"]
+    return ok_steps
+
+
+def generate(ok_steps=None):
+    if ok_steps is None:
+        ok_steps = load_ok_steps()
 
     OUT_TEST_PATH.parent.mkdir(parents=True, exist_ok=True)
 
     with OUT_TEST_PATH.open("w", encoding="utf-8") as f:
-        f.write("from playwright.sync_api import Page\n\n\n")
+        f.write("from contextlib import contextmanager\n")
+        f.write("import json\n")
+        f.write("import os\n")
+        f.write("import time\n")
+        f.write("import xml.etree.ElementTree as ET\n\n")
+        f.write("from playwright.sync_api import sync_playwright\n\n\n")
         f.write(f'BASE_URL = "{BASE_URL}"\n\n\n')
-        f.write("def test_generated_kanban_flow(page: Page):\n")
-        f.write('    page.goto(BASE_URL, wait_until="networkidle")\n\n')
+        f.write(STEP_LOG_HELPERS)
+        f.write("def test_generated_kanban_flow():\n")
+        f.write("    # Use the filename (without .py) as the name for the logs.\n")
+        f.write("    test_name = os.path.splitext(os.path.basename(__file__))[0]\n")
+        f.write("    with _step_log(test_name) as log_step, sync_playwright() as p:\n")
+        f.write("        # Attach to a shared browser server when run by `wcx run-tests`\n")
+        f.write("        ws_endpoint = os.environ.get('PW_WS_ENDPOINT')\n")
+        f.write("        if ws_endpoint:\n")
+        f.write("            browser = p.chromium.connect(ws_endpoint)\n")
+        f.write("        else:\n")
+        f.write("            browser = p.chromium.launch(headless=True)\n")
+        f.write("        context = browser.new_context()\n")
+        f.write("        page = context.new_page()\n")
+        f.write('        page.goto(BASE_URL, wait_until="networkidle")\n\n')
 
         for s in ok_steps:
             step_idx = s.get("step", 0)
@@ -63,12 +222,63 @@ def generate():
             f.write(action_to_code(step_idx, action))
 
         # simple sanity check at the end
-        f.write("\n")
-        f.write("    # Basic smoke assertion: page is still on the app\n")
-        f.write('    assert "http://localhost:3000" in page.url\n')
+        f.write("        # Basic smoke assertion: page is still on the app\n")
+        f.write("        assert BASE_URL in page.url\n")
+        f.write("        browser.close()\n")
 
     print(f"Generated test file: {OUT_TEST_PATH}")
 
 
+def generate_spec(ok_steps=None):
+    """
+    Same flow as generate(), emitted as a .spec.ts file so it can run in the
+    Node Playwright Test runner (parallel workers, sharding).
+    """
+    if ok_steps is None:
+        ok_steps = load_ok_steps()
+
+    OUT_SPEC_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+    with OUT_SPEC_PATH.open("w", encoding="utf-8") as f:
+        f.write("import { test, expect } from '@playwright/test';\n\n")
+        f.write(f"const BASE_URL = {ts_string(BASE_URL)};\n\n")
+        f.write("test('generated kanban flow', async ({ page }) => {\n")
+        f.write("  await page.goto(BASE_URL, { waitUntil: 'networkidle' });\n\n")
+
+        for s in ok_steps:
+            step_idx = s.get("step", 0)
+            action = s["action"]
+            f.write(action_to_ts(step_idx, action))
+
+        # simple sanity check at the end
+        f.write("\n")
+        f.write("  // Basic smoke assertion: page is still on the app\n")
+        f.write("  expect(page.url()).toContain(BASE_URL);\n")
+        f.write("});\n")
+
+    print(f"Generated spec file: {OUT_SPEC_PATH}")
+
+
 if __name__ == "__main__":
-    generate()
+    parser = argparse.ArgumentParser(description="Generate Playwright tests from the exploration log")
+    parser.add_argument(
+        "--format",
+        choices=["python", "typescript", "both"],
+        default="python",
+        help="python: pytest file, typescript: Playwright Test .spec.ts",
+    )
+    parser.add_argument(
+        "--rank-selectors",
+        action="store_true",
+        help="replay the log on the running app and keep the most stable unique locator per step",
+    )
+    args = parser.parse_args()
+
+    ok_steps = load_ok_steps()
+    if args.rank_selectors:
+        rank_selectors(ok_steps)
+
+    if args.format in ("python", "both"):
+        generate(ok_steps)
+    if args.format in ("typescript", "both"):
+        generate_spec(ok_steps)
@@ -1,22 +1,179 @@
-from playwright.sync_api import Page
+from contextlib import contextmanager
+import json
+import os
+import time
+import xml.etree.ElementTree as ET
+
+from playwright.sync_api import sync_playwright
 
 
 BASE_URL = "http://localhost:3000"
 
 
-def test_generated_kanban_flow(page: Page):
-    page.goto(BASE_URL, wait_until="networkidle")
+def _write_junit(test_name, step_results, junit_path):
+    """Write one JUnit <testsuite> with a <testcase> per step."""
+    failures = sum(1 for r in step_results if r['status'] == 'failed')
+    total = sum(r['duration'] for r in step_results)
+    suite = ET.Element('testsuite', name=test_name, tests=str(len(step_results)),
+                       failures=str(failures), time=f'{total:.3f}')
+    # tells web_complexity_lab that the testcases below are steps of one test
+    props = ET.SubElement(suite, 'properties')
+    ET.SubElement(props, 'property', name='wcx.granularity', value='steps')
+    for r in step_results:
+        case = ET.SubElement(suite, 'testcase', classname=test_name,
+                             name=f"step {r['step']}: {r['action']} {r['selector']}",
+                             time=f"{r['duration']:.3f}")
+        if r['status'] == 'failed':
+            failure = ET.SubElement(case, 'failure', message=r['error'].splitlines()[0] if r['error'] else '')
+            failure.text = r['error']
+    ET.ElementTree(suite).write(junit_path, encoding='utf-8', xml_declaration=True)
+    print(f'JUnit XML written to: {junit_path}')
+
+
+@contextmanager
+def _step_log(test_name):
+    """
+    Stream steps into ../logs/<test_name>.jsonl (one compact line per step,
+    flushed immediately) and write ../logs/junit/<test_name>.xml on exit,
+    also when the test fails midway.
+    """
+    # __file__ points to kanban_ai/tests_generated/test_*.py
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # .../kanban_ai
+    logs_dir = os.path.join(root_dir, 'logs')
+    os.makedirs(os.path.join(logs_dir, 'junit'), exist_ok=True)
+    log_path = os.path.join(logs_dir, f'{test_name}.jsonl')
+    step_results = []
+    with open(log_path, 'w', encoding='utf-8') as f:
+        def log_step(result):
+            f.write(json.dumps(result, separators=(',', ':')) + '\n')
+            f.flush()
+            step_results.append(result)
+        try:
+            yield log_step
+        finally:
+            print(f'JSONL log written to: {log_path}')
+            _write_junit(test_name, step_results, os.path.join(logs_dir, 'junit', f'{test_name}.xml'))
+
+
+def test_generated_kanban_flow():
+    # Use the filename (without .py) as the name for the logs.
+    test_name = os.path.splitext(os.path.basename(__file__))[0]
+    with _step_log(test_name) as log_step, sync_playwright() as p:
+        # Attach to a shared browser server when run by `wcx run-tests`
+        ws_endpoint = os.environ.get('PW_WS_ENDPOINT')
+        if ws_endpoint:
+            browser = p.chromium.connect(ws_endpoint)
+        else:
+            browser = p.chromium.launch(headless=True)
+        context = browser.new_context()
+        page = context.new_page()
+        page.goto(BASE_URL, wait_until="networkidle")
+
+        # Step 0: button:+ Add New Task
+        selector = "role=button[name=\"+ Add New Task\"]"
+        start = time.time()
+        try:
+            page.get_by_role("button", name="+ Add New Task").click()
+            status = 'passed'
+            error = ''
+        except Exception as e:
+            status = 'failed'
+            error = str(e)
+        log_step({
+            'step': 0,
+            'action': 'click',
+            'selector': selector,
+            'status': status,
+            'error': error,
+            'duration': time.time() - start,
+            'url': page.url,
+            'dom_length': len(page.content()),
+        })
+
+        # Step 1: button:+ Add New Subtask
+        selector = "role=button[name=\"+ Add New Subtask\"]"
+        start = time.time()
+        try:
+            page.get_by_role("button", name="+ Add New Subtask").click()
+            status = 'passed'
+            error = ''
+        except Exception as e:
+            status = 'failed'
+            error = str(e)
+        log_step({
+            'step': 1,
+            'action': 'click',
+            'selector': selector,
+            'status': status,
+            'error': error,
+            'duration': time.time() - start,
+            'url': page.url,
+            'dom_length': len(page.content()),
+        })
+
+        # Step 2: button:Create Task
+        selector = "role=button[name=\"Create Task\"]"
+        start = time.time()
+        try:
+            page.get_by_role("button", name="Create Task").click()
+            status = 'passed'
+            error = ''
+        except Exception as e:
+            status = 'failed'
+            error = str(e)
+        log_step({
+            'step': 2,
+            'action': 'click',
+            'selector': selector,
+            'status': status,
+            'error': error,
+            'duration': time.time() - start,
+            'url': page.url,
+            'dom_length': len(page.content()),
+        })
+
+        # Step 4: button + Add New Subtask
+        selector = "button.add-column-btn"
+        start = time.time()
+        try:
+            page.locator("button.add-column-btn").first.click()
+            status = 'passed'
+            error = ''
+        except Exception as e:
+            status = 'failed'
+            error = str(e)
+        log_step({
+            'step': 4,
+            'action': 'click',
+            'selector': selector,
+            'status': status,
+            'error': error,
+            'duration': time.time() - start,
+            'url': page.url,
+            'dom_length': len(page.content()),
+        })
 
-    # Step 0: button:+ Add New Task
-    page.get_by_role("button", name="+ Add New Task").click()
-    # Step 1: button:+ Add New Subtask
-    page.get_by_role("button", name="+ Add New Subtask").click()
-    # Step 2: button:Create Task
-    page.get_by_role("button", name="Create Task").click()
-    # Step 4: button + Add New Subtask
-    page.locator("button.add-column-btn").first.click()
-    # Step 5: button Create Task
-    page.locator("button.create-btn").first.click()
+        # Step 5: button Create Task
+        selector = "button.create-btn"
+        start = time.time()
+        try:
+            page.locator("button.create-btn").first.click()
+            status = 'passed'
+            error = ''
+        except Exception as e:
+            status = 'failed'
+            error = str(e)
+        log_step({
+            'step': 5,
+            'action': 'click',
+            'selector': selector,
+            'status': status,
+            'error': error,
+            'duration': time.time() - start,
+            'url': page.url,
+            'dom_length': len(page.content()),
+        })
 
-    # Basic smoke assertion: page is still on the app
-    assert "http://localhost:3000" in page.url
+        # Basic smoke assertion: page is still on the app
+        assert BASE_URL in page.url
+        browser.close()
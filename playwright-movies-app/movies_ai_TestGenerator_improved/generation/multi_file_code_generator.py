@@ -9,6 +9,16 @@ class MultiFileCodeGenerator:
       - test_movies_menus.py
       - test_movies_navigation.py
       - test_movies_actions.py
+
+    or, with generate_specs_by_group, Playwright Test (TypeScript) specs:
+      - movies-menus.spec.ts
+      - movies-navigation.spec.ts
+      - movies-actions.spec.ts
+
+    generate_case_tests / generate_case_specs take the independent cases from
+    StructuredTestPlanBuilder.build_cases and write one test function per case
+    into the same per-group files, so a failing case does not hold up the rest
+    and cases can run in parallel browser contexts.
     """
 
     def generate_tests_by_group(
@@ -28,6 +38,62 @@ class MultiFileCodeGenerator:
             self._write_group_test(group_name, steps, base_url, output_path)
             print(f"Generated {group_name} tests -> {output_path}")
 
+    def generate_specs_by_group(
+        self,
+        grouped_plans: Dict[str, List[Dict[str, Any]]],
+        base_url: str,
+        output_dir: str,
+        storage_state_config: str | None = None,
+    ) -> None:
+        """
+        Same grouping as generate_tests_by_group, but emits .spec.ts files for
+        the Node runner (parallel workers, sharding). If storage_state_config
+        points to playwright.config.ts, the specs reuse the STORAGE_STATE
+        produced by tests/logged-in/login.setup.ts.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+
+        for group_name, steps in grouped_plans.items():
+            if not steps:
+                continue
+
+            filename = f"movies-{group_name}.spec.ts"
+            output_path = os.path.join(output_dir, filename)
+            case = {"name": f"movies {group_name}", "start_url": base_url, "steps": steps}
+            self._write_group_spec(group_name, [case], output_path, storage_state_config)
+            print(f"Generated {group_name} specs -> {output_path}")
+
+    def generate_case_tests(
+        self,
+        grouped_cases: Dict[str, List[Dict[str, Any]]],
+        output_dir: str,
+    ) -> None:
+        os.makedirs(output_dir, exist_ok=True)
+
+        for group_name, cases in grouped_cases.items():
+            if not cases:
+                continue
+
+            output_path = os.path.join(output_dir, f"test_movies_{group_name}.py")
+            self._write_case_tests(group_name, cases, output_path)
+            print(f"Generated {len(cases)} {group_name} cases -> {output_path}")
+
+    def generate_case_specs(
+        self,
+        grouped_cases: Dict[str, List[Dict[str, Any]]],
+        output_dir: str,
+        storage_state_config: str | None = None,
+    ) -> None:
+        os.makedirs(output_dir, exist_ok=True)
+
+        for group_name, cases in grouped_cases.items():
+            if not cases:
+                continue
+
+            output_path = os.path.join(output_dir, f"movies-{group_name}.spec.ts")
+            self._write_group_spec(group_name, cases, output_path, storage_state_config)
+            print(f"Generated {len(cases)} {group_name} specs -> {output_path}")
+
     def _write_group_test(
         self,
         group_name: str,
@@ -40,12 +106,18 @@ class MultiFileCodeGenerator:
         lines: List[str] = [
             "from playwright.sync_api import sync_playwright\n",
             "import time\n",
+            "import os\n",
             "\n",
             f"def {func_name}():\n",
             f"    print('=== START {group_name.upper()} TESTS ===')\n",
             "    errors = []\n",
             "    with sync_playwright() as p:\n",
-            "        browser = p.chromium.launch(headless=False)\n",
+            "        # Attach to a shared browser server when run by `wcx run-tests`\n",
+            "        ws_endpoint = os.environ.get('PW_WS_ENDPOINT')\n",
+            "        if ws_endpoint:\n",
+            "            browser = p.chromium.connect(ws_endpoint)\n",
+            "        else:\n",
+            "            browser = p.chromium.launch(headless=False)\n",
             "        context = browser.new_context()\n",
             "        page = context.new_page()\n",
             f"        page.goto('{base_url}', wait_until='domcontentloaded')\n",
@@ -90,3 +162,150 @@ class MultiFileCodeGenerator:
 
         with open(output_path, "w", encoding="utf-8") as f:
             f.writelines(lines)
+
+    def _write_case_tests(
+        self,
+        group_name: str,
+        cases: List[Dict[str, Any]],
+        output_path: str,
+    ) -> None:
+        lines: List[str] = [
+            "from playwright.sync_api import sync_playwright\n",
+            "from concurrent.futures import ThreadPoolExecutor\n",
+            "import time\n",
+            "import os\n",
+            "\n",
+            "def _open_page(p):\n",
+            "    # Attach to a shared browser server when run by `wcx run-tests`\n",
+            "    ws_endpoint = os.environ.get('PW_WS_ENDPOINT')\n",
+            "    if ws_endpoint:\n",
+            "        browser = p.chromium.connect(ws_endpoint)\n",
+            "    else:\n",
+            "        browser = p.chromium.launch(headless=False)\n",
+            "    context = browser.new_context()\n",
+            "    return browser, context.new_page()\n",
+        ]
+
+        func_names: List[str] = []
+        for case in cases:
+            func_name = f"test_movies_{case['name']}"
+            func_names.append(func_name)
+            start_url = _py_string(case["start_url"])
+
+            lines.extend([
+                "\n",
+                f"def {func_name}():\n",
+                f"    print('=== START {case['name']} ===')\n",
+                "    with sync_playwright() as p:\n",
+                "        browser, page = _open_page(p)\n",
+                "        try:\n",
+                f"            page.goto({start_url}, wait_until='domcontentloaded')\n",
+                "            print('Start URL:', page.url)\n",
+            ])
+
+            for idx, step in enumerate(case["steps"], start=1):
+                step_type = step.get("type")
+                lines.append(f"            print('--- step {idx} ({step_type}) ---')\n")
+                if step_type == "click":
+                    lines.append(f"            page.click({_py_string(step['selector'])}, timeout=5000)\n")
+                elif step_type == "scroll":
+                    lines.append(f"            page.mouse.wheel(0, {int(step.get('amount', 0))})\n")
+                lines.append("            print('URL:', page.url)\n")
+                lines.append("            time.sleep(0.5)\n")
+
+            lines.extend([
+                "        finally:\n",
+                "            browser.close()\n",
+            ])
+
+        lines.extend([
+            "\n",
+            f"CASES = [{', '.join(func_names)}]\n",
+            "\n",
+            "if __name__ == '__main__':\n",
+            "    # Each case starts its own Playwright instance and context, so they run side by side\n",
+            "    with ThreadPoolExecutor(max_workers=len(CASES)) as pool:\n",
+            "        futures = {case.__name__: pool.submit(case) for case in CASES}\n",
+            "    failed = []\n",
+            "    for name, future in futures.items():\n",
+            "        error = future.exception()\n",
+            "        print(('FAILED ' if error else 'PASSED ') + name + (f': {error}' if error else ''))\n",
+            "        if error:\n",
+            "            failed.append(name)\n",
+            "    if failed:\n",
+            "        raise SystemExit(1)\n",
+        ])
+
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+
+    def _write_group_spec(
+        self,
+        group_name: str,
+        cases: List[Dict[str, Any]],
+        output_path: str,
+        storage_state_config: str | None,
+    ) -> None:
+        lines: List[str] = ["import { test } from '@playwright/test';\n"]
+        if storage_state_config:
+            import_path = _ts_import_path(output_path, storage_state_config)
+            lines.append(f"import {{ STORAGE_STATE }} from {_ts_string(import_path)};\n")
+            lines.append("\n")
+            lines.append("test.use({ storageState: STORAGE_STATE });\n")
+        if len(cases) > 1:
+            lines.append("\n")
+            lines.append("test.describe.configure({ mode: 'parallel' });\n")
+
+        for case in cases:
+            lines.append("\n")
+            lines.append(f"test({_ts_string(case['name'])}, async ({{ page }}) => {{\n")
+            lines.append(f"  await page.goto({_ts_string(case['start_url'])}, {{ waitUntil: 'domcontentloaded' }});\n")
+
+            for idx, step in enumerate(case["steps"], start=1):
+                step_type = step.get("type")
+
+                if step_type == "click":
+                    title = f"{group_name} step {idx} (click {step['selector']})"
+                    body = f"await page.locator({_ts_string(step['selector'])}).first().click({{ timeout: 5000 }});"
+                elif step_type == "scroll":
+                    title = f"{group_name} step {idx} (scroll)"
+                    body = f"await page.mouse.wheel(0, {int(step.get('amount', 0))});"
+                else:
+                    continue
+
+                lines.append("\n")
+                lines.append(f"  await test.step({_ts_string(title)}, async () => {{\n")
+                lines.append(f"    {body}\n")
+                lines.append("  });\n")
+
+            lines.append("});\n")
+
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+
+
+def _py_string(value: str) -> str:
+    """Quote a string as a single-quoted Python literal, like the other generated lines."""
+    escaped = value.replace("\\", "\\\\").replace("'", "\\'")
+    return f"'{escaped}'"
+
+
+def _ts_string(value: str) -> str:
+    """Quote a Python string as a single-quoted TypeScript literal."""
+    escaped = (
+        value.replace("\\", "\\\\")
+        .replace("'", "\\'")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+    return f"'{escaped}'"
+
+
+def _ts_import_path(output_path: str, module_path: str) -> str:
+    """Relative ES import path from the spec file to a .ts module."""
+    rel = os.path.relpath(
+        os.path.abspath(module_path),
+        os.path.dirname(os.path.abspath(output_path)),
+    )
+    rel = os.path.splitext(rel)[0].replace(os.sep, "/")
+    return rel if rel.startswith(".") else f"./{rel}"
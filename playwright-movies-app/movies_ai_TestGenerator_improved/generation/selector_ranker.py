@@ -0,0 +1,161 @@
+# generation/selector_ranker.py
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+
+# Element description used to derive candidate locators (runs in the page).
+_DESCRIBE_JS = """
+el => {
+  const attr = n => el.getAttribute(n) || '';
+  const tag = el.tagName.toLowerCase();
+  let role = attr('role');
+  if (!role) {
+    if (tag === 'a' && el.hasAttribute('href')) role = 'link';
+    else if (tag === 'button') role = 'button';
+    else if (tag === 'select') role = 'combobox';
+    else if (tag === 'textarea') role = 'textbox';
+    else if (tag === 'input') {
+      const t = (attr('type') || 'text').toLowerCase();
+      role = {checkbox: 'checkbox', radio: 'radio', button: 'button',
+              submit: 'button', reset: 'button'}[t] || 'textbox';
+    }
+  }
+  const text = (el.innerText || '').trim().replace(/\\s+/g, ' ');
+  const ariaLabel = attr('aria-label');
+  return {
+    tag: tag,
+    id: el.id ? '#' + CSS.escape(el.id) : '',
+    test_id: attr('data-testid') || attr('data-test-id') || attr('data-test'),
+    role: role,
+    name: ariaLabel || text || attr('title') || attr('alt'),
+    aria_label: ariaLabel,
+    text: text,
+  };
+}
+"""
+
+
+class SelectorRanker:
+    """
+    Ranks candidate locators for the elements a test plan clicks, on the live page.
+
+    For every click step the recorded selector is resolved once, and the
+    element's test-id, role + accessible name, aria-label, text and CSS id are
+    turned into candidate selectors. Each candidate is scored by how many
+    elements it matches and how long it takes to resolve. The best unique
+    candidate (test-id > role > label > text > css, then fastest) replaces the
+    step's selector; steps without a unique candidate are flagged ambiguous.
+
+    The plan is replayed while ranking, so each step is scored in the page
+    state it will see when the generated test runs.
+    """
+
+    STRATEGY_ORDER = ("test-id", "role", "label", "text", "css")
+    MAX_TEXT_LENGTH = 80
+
+    def __init__(self, page, timeout_ms: int = 2000):
+        self.page = page
+        self.timeout_ms = timeout_ms
+
+    # ------------------------------------------------------------------
+    def rank_plan(self, test_plan: List[Dict[str, Any]], base_url: str) -> List[Dict[str, Any]]:
+        """Rank every click step of test_plan in place and return it."""
+        self.page.goto(base_url, wait_until="domcontentloaded")
+
+        for idx, step in enumerate(test_plan, start=1):
+            kind = step.get("action") or step.get("type")
+
+            if kind == "click" and step.get("selector"):
+                self.rank_step(step)
+                if step["ambiguous"]:
+                    print(
+                        f"[SelectorRanker] step {idx}: '{step['selector']}' matched "
+                        f"{step['selector_matches']} elements"
+                    )
+
+            try:
+                self._perform(step, kind)
+            except Exception as e:
+                print(f"[SelectorRanker] step {idx}: replay failed ({e}); later steps may be mis-scored")
+
+        return test_plan
+
+    def rank_step(self, step: Dict[str, Any]) -> Dict[str, Any]:
+        """Pick the best locator for one click step and persist it into the step."""
+        original = step.get("original_selector") or step["selector"]
+        scored = [self.score(c["selector"], c["strategy"]) for c in self.candidates_for(original)]
+
+        unique = [s for s in scored if s["count"] == 1]
+        if unique:
+            best = min(unique, key=lambda s: (self.STRATEGY_ORDER.index(s["strategy"]), s["resolve_ms"]))
+        else:
+            # nothing unique: keep what was recorded
+            best = next(s for s in scored if s["selector"] == original)
+
+        step["original_selector"] = original
+        step["selector"] = best["selector"]
+        step["selector_strategy"] = best["strategy"]
+        step["selector_matches"] = best["count"]
+        step["selector_resolve_ms"] = best["resolve_ms"]
+        step["ambiguous"] = best["count"] != 1
+        step["selector_candidates"] = scored
+        return step
+
+    def candidates_for(self, selector: str) -> List[Dict[str, str]]:
+        """Candidate selectors for the element the recorded selector points to."""
+        candidates = [{"strategy": "css", "selector": selector}]
+
+        try:
+            handle = self.page.locator(selector).first
+            info = handle.evaluate(_DESCRIBE_JS, timeout=self.timeout_ms)
+        except Exception:
+            return candidates
+
+        if info.get("test_id"):
+            candidates.append({"strategy": "test-id", "selector": f"[data-testid={_quote(info['test_id'])}]"})
+        if info.get("role") and info.get("name"):
+            candidates.append({"strategy": "role", "selector": f"role={info['role']}[name={_quote(info['name'])}]"})
+        if info.get("aria_label"):
+            candidates.append({"strategy": "label", "selector": f"[aria-label={_quote(info['aria_label'])}]"})
+        text = info.get("text", "")
+        if text and len(text) <= self.MAX_TEXT_LENGTH:
+            candidates.append({"strategy": "text", "selector": f"{info['tag']}:text-is({_quote(text)})"})
+        if info.get("id"):
+            candidates.append({"strategy": "css", "selector": info["id"]})
+
+        # drop duplicates, keep first occurrence
+        seen = set()
+        unique = []
+        for c in candidates:
+            if c["selector"] not in seen:
+                seen.add(c["selector"])
+                unique.append(c)
+        return unique
+
+    def score(self, selector: str, strategy: str) -> Dict[str, Any]:
+        """Count matches and time the resolution of one selector."""
+        start = time.perf_counter()
+        try:
+            count = self.page.locator(selector).count()
+        except Exception:
+            count = 0
+        resolve_ms = round((time.perf_counter() - start) * 1000, 2)
+        return {"selector": selector, "strategy": strategy, "count": count, "resolve_ms": resolve_ms}
+
+    # ------------------------------------------------------------------
+    def _perform(self, step: Dict[str, Any], kind: Optional[str]) -> None:
+        """Replay one plan step so the next one is ranked in the right state."""
+        if kind == "click":
+            self.page.locator(step["selector"]).first.click(timeout=self.timeout_ms)
+        elif kind == "click_by_label":
+            self.page.get_by_label(step["label"]).first.click(timeout=self.timeout_ms)
+        elif kind == "click_by_role":
+            self.page.get_by_role(step["role"], name=step["name"]).first.click(timeout=self.timeout_ms)
+        elif kind == "scroll":
+            self.page.mouse.wheel(0, step.get("amount", 0))
+        self.page.wait_for_timeout(200)
+
+
+def _quote(value: str) -> str:
+    return json.dumps(value, ensure_ascii=False)
@@ -1,6 +1,7 @@
 # generation/structured_test_plan_builder.py
 from typing import List, Dict, Any
 from collections import defaultdict
+import re
 
 
 class StructuredTestPlanBuilder:
@@ -26,23 +27,88 @@ class StructuredTestPlanBuilder:
             if info.get("error"):
                 continue
 
-            action_type = action.get("type")
-            if action_type not in ("click", "scroll"):
+            step = self._to_step(action)
+            if step is None:
                 continue
 
-            group = action.get("group") or "navigation"
+            groups[step["group"]].append(step)
 
-            step: Dict[str, Any] = {"type": action_type, "group": group}
+        return dict(groups)
+
+    def build_cases(self, trace: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Split the trace into independent test cases, grouped like build().
+
+        A case starts at every menu click and every card click; the actions the
+        agent performed on the page it landed on (scroll, theme toggle) stay in
+        that card's case. A step whose before_url differs from where the
+        current case ended (the agent navigated back in between) also starts a
+        new case. Each case records the URL it must start from, so cases can
+        run in separate browser contexts in any order.
+
+        Output:
+          {
+            "menus":      [ {name, group, start_url, steps: [...]}, ... ],
+            "navigation": [ ... ],   # card flows, including their actions
+            "actions":    [ ... ],   # actions not preceded by a card click
+          }
+        """
+        groups: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        current: Dict[str, Any] | None = None
+        current_url = ""
+
+        for entry in trace:
+            action = entry.get("action", {}) or {}
+            info = entry.get("info", {}) or {}
+
+            if info.get("error"):
+                continue
 
-            if action_type == "click":
-                selector = action.get("selector")
-                if not selector:
-                    continue
-                step["selector"] = selector
+            step = self._to_step(action)
+            if step is None:
+                continue
 
-            if action_type == "scroll":
-                step["amount"] = action.get("amount", 0)
+            before_url = entry.get("before_url", "")
+            starts_case = (
+                current is None
+                or step["group"] in ("menus", "navigation")
+                or before_url != current_url
+            )
 
-            groups[group].append(step)
+            if starts_case:
+                cases = groups[step["group"]]
+                current = {
+                    "name": f"{step['group']}_{len(cases) + 1}_{_slug(step.get('selector', step['type']))}",
+                    "group": step["group"],
+                    "start_url": before_url,
+                    "steps": [],
+                }
+                cases.append(current)
+
+            current["steps"].append(step)
+            current_url = entry.get("after_url", before_url)
 
         return dict(groups)
+
+    @staticmethod
+    def _to_step(action: Dict[str, Any]) -> Dict[str, Any] | None:
+        action_type = action.get("type")
+        if action_type not in ("click", "scroll"):
+            return None
+
+        step: Dict[str, Any] = {"type": action_type, "group": action.get("group") or "navigation"}
+
+        if action_type == "click":
+            if not action.get("selector"):
+                return None
+            step["selector"] = action["selector"]
+        else:
+            step["amount"] = action.get("amount", 0)
+
+        return step
+
+
+def _slug(text: str, max_len: int = 40) -> str:
+    """Identifier-safe fragment of a selector, for test function names."""
+    slug = re.sub(r"[^0-9a-zA-Z]+", "_", text).strip("_").lower()
+    return slug[:max_len].rstrip("_") or "case"
@@ -3,6 +3,7 @@ from env.movies_env import MoviesPlaywrightEnv
 from agents.structured_movies_agent import StructuredMoviesAgent
 from generation.structured_test_plan_builder import StructuredTestPlanBuilder
 from generation.multi_file_code_generator import MultiFileCodeGenerator
+from generation.selector_ranker import SelectorRanker
 
 
 def main() -> None:
@@ -17,14 +18,28 @@ def main() -> None:
     try:
         trace = agent.run()
 
-        grouped_plans = builder.build(trace)
+        grouped_cases = builder.build_cases(trace)
 
-        print("\n=== GROUPED TEST PLANS ===")
-        for group_name, steps in grouped_plans.items():
-            print(f"  {group_name}: {len(steps)} steps")
+        # Rank each case from its own start URL, the state its test begins in
+        ranker = SelectorRanker(env.page)
+        for cases in grouped_cases.values():
+            for case in cases:
+                ranker.rank_plan(case["steps"], case["start_url"])
+
+        print("\n=== GROUPED TEST CASES ===")
+        for group_name, cases in grouped_cases.items():
+            steps = sum(len(c["steps"]) for c in cases)
+            print(f"  {group_name}: {len(cases)} cases, {steps} steps")
 
         output_dir = "tests/generated"
-        codegen.generate_tests_by_group(grouped_plans, base_url=base_url, output_dir=output_dir)
+        codegen.generate_case_tests(grouped_cases, output_dir=output_dir)
+
+        # Playwright Test specs for the Node runner (reuse the logged-in storage state)
+        codegen.generate_case_specs(
+            grouped_cases,
+            output_dir="../tests/logged-in/generated",
+            storage_state_config="../playwright.config.ts",
+        )
 
     finally:
         env.close()
@@ -2,6 +2,7 @@ from env.movies_env import MoviesPlaywrightEnv
 from agents.random_movies_agent import RandomMoviesAgent
 from generation.test_plan_builder import TestPlanBuilder
 from generation.playwright_code_generator import PlaywrightCodeGenerator
+from generation.selector_ranker import SelectorRanker
 import os
 
 BASE_URL = "http://localhost:3000/"
@@ -13,6 +14,9 @@ trace = agent.run()
 builder = TestPlanBuilder()
 test_plan = builder.build_test_plan(trace)
 
+# Swap brittle selectors (bare "a", has-text, nth) for the most stable unique locator
+SelectorRanker(env.page).rank_plan(test_plan, BASE_URL)
+
 print("Generated Test Plan:", test_plan)
 
 output_file = os.path.join("tests", "generated", "test_movies_ui.py")
@@ -21,3 +25,13 @@ generator = PlaywrightCodeGenerator()
 generator.generate_python_test(test_plan, output_file)
 
 print("Test saved to:", output_file)
+
+# Same plan as a Playwright Test spec, picked up by the "logged-in chrome" project
+spec_file = os.path.join("..", "tests", "logged-in", "generated", "movies-ui.spec.ts")
+generator.generate_typescript_test(
+    test_plan,
+    spec_file,
+    storage_state_config=os.path.join("..", "playwright.config.ts"),
+)
+
+print("Spec saved to:", spec_file)
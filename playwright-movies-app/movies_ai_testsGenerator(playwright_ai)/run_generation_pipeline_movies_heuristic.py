@@ -2,6 +2,7 @@ from env.movies_env import MoviesPlaywrightEnv
 from agents.heuristic_movies_agent import HeuristicMoviesAgent
 from generation.test_plan_builder import TestPlanBuilder
 from generation.playwright_code_generator import PlaywrightCodeGenerator
+from generation.selector_ranker import SelectorRanker
 import os
 
 if __name__ == "__main__":
@@ -13,6 +14,7 @@ if __name__ == "__main__":
 
     builder = TestPlanBuilder()
     test_plan = builder.build_test_plan(trace)
+    SelectorRanker(env.page).rank_plan(test_plan, base_url)
     print("Generated Test Plan:", test_plan)
 
     os.makedirs("tests/generated", exist_ok=True)
@@ -28,14 +28,19 @@ export default defineConfig({
   /* Opt out of parallel tests on CI. */
   workers: process.env.CI ? 1 : undefined,
   /* Reporter to use. See https://playwright.dev/docs/test-reporters */
+  /* JUnit results go to logs/junit/, where web_complexity_lab's LogParser reads them. */
   reporter: process.env.CI 
     ? [
         ['html'], 
         ['list'], 
         ['github'],
-        ['blob']
+        ['blob'],
+        ['junit', { outputFile: 'logs/junit/results.xml' }]
       ] 
-    : 'html',
+    : [
+        ['html'],
+        ['junit', { outputFile: 'logs/junit/results.xml' }]
+      ],
   /* Shared settings for all the projects below. See https://playwright.dev/docs/api/class-testoptions. */
   use: {
     /* Base URL to use in actions like `await page.goto('/')`. */
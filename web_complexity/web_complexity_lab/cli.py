@@ -1,7 +1,25 @@
 # web_complexity_lab/cli.py
+# Only argparse is imported up front: each command imports its module (and
+# numpy, yaml, the collectors and exporters) when it runs, so `wcx --help`,
+# `wcx info` and argument errors return at interpreter speed. Defaults that
+# live in those modules are left to them (see _given); keep the help texts
+# in step. `python -m web_complexity_lab.startup` checks the startup budget.
 import argparse
-from .config import load_config
-from .pipeline import run_evaluation
+
+
+def _parse_shard(value: str):
+    try:
+        index, total = (int(x) for x in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("shard must look like K/M, e.g. 1/3")
+    if not 1 <= index <= total:
+        raise argparse.ArgumentTypeError("shard index must be between 1 and M")
+    return index, total
+
+
+def _given(**options):
+    """The options set on the command line; the called function's defaults apply to the rest."""
+    return {name: value for name, value in options.items() if value is not None}
 
 
 def main():
@@ -14,6 +32,91 @@ def main():
 
     eval_parser = subparsers.add_parser("evaluate", help="Run complexity evaluation")
     eval_parser.add_argument("--config", required=True, help="Path to config.yaml")
+    eval_parser.add_argument(
+        "--jobs", "-j", type=int, default=1, help="Evaluate applications in N parallel processes"
+    )
+    eval_parser.add_argument(
+        "--no-cache", action="store_true", help="Re-parse every file instead of using the result cache"
+    )
+    eval_parser.add_argument(
+        "--parse-workers", type=int, default=1, help="Parse each application's files in N parallel workers"
+    )
+    eval_parser.add_argument(
+        "--parse-pool",
+        choices=("thread", "process"),
+        default="thread",
+        help="Worker type for --parse-workers: threads (I/O bound) or processes (CPU bound parsing)",
+    )
+    eval_parser.add_argument(
+        "--crawl",
+        action="store_true",
+        default=None,
+        help="Crawl ui_structure.start_urls with Playwright for live DOM metrics (needs the [crawl] extra)",
+    )
+    eval_parser.add_argument(
+        "--bootstrap",
+        type=int,
+        default=0,
+        metavar="B",
+        help="Add 95%% bootstrap intervals of every index from B resamples (e.g. 1000)",
+    )
+    eval_parser.add_argument(
+        "--no-history", action="store_true", help="Do not append this run to the run history"
+    )
+
+    run_parser = subparsers.add_parser("run-tests", help="Run generated Python tests in parallel")
+    run_parser.add_argument("--config", required=True, help="Path to config.yaml")
+    run_parser.add_argument("--workers", type=int, default=0, help="Worker processes (default: CPU count)")
+    run_parser.add_argument("--shard", type=_parse_shard, help="Run only shard K of M, e.g. 1/3")
+    run_parser.add_argument("--app", action="append", dest="apps", help="Only this app id (repeatable)")
+    run_parser.add_argument("--timeout", type=float, help="Per-test timeout in seconds")
+    run_parser.add_argument(
+        "--no-shared-browser",
+        action="store_true",
+        help="Let every test launch its own browser instead of one shared server",
+    )
+
+    sens_parser = subparsers.add_parser(
+        "sensitivity", help="Monte Carlo sensitivity of the WCS ranking to index weights and ranges"
+    )
+    sens_parser.add_argument("--config", required=True, help="Path to config.yaml")
+    sens_parser.add_argument("--draws", type=int, help="Parameter draws (default: sensitivity.draws or 20000)")
+    sens_parser.add_argument("--seed", type=int, help="Random seed (default: sensitivity.seed or 0)")
+
+    watch_parser = subparsers.add_parser(
+        "watch", help="Re-evaluate apps whenever their test, log or agent files change"
+    )
+    watch_parser.add_argument("--config", required=True, help="Path to config.yaml")
+    watch_parser.add_argument(
+        "--interval", type=float, help="Seconds between polls (default: 1)"
+    )
+    watch_parser.add_argument(
+        "--debounce", type=float, help="Seconds without changes before re-evaluating (default: 2)"
+    )
+    watch_parser.add_argument(
+        "--parse-workers", type=int, default=1, help="Parse each application's files in N parallel workers"
+    )
+    watch_parser.add_argument(
+        "--parse-pool", choices=("thread", "process"), default="thread", help="Worker type for --parse-workers"
+    )
+
+    serve_parser = subparsers.add_parser("serve", help="Serve the results and run history as a local JSON API")
+    serve_parser.add_argument("--config", required=True, help="Path to config.yaml")
+    serve_parser.add_argument("--host", help="Interface to listen on (default: 127.0.0.1)")
+    serve_parser.add_argument("--port", type=int, help="Port (default: 8765)")
+
+    hist_parser = subparsers.add_parser("history", help="Trends of app metrics and indices across recorded runs")
+    hist_parser.add_argument("--config", required=True, help="Path to config.yaml")
+    hist_parser.add_argument("--app", action="append", dest="apps", help="Only this app id (repeatable)")
+    hist_parser.add_argument(
+        "--metric",
+        action="append",
+        dest="metrics",
+        help="Metric or index to show (repeatable; default: the indices and test count/durations)",
+    )
+    hist_parser.add_argument("--last", type=int, help="Most recent runs to show (default: 10)")
+    hist_parser.add_argument("--since", help="Only runs started on or after this UTC date/time, e.g. 2025-11-01")
+    hist_parser.add_argument("--json", action="store_true", help="Print the trends as JSON")
 
     info_parser = subparsers.add_parser("info", help="Show tool info")
 
@@ -23,9 +126,79 @@ def main():
         print("Web Complexity Lab – Python engine for UI complexity evaluation.")
         return
 
+    # every other command takes --config
+    from .config import load_config
+
+    cfg = load_config(args.config)
+
     if args.command == "evaluate":
-        cfg = load_config(args.config)
-        run_evaluation(cfg)
+        from .pipeline import run_evaluation
+
+        run_evaluation(
+            cfg,
+            jobs=args.jobs,
+            use_cache=not args.no_cache,
+            parse_workers=args.parse_workers,
+            parse_pool=args.parse_pool,
+            crawl=args.crawl,
+            bootstrap=args.bootstrap,
+            record_history=not args.no_history,
+        )
+
+    if args.command == "sensitivity":
+        from .sensitivity import run_sensitivity
+
+        try:
+            run_sensitivity(cfg, draws=args.draws, seed=args.seed)
+        except (FileNotFoundError, ValueError) as e:
+            raise SystemExit(f"wcx sensitivity: {e}")
+
+    if args.command == "watch":
+        from .watch import run_watch
+
+        run_watch(
+            cfg,
+            parse_workers=args.parse_workers,
+            parse_pool=args.parse_pool,
+            **_given(interval=args.interval, debounce=args.debounce),
+        )
+
+    if args.command == "serve":
+        from .serve import run_server
+
+        try:
+            run_server(cfg, **_given(host=args.host, port=args.port))
+        except FileNotFoundError as e:
+            raise SystemExit(f"wcx serve: {e}")
+
+    if args.command == "history":
+        from .history import show_history
+
+        try:
+            show_history(
+                cfg,
+                app_ids=args.apps,
+                metrics=args.metrics,
+                since=args.since,
+                as_json=args.json,
+                **_given(last=args.last),
+            )
+        except (FileNotFoundError, ValueError) as e:
+            raise SystemExit(f"wcx history: {e}")
+
+    if args.command == "run-tests":
+        from .suite_runner import run_generated_tests
+
+        report = run_generated_tests(
+            cfg,
+            workers=args.workers,
+            shard=args.shard,
+            app_ids=args.apps,
+            shared_browser=not args.no_shared_browser,
+            timeout=args.timeout,
+        )
+        if report["failed"]:
+            raise SystemExit(1)
 
 
 if __name__ == "__main__":
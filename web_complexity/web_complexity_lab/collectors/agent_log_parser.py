@@ -1,137 +1,156 @@
 # web_complexity_lab/collectors/agent_log_parser.py
+from concurrent.futures import Executor
 from typing import List, Dict, Any
 from pathlib import Path
-import json
+
+from .corpus import AppCorpus, FileEntry
+from ..sketches import RunningStats, QuantileSketch
 
 
 class AgentLogParser:
     """
     Parses UI agent (RL) logs from JSONL or JSON files.
+    With an executor (thread or process pool), files are parsed in parallel.
     """
 
-    def __init__(self, app_config):
+    def __init__(self, app_config, corpus: AppCorpus | None = None, executor: Executor | None = None):
         self.app_config = app_config
+        self.corpus = corpus or AppCorpus(app_config)
+        self.executor = executor
+        self.corpus.register_fold("agent_log_parser", _new_episode_fold, self._log_paths())
 
-    def collect(self) -> List[Dict[str, Any]]:
-        results = []
-        agents_config = self.app_config.agents if hasattr(self.app_config, 'agents') else {}
-        log_paths = agents_config.get("log_paths", []) if isinstance(agents_config, dict) else []
-        root = Path(self.app_config.root_path)
-
-        for rel_path in log_paths:
-            log_dir = root / rel_path
-            if not log_dir.exists():
-                continue
+    def __getstate__(self) -> Dict[str, Any]:
+        # sent to process-pool workers, which parse their chunk sequentially
+        return {**self.__dict__, "executor": None}
 
-            # Find all log files (JSONL and JSON)
-            for log_file in log_dir.rglob("*"):
-                if log_file.suffix in [".jsonl", ".json"] and log_file.is_file():
-                    parsed = self._parse_log_file(log_file)
-                    if parsed:
-                        results.extend(parsed)
+    def _log_paths(self) -> List[str]:
+        agents_config = self.app_config.agents if hasattr(self.app_config, 'agents') else {}
+        return agents_config.get("log_paths", []) if isinstance(agents_config, dict) else []
 
-        return results
+    def collect(self) -> List[Dict[str, Any]]:
+        results = []
 
-    def _parse_log_file(self, file_path: Path) -> List[Dict[str, Any]]:
-        """Parse a single log file."""
+        # Find all log files (JSONL and JSON)
+        entries = self.corpus.list_files(self._log_paths(), (".jsonl", ".json"))
         try:
-            content = file_path.read_text(encoding="utf-8")
-        except Exception:
-            return []
-
-        if file_path.suffix == ".jsonl":
-            return self._parse_jsonl(content, file_path)
-        elif file_path.suffix == ".json":
-            return self._parse_json(content, file_path)
+            for parsed in self.corpus.map_cached("agent_log_parser", entries, self._parse_log_file, self.executor):
+                if parsed:
+                    results.extend(parsed)
+        finally:
+            self.corpus.release_folds("agent_log_parser")
 
-        return []
+        return results
 
-    def _parse_jsonl(self, content: str, file_path: Path) -> List[Dict[str, Any]]:
-        """Parse JSONL format (one JSON object per line)."""
-        steps = []
-        for line in content.strip().split("\n"):
-            if not line.strip():
-                continue
-            try:
-                step = json.loads(line)
-                steps.append(step)
-            except json.JSONDecodeError:
-                continue
-
-        if not steps:
-            return []
-
-        return [self._create_episode_from_steps(steps, file_path)]
-
-    def _parse_json(self, content: str, file_path: Path) -> List[Dict[str, Any]]:
-        """Parse JSON format (array of steps)."""
-        try:
-            data = json.loads(content)
-        except json.JSONDecodeError:
-            return []
+    def _parse_log_file(self, entry: FileEntry) -> List[Dict[str, Any]]:
+        """Build the episode(s) of a single indexed log file."""
+        if entry.suffix == ".jsonl":
+            # JSONL format (one JSON object per line), streamed
+            episode = self.corpus.fold(entry, "agent_log_parser")
+            return [episode] if episode else []
 
+        # JSON format (array of steps)
+        data = self.corpus.load(entry)
         if isinstance(data, list):
-            return [self._create_episode_from_steps(data, file_path)]
+            return [self._create_episode_from_steps(data, entry.path)]
         elif isinstance(data, dict) and "steps" in data:
-            return [self._create_episode_from_steps(data["steps"], file_path)]
+            return [self._create_episode_from_steps(data["steps"], entry.path)]
 
         return []
 
     def _create_episode_from_steps(self, steps: List[Dict], file_path: Path) -> Dict[str, Any]:
         """Create an episode summary from a list of steps."""
-        total_steps = len(steps)
+        fold = _EpisodeFold(file_path.stem)
+        for step in steps:
+            fold.add(step)
+        return fold.result(allow_empty=True)
 
-        # Count successes and errors
-        success_count = 0
-        error_count = 0
-        backtracks = 0
 
-        # Extract DOM sizes
-        dom_sizes = []
-        urls_visited = set()
-        actions = []
+class _EpisodeFold:
+    """
+    Running summary of one episode. Steps are folded in as they are read, so
+    memory stays constant however long the log is: DOM sizes are kept as
+    mergeable running statistics, actions as per-type counts and the env step
+    timings (gaps between consecutive step timestamps) as a quantile sketch
+    per action type.
+    """
 
-        for step in steps:
-            # Handle different status field names
-            status = step.get("status", step.get("result", "ok"))
-            if status in ["ok", "passed", "success"]:
-                success_count += 1
-            elif status in ["error", "failed", "failure"]:
-                error_count += 1
-                backtracks += 1  # Assume errors lead to backtracks
-
-            # Extract DOM length
-            dom_len = step.get("dom_length", 0)
-            if dom_len:
-                dom_sizes.append(dom_len)
-
-            # Extract URL
-            url = step.get("url", "")
-            if url:
-                urls_visited.add(url)
-
-            # Extract action info
-            action = step.get("action", {})
-            if isinstance(action, dict):
-                action_type = action.get("strategy", action.get("type", "unknown"))
-            else:
-                action_type = step.get("action", "unknown")
-            actions.append({"action": action_type, "selector": action.get("selector") if isinstance(action, dict) else None})
+    def __init__(self, episode_id: str):
+        self.episode_id = episode_id
+        self.total_steps = 0
+        self.success_count = 0
+        self.error_count = 0
+        self.backtracks = 0
+        self.dom_sizes = RunningStats()
+        self.urls_visited = set()
+        self.action_counts: Dict[str, int] = {}
+        self.step_sketches: Dict[str, QuantileSketch] = {}
+        self.last_timestamp = None
+
+    def add(self, step: Any) -> None:
+        if not isinstance(step, dict):
+            return
+        self.total_steps += 1
+
+        # Handle different status field names
+        status = step.get("status", step.get("result", "ok"))
+        if status in ["ok", "passed", "success"]:
+            self.success_count += 1
+        elif status in ["error", "failed", "failure"]:
+            self.error_count += 1
+            self.backtracks += 1  # Assume errors lead to backtracks
+
+        # Extract DOM length
+        dom_len = step.get("dom_length", 0)
+        if dom_len:
+            self.dom_sizes.add(dom_len)
+
+        # Extract URL
+        url = step.get("url", "")
+        if url:
+            self.urls_visited.add(url)
+
+        # Extract action info
+        action = step.get("action", {})
+        if isinstance(action, dict):
+            action_type = action.get("strategy", action.get("type", "unknown"))
+        else:
+            action_type = step.get("action", "unknown")
+        action_type = str(action_type)
+        self.action_counts[action_type] = self.action_counts.get(action_type, 0) + 1
+
+        # Env step timing: time since the previous step was logged
+        timestamp = step.get("timestamp")
+        if isinstance(timestamp, (int, float)):
+            if self.last_timestamp is not None and timestamp >= self.last_timestamp:
+                if action_type not in self.step_sketches:
+                    self.step_sketches[action_type] = QuantileSketch()
+                self.step_sketches[action_type].add((timestamp - self.last_timestamp) * 1000)
+            self.last_timestamp = timestamp
+
+    def result(self, allow_empty: bool = False) -> Dict[str, Any] | None:
+        if not self.total_steps and not allow_empty:
+            return None
 
         # Determine overall success
-        success = error_count == 0 or success_count > error_count
+        success = self.error_count == 0 or self.success_count > self.error_count
 
         return {
-            "episode_id": file_path.stem,
-            "task_id": file_path.stem,
+            "episode_id": self.episode_id,
+            "task_id": self.episode_id,
             "success": success,
-            "steps": actions,
-            "steps_count": total_steps,
-            "success_count": success_count,
-            "error_count": error_count,
-            "backtracks": backtracks,
-            "unique_urls": len(urls_visited),
-            "avg_dom_size": sum(dom_sizes) / len(dom_sizes) if dom_sizes else 0,
-            "max_dom_size": max(dom_sizes) if dom_sizes else 0,
-            "min_dom_size": min(dom_sizes) if dom_sizes else 0,
+            "action_counts": self.action_counts,
+            "steps_count": self.total_steps,
+            "success_count": self.success_count,
+            "error_count": self.error_count,
+            "backtracks": self.backtracks,
+            "unique_urls": len(self.urls_visited),
+            "avg_dom_size": self.dom_sizes.mean,
+            "max_dom_size": self.dom_sizes.max,
+            "min_dom_size": self.dom_sizes.min,
+            "dom_size_std": round(self.dom_sizes.std, 2),
+            "step_duration_sketches": {a: sk.to_dict() for a, sk in self.step_sketches.items()},
         }
+
+
+def _new_episode_fold(entry: FileEntry) -> _EpisodeFold:
+    return _EpisodeFold(entry.path.stem)
@@ -0,0 +1,219 @@
+# web_complexity_lab/collectors/corpus.py
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from functools import partial
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Tuple
+from pathlib import Path
+import json
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    path: Path
+    size: int
+    mtime: float
+
+    @property
+    def suffix(self) -> str:
+        return self.path.suffix
+
+    @classmethod
+    def from_path(cls, path: Path) -> "FileEntry | None":
+        """Entry for a file outside the corpus listings; None if it cannot be stat'ed."""
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return cls(path, st.st_size, st.st_mtime)
+
+
+class AppCorpus:
+    """
+    Per-application index of the log files the collectors read.
+
+    Each directory is listed once (path, size, mtime) and each file is decoded
+    at most once; LogParser, AgentLogParser and UIStructureCollector share it
+    instead of re-reading the same agent logs:
+
+      .json   -> load(): the decoded JSON document, kept for the app's run
+      .jsonl  -> fold(): the file is streamed line by line once, and every
+                 decoded record is fed to the fold each collector registered
+                 (an object with add(record) and result()). Only the folded
+                 results are kept, so memory does not grow with log length.
+                 The pass runs only the folds that will be asked for: those
+                 of collectors that list the file, have not finished
+                 (release_folds) and have no cached result for it.
+
+    With a ResultCache attached, per-file collector results are reused across
+    runs and unchanged files are never opened.
+
+    map_cached() parses the remaining files on an optional executor. With a
+    thread pool the shared one-pass folds work as above; a process pool gets
+    a copy of the corpus without the cache or any memoized content, so each
+    collector streams its own .jsonl files there.
+    """
+
+    # files handed to an executor per task
+    CHUNK_SIZE = 16
+
+    def __init__(self, app_config, cache=None):
+        self.app_config = app_config
+        self.cache = cache
+        self.root = Path(app_config.root_path)
+        self._listings: Dict[Path, List[FileEntry]] = {}
+        self._parsed: Dict[Path, Any] = {}
+        self._folds: Dict[str, Callable[[FileEntry], Any]] = {}
+        self._fold_paths: Dict[str, Tuple[str, ...]] = {}
+        self._fold_files: Dict[str, set] = {}
+        self._fold_plan: Dict[Path, set] = {}
+        self._released: set = set()
+        self._folded: Dict[Tuple[Path, str], Any] = {}
+
+    # ------------------------------------------------------------------
+    def list_files(self, rel_paths: Iterable[str], suffixes: Tuple[str, ...]) -> List[FileEntry]:
+        """Files below root/<rel_path> with one of the suffixes, sorted, without duplicates."""
+        seen = set()
+        entries: List[FileEntry] = []
+        for rel in rel_paths:
+            for entry in self._listing(self.root / rel):
+                if entry.suffix in suffixes and entry.path not in seen:
+                    seen.add(entry.path)
+                    entries.append(entry)
+        return entries
+
+    def _listing(self, directory: Path) -> List[FileEntry]:
+        key = directory.resolve() if directory.exists() else directory
+        if key not in self._listings:
+            entries: List[FileEntry] = []
+            if directory.exists():
+                for p in sorted(directory.rglob("*")):
+                    try:
+                        st = p.stat()
+                    except OSError:
+                        continue
+                    if p.is_file():
+                        entries.append(FileEntry(p, st.st_size, st.st_mtime))
+            self._listings[key] = entries
+        return self._listings[key]
+
+    # ------------------------------------------------------------------
+    def map_cached(
+        self,
+        collector: str,
+        entries: List[FileEntry],
+        compute: Callable[[FileEntry], Any],
+        executor: Executor | None = None,
+    ) -> List[Any]:
+        """
+        compute(entry) for every entry, in entry order. Cache lookups and
+        writes stay in this thread; files that need parsing are sent to the
+        executor in chunks of CHUNK_SIZE.
+        """
+        results: List[Any] = [None] * len(entries)
+        todo: List[int] = []
+        digests: Dict[int, str | None] = {}
+        for i, entry in enumerate(entries):
+            if self.cache is not None:
+                found, value, digests[i] = self.cache.lookup(collector, entry)
+                if found:
+                    results[i] = value
+                    continue
+            todo.append(i)
+
+        # decided here, where the cache may be used, before any file is streamed
+        for i in todo:
+            path = entries[i].path
+            if entries[i].suffix == ".jsonl" and path not in self._fold_plan and (path, collector) not in self._folded:
+                self._fold_plan[path] = {n for n in self._folds if self._wants_fold(n, entries[i])}
+
+        pending = [entries[i] for i in todo]
+        if executor is None or len(pending) < 2:
+            computed = [compute(entry) for entry in pending]
+        else:
+            chunks = [pending[k:k + self.CHUNK_SIZE] for k in range(0, len(pending), self.CHUNK_SIZE)]
+            # map() yields in submission order, so the merge is deterministic
+            computed = [value for chunk in executor.map(partial(_compute_chunk, compute), chunks) for value in chunk]
+
+        for i, value in zip(todo, computed):
+            results[i] = value
+            if self.cache is not None:
+                self.cache.store(collector, entries[i], value, digests.get(i))
+        return results
+
+    def register_fold(self, name: str, factory: Callable[[FileEntry], Any], rel_paths: Iterable[str] = ()) -> None:
+        """
+        factory(entry) returns a fresh fold for one .jsonl file. rel_paths
+        are where the collector lists its files; name is also its cache key.
+        """
+        self._folds[name] = factory
+        self._fold_paths[name] = tuple(rel_paths)
+
+    def release_folds(self, name: str) -> None:
+        """The `name` collector is done: its fold no longer runs and unclaimed results are dropped."""
+        self._released.add(name)
+        for key in [key for key in self._folded if key[1] == name]:
+            del self._folded[key]
+
+    def _wants_fold(self, name: str, entry: FileEntry) -> bool:
+        """Whether the `name` collector will still ask for the fold of this file."""
+        if name in self._released:
+            return False
+        if name not in self._fold_files:
+            self._fold_files[name] = {e.path for e in self.list_files(self._fold_paths[name], (".jsonl",))}
+        if entry.path not in self._fold_files[name]:
+            return False
+        return self.cache is None or not self.cache.contains(name, entry)
+
+    def fold(self, entry: FileEntry, name: str) -> Any:
+        """Result of the `name` fold over a .jsonl file; one streamed pass serves every wanted fold."""
+        key = (entry.path, name)
+        if key not in self._folded:
+            wanted = self._fold_plan.pop(entry.path, set()) | {name}
+            pending = {
+                n: make for n, make in self._folds.items()
+                if n in wanted and n not in self._released and (entry.path, n) not in self._folded
+            }
+            folds = {n: make(entry) for n, make in pending.items()}
+            try:
+                with entry.path.open(encoding="utf-8") as f:
+                    for record in self.iter_jsonl(f):
+                        for fold in folds.values():
+                            fold.add(record)
+            except (OSError, UnicodeDecodeError):
+                # unreadable file: same as an empty log
+                folds = {n: make(entry) for n, make in pending.items()}
+            for n, fold in folds.items():
+                self._folded[(entry.path, n)] = fold.result()
+        return self._folded.pop(key)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # what a worker process needs: the configuration and the fold factories
+        state = self.__dict__.copy()
+        state.update(cache=None, _listings={}, _parsed={}, _folded={}, _fold_plan={}, _fold_files={})
+        return state
+
+    def load(self, entry: FileEntry) -> Any:
+        """Decoded content of a .json file, or None if it cannot be read."""
+        if entry.path not in self._parsed:
+            try:
+                self._parsed[entry.path] = json.loads(entry.path.read_text(encoding="utf-8"))
+            except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+                self._parsed[entry.path] = None
+        return self._parsed[entry.path]
+
+    @staticmethod
+    def iter_jsonl(lines: Iterable[str]) -> Iterator[Any]:
+        """Decoded JSONL lines; blank and undecodable lines are skipped."""
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # a crashed run may leave a truncated last line
+                continue
+
+
+def _compute_chunk(compute: Callable[[FileEntry], Any], chunk: List[FileEntry]) -> List[Any]:
+    return [compute(entry) for entry in chunk]
@@ -1,15 +1,27 @@
 # web_complexity_lab/collectors/log_parser.py
-from typing import List, Dict, Any
+from concurrent.futures import Executor
+from typing import List, Dict, Any, Iterable, Iterator, Tuple
 from pathlib import Path
-import json
+import xml.etree.ElementTree as ET
+
+from .corpus import AppCorpus, FileEntry
+from ..sketches import QuantileSketch
+
+# <property> that generated tests put on their JUnit <testsuite>: its
+# <testcase> elements are the steps of one test, not separate tests
+STEP_GRANULARITY_PROPERTY = "wcx.granularity"
+
+# rerun elements written by pytest-rerunfailures / Maven Surefire
+_RERUN_TAGS = ("rerunFailure", "rerunError", "flakyFailure", "flakyError", "rerun")
 
 
 class LogParser:
     """
-    Parses test execution logs (JSON step arrays produced by generated tests,
-    JUnit XML if present) into normalised per-test timing and status records.
+    Parses test execution logs (JSON step arrays or JSONL step streams produced
+    by generated tests, JUnit XML if present) into normalised per-test timing
+    and status records.
 
-    Expected JSON format (array of step objects):
+    Expected JSON format (array of step objects; JSONL has one per line):
         [
             {
                 "step": 1,
@@ -23,55 +35,76 @@ class LogParser:
             },
             ...
         ]
+
+    JUnit XML (Playwright Test's junit reporter, pytest, generated tests) is read
+    from logs.junit_paths only and streamed: every <testcase> becomes a test
+    record, except in suites marked wcx.granularity=steps by generated tests,
+    where the <testsuite> is the test and its <testcase> elements the steps.
+
+    With an executor (thread or process pool), files are parsed in parallel.
     """
 
-    def __init__(self, app_config):
+    def __init__(self, app_config, corpus: AppCorpus | None = None, executor: Executor | None = None):
         self.app_config = app_config
+        self.corpus = corpus or AppCorpus(app_config)
+        self.executor = executor
+        self.corpus.register_fold("log_parser", _new_log_fold, self._search_paths()[1])
 
-    def collect(self) -> List[Dict[str, Any]]:
-        results: List[Dict[str, Any]] = []
-        root = Path(self.app_config.root_path)
+    def __getstate__(self) -> Dict[str, Any]:
+        # sent to process-pool workers, which parse their chunk sequentially
+        return {**self.__dict__, "executor": None}
 
+    def _search_paths(self) -> Tuple[List[str], List[str]]:
+        """(junit_paths, junit_paths + agent log_paths)."""
         # Gather candidate directories from both logs and agents config
-        search_dirs: List[Path] = []
-
         logs_cfg = (
             self.app_config.logs
             if hasattr(self.app_config, "logs") and isinstance(self.app_config.logs, dict)
             else {}
         )
-        for rel in logs_cfg.get("junit_paths", []):
-            search_dirs.append(root / rel)
-
         agents_cfg = (
             self.app_config.agents
             if hasattr(self.app_config, "agents") and isinstance(self.app_config.agents, dict)
             else {}
         )
-        for rel in agents_cfg.get("log_paths", []):
-            search_dirs.append(root / rel)
+        junit_paths = logs_cfg.get("junit_paths", [])
+        return junit_paths, list(junit_paths) + list(agents_cfg.get("log_paths", []))
 
-        for log_dir in search_dirs:
-            if not log_dir.exists():
-                continue
-            for log_file in sorted(log_dir.rglob("*.json")):
-                if not log_file.is_file():
-                    continue
-                parsed = self._parse_json_log(log_file)
+    def collect(self) -> List[Dict[str, Any]]:
+        results: List[Dict[str, Any]] = []
+        junit_paths, search_paths = self._search_paths()
+
+        log_files = self.corpus.list_files(search_paths, (".json", ".jsonl"))
+        indexed = {entry.path for entry in log_files}
+        # A streamed .jsonl next to it supersedes the old array format
+        log_files = [
+            entry for entry in log_files
+            if not (entry.suffix == ".json" and entry.path.with_suffix(".jsonl") in indexed)
+        ]
+        try:
+            for parsed in self.corpus.map_cached("log_parser", log_files, self._parse_log, self.executor):
                 if parsed:
                     results.append(parsed)
+        finally:
+            self.corpus.release_folds("log_parser")
+
+        # Generated tests write both a step log and a JUnit file for the same run
+        seen = {r["test_id"] for r in results}
+        junit_files = self.corpus.list_files(junit_paths, (".xml",))
+        for records in self.corpus.map_cached("junit", junit_files, self._parse_junit_xml, self.executor):
+            for record in records:
+                if record["test_id"] not in seen:
+                    results.append(record)
 
         return results
 
     # ------------------------------------------------------------------
-    def _parse_json_log(self, file_path: Path) -> Dict[str, Any] | None:
-        """Parse a single JSON test-log file into a normalised record."""
-        try:
-            content = file_path.read_text(encoding="utf-8")
-            data = json.loads(content)
-        except (json.JSONDecodeError, OSError):
-            return None
+    def _parse_log(self, entry: FileEntry) -> Dict[str, Any] | None:
+        """Normalise one indexed JSON / JSONL step log."""
+        if entry.suffix == ".jsonl":
+            return self.corpus.fold(entry, "log_parser")
 
+        data = self.corpus.load(entry)
         # Accept a bare array of steps or a dict with a "steps" key
         if isinstance(data, list):
             steps = data
@@ -80,40 +113,192 @@ class LogParser:
         else:
             return None
 
-        if not steps:
-            return None
+        return self._build_record(entry.path.stem, steps)
+
+    @staticmethod
+    def _timed_steps(records: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+        # agent exploration logs share the directories; only timed steps count
+        for step in records:
+            if isinstance(step, dict) and "duration" in step:
+                yield step
+
+    @staticmethod
+    def _iter_jsonl_steps(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """Timed steps from raw JSONL lines (logs read outside the corpus)."""
+        return LogParser._timed_steps(AppCorpus.iter_jsonl(lines))
+
+    def _parse_junit_xml(self, entry: FileEntry) -> List[Dict[str, Any]]:
+        """Stream a JUnit XML file into normalised test records."""
+        records: List[Dict[str, Any]] = []
+        try:
+            for record in self._iter_junit_records(entry.path):
+                records.append(record)
+        except (ET.ParseError, OSError):
+            # keep what was read before a truncated / malformed tail
+            pass
+        return records
+
+    @staticmethod
+    def _iter_junit_records(file_path: Path) -> Iterator[Dict[str, Any]]:
+        """
+        iterparse over the report; each processed <testcase> / <testsuite> is
+        detached from its parent, so memory stays flat on large reports.
+        """
+        stack: List[ET.Element] = []
+        suite_name = ""
+        suite_fold: _TestRecordFold | None = None  # step-granularity suite
 
-        normalised_steps: List[Dict[str, Any]] = []
-        total_duration_s = 0.0
-        failures: List[str] = []
+        for event, elem in ET.iterparse(str(file_path), events=("start", "end")):
+            if event == "start":
+                if elem.tag == "testsuite":
+                    suite_name = elem.get("name", "")
+                    suite_fold = None
+                stack.append(elem)
+                continue
+
+            stack.pop()
+            if elem.tag == "property":
+                if elem.get("name") == STEP_GRANULARITY_PROPERTY and elem.get("value") == "steps":
+                    suite_fold = _TestRecordFold(suite_name or file_path.stem)
+                continue
+
+            if elem.tag == "testcase":
+                step = _junit_case_step(elem)
+                if suite_fold is not None:
+                    suite_fold.add(step)
+                else:
+                    name = elem.get("name", "")
+                    classname = elem.get("classname", "")
+                    fold = _TestRecordFold(f"{classname}::{name}" if classname else name)
+                    fold.add(step)
+                    yield fold.result()
+            elif elem.tag == "testsuite":
+                if suite_fold is not None:
+                    record = suite_fold.result()
+                    if record:
+                        yield record
+                suite_fold = None
+            else:
+                # <failure>, <skipped>, <system-out>... go with their testcase
+                continue
+
+            if stack:
+                stack[-1].remove(elem)
+
+    @staticmethod
+    def _build_record(test_id: str, steps: Iterable[Dict[str, Any]]) -> Dict[str, Any] | None:
+        """Fold raw step objects into the normalised per-test record."""
+        fold = _TestRecordFold(test_id)
+        for raw in steps:
+            fold.add(raw)
+        return fold.result()
+
+
+class _TestRecordFold:
+    """
+    Builds the normalised per-test record one raw step at a time, plus a
+    mergeable quantile sketch of the step durations (ms) per action type.
+    """
+
+    def __init__(self, test_id: str, timed_only: bool = False):
+        self.test_id = test_id
+        # agent exploration logs share the directories; only timed steps count
+        self.timed_only = timed_only
+        self.steps: List[Dict[str, Any]] = []
+        self.total_duration_s = 0.0
+        self.passed_count = 0
+        self.failed_count = 0
+        self.skipped_count = 0
+        self.retries = 0
+        self.failures: List[str] = []
+        self.duration_sketches: Dict[str, QuantileSketch] = {}
 
-        for idx, raw in enumerate(steps):
-            dur = raw.get("duration", 0)
-            status = raw.get("status", "passed")
-            error = raw.get("error", "")
-            total_duration_s += dur
+    def add(self, raw: Any) -> None:
+        if self.timed_only and not (isinstance(raw, dict) and "duration" in raw):
+            return
 
-            if status == "failed":
-                failures.append(error or f"step {idx} failed")
+        idx = len(self.steps)
+        dur = raw.get("duration", 0)
+        status = raw.get("status", "passed")
+        error = raw.get("error", "")
+        action = _action_type(raw.get("action", "unknown"))
+        self.total_duration_s += dur
+        self.retries += raw.get("retries", 0)
 
-            normalised_steps.append({
-                "step_index": idx,
-                "duration_ms": round(dur * 1000, 1),
-                "status": status,
-            })
+        if action not in self.duration_sketches:
+            self.duration_sketches[action] = QuantileSketch()
+        self.duration_sketches[action].add(dur * 1000)
 
-        total_duration_ms = round(total_duration_s * 1000, 1)
-        passed_count = sum(1 for s in normalised_steps if s["status"] == "passed")
-        failed_count = len(normalised_steps) - passed_count
-        overall_status = "passed" if failed_count == 0 else "failed"
+        if status == "passed":
+            self.passed_count += 1
+        elif status == "skipped":
+            self.skipped_count += 1
+        else:
+            # "failed", "error", "timedOut" and any unknown status
+            self.failed_count += 1
+            self.failures.append(error or f"step {idx} {status}")
+
+        self.steps.append({
+            "step_index": idx,
+            "action": action,
+            "duration_ms": round(dur * 1000, 1),
+            "status": status,
+        })
+
+    def result(self) -> Dict[str, Any] | None:
+        if not self.steps:
+            return None
+
+        if self.failed_count:
+            status = "failed"
+        elif self.skipped_count == len(self.steps):
+            status = "skipped"
+        else:
+            status = "passed"
 
         return {
-            "test_id": file_path.stem,
-            "status": overall_status,
-            "duration_ms": total_duration_ms,
-            "steps": normalised_steps,
-            "passed_steps": passed_count,
-            "failed_steps": failed_count,
-            "retries": 0,
-            "failures": failures,
-        }
\ No newline at end of file
+            "test_id": self.test_id,
+            "status": status,
+            "duration_ms": round(self.total_duration_s * 1000, 1),
+            "steps": self.steps,
+            "passed_steps": self.passed_count,
+            "failed_steps": self.failed_count,
+            "retries": self.retries,
+            "failures": self.failures,
+            "step_duration_sketches": {a: sk.to_dict() for a, sk in self.duration_sketches.items()},
+        }
+
+
+def _new_log_fold(entry: FileEntry) -> _TestRecordFold:
+    # agent exploration logs share the directories; only timed steps count
+    return _TestRecordFold(entry.path.stem, timed_only=True)
+
+
+def _junit_case_step(case: ET.Element) -> Dict[str, Any]:
+    """Raw step for one <testcase>: time, outcome, first failure message, reruns."""
+    status = "passed"
+    error = ""
+    retries = 0
+    for child in case:
+        if child.tag in ("failure", "error"):
+            if status != "failed":
+                error = child.get("message") or (child.text or "").strip()
+            status = "failed"
+        elif child.tag == "skipped" and status != "failed":
+            status = "skipped"
+        elif child.tag in _RERUN_TAGS:
+            retries += 1
+    return {
+        "action": "testcase",
+        "duration": float(case.get("time") or 0),
+        "status": status,
+        "error": error,
+        "retries": retries,
+    }
+
+
+def _action_type(action: Any) -> str:
+    """Action label of a step: generated tests log a name, agents a locator dict."""
+    if isinstance(action, dict):
+        action = action.get("strategy", action.get("type", "unknown"))
+    return str(action)
@@ -0,0 +1,127 @@
+# web_complexity_lab/collectors/result_cache.py
+from typing import List, Any, Callable, Tuple
+from pathlib import Path
+import hashlib
+import json
+import sqlite3
+
+from .corpus import FileEntry
+
+CACHE_FILENAME = ".wcx_cache.sqlite"
+
+
+class ResultCache:
+    """
+    SQLite store of per-file collector results, so files that did not change
+    since the last run are not parsed again.
+
+    Rows are keyed by (collector, path). A row is reused while the file's size
+    and mtime match; if only the mtime moved (checkout, touch) the SHA-1 of the
+    content decides. New results are buffered and written in one transaction
+    on close(), so parallel evaluations hold the database lock only briefly.
+    """
+
+    SCHEMA_VERSION = 9
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30)
+        self._pending: List[Tuple] = []
+        self.hits = 0
+        self.misses = 0
+
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS file_results")
+            self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS file_results (
+                collector TEXT NOT NULL,
+                path TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                sha1 TEXT NOT NULL,
+                result TEXT NOT NULL,
+                PRIMARY KEY (collector, path)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get_or_compute(self, collector: str, entry: FileEntry, compute: Callable[[FileEntry], Any]) -> Any:
+        """Cached result of compute(entry), recomputed only if the file changed."""
+        found, value, digest = self.lookup(collector, entry)
+        if not found:
+            value = compute(entry)
+            self.store(collector, entry, value, digest)
+        return value
+
+    def lookup(self, collector: str, entry: FileEntry) -> Tuple[bool, Any, str | None]:
+        """
+        (found, result, digest) for an entry. On a miss, digest is the SHA-1
+        already computed while checking (or None) and can be passed to store().
+        """
+        row = self._conn.execute(
+            "SELECT size, mtime, sha1, result FROM file_results WHERE collector = ? AND path = ?",
+            (collector, str(entry.path)),
+        ).fetchone()
+
+        digest = None
+        if row is not None and row[0] == entry.size:
+            if row[1] == entry.mtime:
+                self.hits += 1
+                return True, json.loads(row[3]), digest
+            digest = _sha1(entry.path)
+            if digest == row[2]:
+                self.hits += 1
+                self._pending.append((collector, str(entry.path), entry.size, entry.mtime, digest, row[3]))
+                return True, json.loads(row[3]), digest
+
+        self.misses += 1
+        return False, None, digest
+
+    def contains(self, collector: str, entry: FileEntry) -> bool:
+        """Whether lookup() would find a result for the entry (without counting or buffering anything)."""
+        row = self._conn.execute(
+            "SELECT size, mtime, sha1 FROM file_results WHERE collector = ? AND path = ?",
+            (collector, str(entry.path)),
+        ).fetchone()
+        if row is None or row[0] != entry.size:
+            return False
+        return row[1] == entry.mtime or _sha1(entry.path) == row[2]
+
+    def store(self, collector: str, entry: FileEntry, value: Any, digest: str | None = None) -> None:
+        """Buffer a freshly computed result; written on close()."""
+        if digest is None:
+            digest = _sha1(entry.path)
+        self._pending.append(
+            (collector, str(entry.path), entry.size, entry.mtime, digest, json.dumps(value, ensure_ascii=False))
+        )
+
+    def close(self) -> None:
+        if self._pending:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO file_results VALUES (?, ?, ?, ?, ?, ?)", self._pending
+                )
+            self._pending = []
+        self._conn.close()
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def _sha1(path: Path) -> str:
+    h = hashlib.sha1()
+    try:
+        with path.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    except OSError:
+        return ""
+    return h.hexdigest()
@@ -1,38 +1,218 @@
 # web_complexity_lab/collectors/test_parser.py
-from typing import List, Dict, Any
+from concurrent.futures import Executor
+from typing import List, Dict, Any, Tuple
 from pathlib import Path
+import ast
 import re
 
+from .corpus import AppCorpus, FileEntry
+
+# One scan over the source counts every action kind. Each top-level branch
+# starts with a literal, so the regex engine can skip ahead to candidate
+# characters. Assertion words never contain ".", and every action starts with
+# one, so branches cannot overlap and the counts equal those of separate
+# findall() calls per kind.
+_ACTION_TOKENS = re.compile(
+    r"\.(click|fill|type|goto|navigate|select)\s*\("
+    r"|expect|assert|toBe|toEqual|toBeVisible|toHaveText"
+)
+_ACTION_KINDS = {
+    "click": "clicks",
+    "fill": "fills",
+    "type": "fills",
+    "goto": "navigations",
+    "navigate": "navigations",
+    "select": "selects",
+}
+# kinds that make up a test's step total (assertions are not steps)
+_ACTION_TOTAL_KINDS = ("clicks", "fills", "navigations", "selects")
+
+
+# literal-led so the scan can skip ahead; _calls() checks the word boundary
+_TS_TEST = re.compile(r"test\s*\(\s*['\"]([^'\"]+)['\"]")
+_TS_HOOK = re.compile(r"beforeEach\s*\(")
+_PY_TEST = re.compile(r"def\s+(test_\w+)\s*\(")
+
+# TypeScript scanner: a run of plain code ends at one of these characters
+_TS_SPECIAL = re.compile(r"[()'\"`/{}]")
+# a "/" after one of these (or at the start) opens a regex literal, not a division
+_TS_REGEX_AFTER = set("(,=:[!&|?{};+-*%<>~^")
+_TS_REGEX_KEYWORDS = {
+    "return", "typeof", "instanceof", "in", "of", "new", "delete", "void", "throw", "case", "do", "else",
+    "yield", "await",
+}
+_TS_LAST_WORD = re.compile(r"[\w$]+$")
+
+
+def _match_parens(source: str) -> Dict[int, int]:
+    """
+    Maps the position of every "(" of TypeScript code to its matching ")",
+    or to -1 when it has none. Brackets inside comments, strings, template
+    text and regex literals are skipped; ${...} in templates is code.
+    """
+    pairs: Dict[int, int] = {}
+    parens: List[int] = []
+    # one entry per open "{" of code: True if it is the "${" of a template
+    braces: List[bool] = []
+    prev = ""  # code before i, up to its last non-blank character
+    i, n = 0, len(source)
+    while i < n:
+        m = _TS_SPECIAL.search(source, i)
+        if m is None:
+            break
+        code = source[i:m.start()].rstrip()
+        if code:
+            prev = code
+        i = m.start()
+        c = source[i]
+        if c == "(":
+            pairs[i] = -1
+            parens.append(i)
+        elif c == ")":
+            if parens:
+                pairs[parens.pop()] = i
+        elif c == "{":
+            braces.append(False)
+        elif c == "}" and braces and braces.pop():
+            i = _skip_template(source, i + 1, braces)
+            prev = source[i - 1]
+            continue
+        elif c in "'\"":
+            i = _skip_string(source, i)
+            prev = c
+            continue
+        elif c == "`":
+            i = _skip_template(source, i + 1, braces)
+            prev = source[i - 1]
+            continue
+        elif c == "/":
+            if source.startswith("//", i):
+                end = source.find("\n", i)
+                i = n if end < 0 else end
+                continue
+            if source.startswith("/*", i):
+                end = source.find("*/", i + 2)
+                i = n if end < 0 else end + 2
+                continue
+            if _regex_allowed(prev):
+                i = _skip_regex(source, i)
+                prev = "/"
+                continue
+        prev = c
+        i += 1
+    return pairs
+
+
+def _skip_string(source: str, i: int) -> int:
+    """Position after the '...' or "..." string starting at i (or its line)."""
+    quote = source[i]
+    i += 1
+    while i < len(source):
+        c = source[i]
+        if c == "\\":
+            i += 2
+        elif c == quote:
+            return i + 1
+        elif c == "\n":
+            return i  # unterminated
+        else:
+            i += 1
+    return len(source)
+
+
+def _skip_template(source: str, i: int, braces: List[bool]) -> int:
+    """
+    Position after the template text starting at i: after its closing "`",
+    or after a "${" (pushed on braces) where code resumes.
+    """
+    while i < len(source):
+        c = source[i]
+        if c == "\\":
+            i += 2
+        elif c == "`":
+            return i + 1
+        elif c == "$" and source.startswith("{", i + 1):
+            braces.append(True)
+            return i + 2
+        else:
+            i += 1
+    return len(source)
+
+
+def _skip_regex(source: str, i: int) -> int:
+    """Position after the /.../flags regex literal starting at i (or its line)."""
+    in_class = False
+    i += 1
+    while i < len(source):
+        c = source[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == "\n":
+            return i  # was a division after all
+        if in_class:
+            in_class = c != "]"
+        elif c == "[":
+            in_class = True
+        elif c == "/":
+            i += 1
+            while i < len(source) and source[i].isalpha():
+                i += 1
+            return i
+        i += 1
+    return len(source)
+
+
+def _regex_allowed(prev: str) -> bool:
+    """Whether a "/" after the code prev starts a regex literal."""
+    if not prev or prev[-1] in _TS_REGEX_AFTER:
+        return True
+    word = _TS_LAST_WORD.search(prev)
+    return bool(word) and word.group() in _TS_REGEX_KEYWORDS
+
+
+def _ts_test_id(name: str) -> str:
+    return name.replace(" ", "_").lower()
+
+
+def _calls(pattern: re.Pattern, source: str) -> List[re.Match]:
+    """Matches of pattern that start a word (not e.g. "latest(" for "test(")."""
+    return [
+        m for m in pattern.finditer(source)
+        if m.start() == 0 or not (source[m.start() - 1].isalnum() or source[m.start() - 1] in "_$")
+    ]
+
 
 class TestParser:
     """
     Parses UI tests (Playwright TypeScript and Python) into normalized step representation.
+    With an executor (thread or process pool), files are parsed in parallel.
     """
 
-    def __init__(self, app_config):
+    def __init__(self, app_config, corpus: AppCorpus | None = None, executor: Executor | None = None):
         self.app_config = app_config
+        self.corpus = corpus or AppCorpus(app_config)
+        self.executor = executor
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # sent to process-pool workers, which parse their chunk sequentially
+        return {**self.__dict__, "executor": None}
 
     def collect(self) -> List[Dict[str, Any]]:
         results = []
         test_paths = self.app_config.tests.get("test_paths", [])
-        root = Path(self.app_config.root_path)
 
-        for rel_path in test_paths:
-            test_dir = root / rel_path
-            if not test_dir.exists():
-                continue
-
-            # Find all test files
-            for test_file in test_dir.rglob("*"):
-                if test_file.suffix in [".ts", ".py"] and test_file.is_file():
-                    parsed = self._parse_test_file(test_file)
-                    if parsed:
-                        results.extend(parsed)
+        # Find all test files
+        entries = self.corpus.list_files(test_paths, (".ts", ".py"))
+        for parsed in self.corpus.map_cached("test_parser", entries, self._parse_test_file, self.executor):
+            if parsed:
+                results.extend(parsed)
 
         return results
 
-    def _parse_test_file(self, file_path: Path) -> List[Dict[str, Any]]:
+    def _parse_test_file(self, entry: FileEntry) -> List[Dict[str, Any]]:
         """Parse a single test file and extract test info."""
+        file_path = entry.path
         try:
             content = file_path.read_text(encoding="utf-8")
         except Exception:
@@ -48,107 +228,139 @@ class TestParser:
         return tests
 
     def _parse_typescript_tests(self, content: str, file_path: Path) -> List[Dict[str, Any]]:
-        """Parse Playwright TypeScript test files."""
-        tests = []
+        """
+        Parse Playwright TypeScript test files.
 
-        # Find test blocks: test('name', ...)
-        test_pattern = r"test\s*\(\s*['\"]([^'\"]+)['\"]"
-        test_matches = re.findall(test_pattern, content)
+        Each test('name', ...) call spans from its "(" to the matching ")";
+        actions are counted inside that span. beforeEach hooks run before
+        every test, so their actions are added to each test of the file.
+        A file with a single test needs no scan: the whole file is its scope.
+        """
+        candidates = _calls(_TS_TEST, content)
+        if len(candidates) == 1:
+            return self._whole_file_test(content, file_path, _ts_test_id(candidates[0].group(1)))
 
-        # Count actions in the file
-        actions = self._count_actions(content)
+        pairs = _match_parens(content) if candidates else {}
 
-        # If we found test names, create entries for each
-        if test_matches:
-            steps_per_test = max(1, actions["total"] // len(test_matches))
-            for test_name in test_matches:
-                tests.append({
-                    "test_id": test_name.replace(" ", "_").lower(),
-                    "file": str(file_path),
-                    "framework": "playwright",
-                    "steps": self._generate_steps(actions, steps_per_test),
-                    "steps_count": steps_per_test,
-                    "clicks": actions["clicks"] // max(1, len(test_matches)),
-                    "fills": actions["fills"] // max(1, len(test_matches)),
-                    "navigations": actions["navigations"] // max(1, len(test_matches)),
-                    "assertions": actions["assertions"] // max(1, len(test_matches)),
-                })
-        elif actions["total"] > 0:
-            # No named tests but has actions - treat whole file as one test
-            tests.append({
-                "test_id": file_path.stem,
-                "file": str(file_path),
-                "framework": "playwright",
-                "steps": self._generate_steps(actions, actions["total"]),
-                "steps_count": actions["total"],
-                "clicks": actions["clicks"],
-                "fills": actions["fills"],
-                "navigations": actions["navigations"],
-                "assertions": actions["assertions"],
-            })
+        # a "(" inside a comment or string is not in pairs: not a real call
+        calls = [(m.group(1), m.start() + m.group(0).index("(")) for m in candidates]
+        calls = [(name, open_pos) for name, open_pos in calls if open_pos in pairs]
+        if not calls:
+            return self._whole_file_test(content, file_path)
+        if any(pairs[open_pos] < 0 for _, open_pos in calls):
+            # unbalanced brackets: keep every test, without per-test scopes
+            return self._split_evenly([_ts_test_id(name) for name, _ in calls], content, file_path)
+        tests = [(name, open_pos, pairs[open_pos]) for name, open_pos in calls]
 
-        return tests
+        hooks = [
+            (m.end() - 1, pairs[m.end() - 1])
+            for m in _calls(_TS_HOOK, content)
+            if pairs.get(m.end() - 1, -1) >= 0
+        ]
+        spans = [(start, end) for _, start, end in tests] + hooks
+        counts = self._count_actions_per_span(content, spans)
+
+        hook_counts = counts[len(tests):]
+        results = []
+        for (name, _, _), test_counts in zip(tests, counts):
+            if hook_counts:
+                for hook in hook_counts:
+                    for kind in _ACTION_TOTAL_KINDS + ("assertions",):
+                        test_counts[kind] += hook[kind]
+                test_counts["total"] = max(1, sum(test_counts[kind] for kind in _ACTION_TOTAL_KINDS))
+            results.append(self._test_entry(_ts_test_id(name), file_path, test_counts))
+        return results
 
     def _parse_python_tests(self, content: str, file_path: Path) -> List[Dict[str, Any]]:
-        """Parse Playwright Python test files."""
-        tests = []
+        """
+        Parse Playwright Python test files; actions are counted per test
+        function body. As for TypeScript, a single test gets the whole file.
+        """
+        candidates = _PY_TEST.findall(content)
+        if len(candidates) == 1:
+            return self._whole_file_test(content, file_path, candidates[0])
 
-        # Find test functions: def test_xxx(
-        test_pattern = r"def\s+(test_\w+)\s*\("
-        test_matches = re.findall(test_pattern, content)
+        try:
+            tree = ast.parse(content)
+        except SyntaxError:
+            return self._split_evenly(candidates, content, file_path)
 
-        actions = self._count_actions(content)
+        line_starts = [0] + [m.end() for m in re.finditer("\n", content)]
 
-        if test_matches:
-            steps_per_test = max(1, actions["total"] // len(test_matches))
-            for test_name in test_matches:
-                tests.append({
-                    "test_id": test_name,
-                    "file": str(file_path),
-                    "framework": "playwright",
-                    "steps": self._generate_steps(actions, steps_per_test),
-                    "steps_count": steps_per_test,
-                    "clicks": actions["clicks"] // max(1, len(test_matches)),
-                    "fills": actions["fills"] // max(1, len(test_matches)),
-                    "navigations": actions["navigations"] // max(1, len(test_matches)),
-                    "assertions": actions["assertions"] // max(1, len(test_matches)),
-                })
-        elif actions["total"] > 0:
-            tests.append({
-                "test_id": file_path.stem,
-                "file": str(file_path),
-                "framework": "playwright",
-                "steps": self._generate_steps(actions, actions["total"]),
-                "steps_count": actions["total"],
-                "clicks": actions["clicks"],
-                "fills": actions["fills"],
-                "navigations": actions["navigations"],
-                "assertions": actions["assertions"],
-            })
+        def offset(line: int) -> int:
+            return line_starts[line - 1] if line <= len(line_starts) else len(content)
 
-        return tests
+        # module-level tests and test methods of (nested) classes
+        functions = []
+        nodes = list(tree.body)
+        for node in nodes:
+            if isinstance(node, ast.ClassDef):
+                nodes.extend(node.body)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name.startswith("test_"):
+                functions.append(node)
+        functions.sort(key=lambda node: node.lineno)
+        if not functions:
+            return self._whole_file_test(content, file_path)
 
-    def _count_actions(self, content: str) -> Dict[str, int]:
-        """Count different action types in test content."""
-        clicks = len(re.findall(r"\.click\s*\(", content))
-        fills = len(re.findall(r"\.fill\s*\(", content))
-        types = len(re.findall(r"\.type\s*\(", content))
-        gotos = len(re.findall(r"\.goto\s*\(", content))
-        navigations = len(re.findall(r"\.navigate\s*\(", content)) + gotos
-        assertions = len(re.findall(r"(expect|assert|toBe|toEqual|toBeVisible|toHaveText)", content))
-        selects = len(re.findall(r"\.select\s*\(", content))
+        spans = [(offset(node.lineno), offset(node.end_lineno + 1)) for node in functions]
+        counts = self._count_actions_per_span(content, spans)
+        return [self._test_entry(node.name, file_path, c) for node, c in zip(functions, counts)]
+
+    def _whole_file_test(self, content: str, file_path: Path, test_id: str | None = None) -> List[Dict[str, Any]]:
+        """Whole file as one test (named after the file unless test_id is given)."""
+        actions = self._count_actions(content)
+        if actions["total"] <= 0:
+            return []
+        return [self._test_entry(test_id or file_path.stem, file_path, actions)]
+
+    def _split_evenly(self, test_names: List[str], content: str, file_path: Path) -> List[Dict[str, Any]]:
+        """Fallback for files that do not parse: divide the file's actions evenly."""
+        if not test_names:
+            return self._whole_file_test(content, file_path)
 
-        total = clicks + fills + types + navigations + selects
+        actions = self._count_actions(content)
+        n = len(test_names)
+        steps_per_test = max(1, actions["total"] // n)
+        share = {kind: actions[kind] // n for kind in ("clicks", "fills", "navigations", "assertions")}
+        return [
+            {
+                **self._test_entry(name, file_path, {**actions, "total": steps_per_test}),
+                **share,
+            }
+            for name in test_names
+        ]
 
+    def _test_entry(self, test_id: str, file_path: Path, actions: Dict[str, int]) -> Dict[str, Any]:
         return {
-            "clicks": clicks,
-            "fills": fills + types,
-            "navigations": navigations,
-            "assertions": assertions,
-            "selects": selects,
-            "total": max(1, total),
+            "test_id": test_id,
+            "file": str(file_path),
+            "framework": "playwright",
+            "steps": self._generate_steps(actions, actions["total"]),
+            "steps_count": actions["total"],
+            "clicks": actions["clicks"],
+            "fills": actions["fills"],
+            "navigations": actions["navigations"],
+            "assertions": actions["assertions"],
         }
 
+    def _count_actions(self, content: str) -> Dict[str, int]:
+        """Count different action types in test content (single pass)."""
+        return self._count_actions_per_span(content, [(0, len(content))])[0]
+
+    def _count_actions_per_span(self, content: str, spans: List[Tuple[int, int]]) -> List[Dict[str, int]]:
+        """
+        Action counts inside each (start, end) span of content. Spans must not
+        overlap, so no part of the file is scanned twice.
+        """
+        counts = []
+        for start, end in spans:
+            c = {"clicks": 0, "fills": 0, "navigations": 0, "selects": 0, "assertions": 0}
+            for action in _ACTION_TOKENS.findall(content, start, end):
+                c[_ACTION_KINDS[action] if action else "assertions"] += 1
+            c["total"] = max(1, sum(c[kind] for kind in _ACTION_TOTAL_KINDS))
+            counts.append(c)
+        return counts
+
     def _generate_steps(self, actions: Dict[str, int], count: int) -> List[Dict[str, Any]]:
         """Generate step list based on action counts."""
         steps = []
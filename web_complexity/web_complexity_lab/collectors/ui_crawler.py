@@ -0,0 +1,225 @@
+# web_complexity_lab/collectors/ui_crawler.py
+from typing import List, Dict, Any, Iterable, Optional
+from urllib.parse import urldefrag, urlsplit
+import asyncio
+import hashlib
+
+# resource types that never change the DOM; they are not fetched while crawling
+DEFAULT_BLOCKED_RESOURCES = ("image", "media", "font")
+
+# Runs in the page. Counts every element, the nesting depth and the
+# interactive elements, lists the link targets and collects the distinct
+# root-to-element tag paths ("html>body>main>ul>li"). Two pages built from
+# the same template share that path set however long their lists are, so
+# it is the structural fingerprint.
+_PAGE_SCRIPT = """
+() => {
+  const tags = {};
+  const paths = new Set();
+  let maxDepth = 0;
+  const root = document.documentElement;
+  const stack = root ? [[root, 1, root.localName]] : [];
+  while (stack.length) {
+    const [el, depth, path] = stack.pop();
+    tags[el.localName] = (tags[el.localName] || 0) + 1;
+    paths.add(path);
+    if (depth > maxDepth) maxDepth = depth;
+    for (const child of el.children) {
+      stack.push([child, depth + 1, path + ">" + child.localName]);
+    }
+  }
+  const count = (selector) => document.querySelectorAll(selector).length;
+  return {
+    tags,
+    paths: Array.from(paths),
+    maxDepth,
+    buttons: count("button"),
+    inputs: count("input:not([type=hidden])"),
+    links: count("a[href]"),
+    selects: count("select"),
+    textareas: count("textarea"),
+    forms: count("form"),
+    hrefs: Array.from(document.querySelectorAll("a[href]"), (a) => a.href),
+  };
+}
+"""
+
+
+class UICrawler:
+    """
+    Breadth-first crawl of a running application with Playwright.
+
+    Starts at ui_structure.start_urls and follows links within their origins,
+    one depth level at a time, until max_depth or max_pages is reached. Each
+    level is visited by `concurrency` browser contexts in parallel; images,
+    media and fonts are blocked. A page whose structural fingerprint was seen
+    before is counted as a variant of the first page with that fingerprint
+    and its links are not followed (they lead to the same templates).
+
+    Settings come from ui_structure.crawl in config.yaml:
+
+        ui_structure:
+          start_urls: ["http://localhost:3000/"]
+          crawl:
+            enabled: true
+            max_depth: 2           # link hops from a start URL
+            max_pages: 50          # pages loaded in total
+            concurrency: 4         # browser contexts
+            timeout_ms: 15000      # per page load
+            block_resources: ["image", "media", "font"]
+
+    Needs the optional playwright package and a Chromium build
+    (pip install "web_complexity_lab[crawl]" && playwright install chromium).
+    """
+
+    def __init__(
+        self,
+        start_urls: Iterable[str],
+        max_depth: int = 2,
+        max_pages: int = 50,
+        concurrency: int = 4,
+        timeout_ms: int = 15000,
+        block_resources: Iterable[str] = DEFAULT_BLOCKED_RESOURCES,
+    ):
+        self.start_urls = [u for u in (_normalize_url(url) for url in start_urls) if u]
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.concurrency = max(1, concurrency)
+        self.timeout_ms = timeout_ms
+        self.block_resources = frozenset(block_resources)
+
+    @classmethod
+    def from_config(cls, app_config) -> "UICrawler":
+        ui_cfg = app_config.ui_structure if isinstance(app_config.ui_structure, dict) else {}
+        crawl_cfg = ui_cfg.get("crawl") or {}
+        return cls(
+            ui_cfg.get("start_urls") or [app_config.base_url],
+            max_depth=crawl_cfg.get("max_depth", 2),
+            max_pages=crawl_cfg.get("max_pages", 50),
+            concurrency=crawl_cfg.get("concurrency", 4),
+            timeout_ms=crawl_cfg.get("timeout_ms", 15000),
+            block_resources=crawl_cfg.get("block_resources", DEFAULT_BLOCKED_RESOURCES),
+        )
+
+    def crawl(self) -> List[Dict[str, Any]]:
+        """
+        One dict per distinct page structure, in crawl order (depth, then URL):
+        url, crawl_depth, fingerprint, variants and the in-page counts
+        (tags, maxDepth, buttons, inputs, links, selects, textareas, forms).
+        """
+        try:
+            from playwright.async_api import async_playwright, Error as PlaywrightError
+        except ImportError as e:
+            raise RuntimeError(
+                "crawling needs Playwright: pip install \"web_complexity_lab[crawl]\" "
+                "and run `playwright install chromium`"
+            ) from e
+
+        if not self.start_urls or self.max_pages <= 0:
+            return []
+        return asyncio.run(self._crawl(async_playwright, PlaywrightError))
+
+    # ------------------------------------------------------------------
+    async def _crawl(self, async_playwright, playwright_error) -> List[Dict[str, Any]]:
+        origins = {_origin(url) for url in self.start_urls}
+        seen = set(self.start_urls)
+        frontier = sorted(seen)
+        budget = self.max_pages
+        pages: List[Dict[str, Any]] = []
+        by_fingerprint: Dict[str, Dict[str, Any]] = {}
+
+        async with async_playwright() as pw:
+            browser = await pw.chromium.launch()
+            try:
+                contexts = [await self._new_context(browser) for _ in range(min(self.concurrency, budget))]
+                depth = 0
+                while frontier and budget > 0:
+                    frontier = frontier[:budget]
+                    budget -= len(frontier)
+                    print(f"Crawl depth {depth}: {len(frontier)} page(s)")
+                    visited = await self._visit_all(contexts, frontier, playwright_error)
+
+                    next_urls = set()
+                    for url, data in zip(frontier, visited):
+                        if data is None:
+                            continue
+                        fingerprint = _fingerprint(data.pop("paths"))
+                        if fingerprint in by_fingerprint:
+                            by_fingerprint[fingerprint]["variants"] += 1
+                            continue
+
+                        hrefs = data.pop("hrefs")
+                        page = {"url": url, "crawl_depth": depth, "fingerprint": fingerprint, "variants": 1, **data}
+                        by_fingerprint[fingerprint] = page
+                        pages.append(page)
+
+                        if depth < self.max_depth:
+                            for href in hrefs:
+                                link = _normalize_url(href)
+                                if link and link not in seen and _origin(link) in origins:
+                                    seen.add(link)
+                                    next_urls.add(link)
+
+                    frontier = sorted(next_urls)
+                    depth += 1
+            finally:
+                await browser.close()
+
+        return pages
+
+    async def _new_context(self, browser):
+        context = await browser.new_context()
+        if self.block_resources:
+            async def block(route):
+                if route.request.resource_type in self.block_resources:
+                    await route.abort()
+                else:
+                    await route.continue_()
+
+            await context.route("**/*", block)
+        return context
+
+    async def _visit_all(self, contexts, urls: List[str], playwright_error) -> List[Optional[Dict[str, Any]]]:
+        """Page data for each URL (None if it failed to load), in the order of urls."""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(urls)
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in enumerate(urls):
+            queue.put_nowait(item)
+
+        async def worker(context) -> None:
+            page = await context.new_page()
+            try:
+                while not queue.empty():
+                    i, url = queue.get_nowait()
+                    results[i] = await self._visit(page, url, playwright_error)
+            finally:
+                await page.close()
+
+        await asyncio.gather(*(worker(context) for context in contexts))
+        return results
+
+    async def _visit(self, page, url: str, playwright_error) -> Optional[Dict[str, Any]]:
+        try:
+            response = await page.goto(url, wait_until="networkidle", timeout=self.timeout_ms)
+            if response is not None and response.status >= 400:
+                print(f"Crawl: {url} returned HTTP {response.status}, skipped")
+                return None
+            return await page.evaluate(_PAGE_SCRIPT)
+        except playwright_error as e:
+            print(f"Crawl: {url} failed ({e.__class__.__name__}), skipped")
+            return None
+
+
+def _normalize_url(url: str) -> str:
+    """http(s) URL without its #fragment; "" for other schemes."""
+    url, _ = urldefrag(url.strip())
+    return url if urlsplit(url).scheme in ("http", "https") else ""
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _fingerprint(paths: Iterable[str]) -> str:
+    return hashlib.sha1("\n".join(sorted(paths)).encode("utf-8")).hexdigest()
@@ -1,23 +1,80 @@
 # web_complexity_lab/collectors/ui_structure_collector.py
+from concurrent.futures import Executor
 from typing import List, Dict, Any
 from pathlib import Path
-import json
 import re
 
+from .corpus import AppCorpus, FileEntry
+from .ui_crawler import UICrawler
+from ..sketches import RunningStats, DistinctCounter
+
+# One token per match: a comment, a <script>/<style> element including its
+# raw-text body (never parsed as markup), or a start / end tag with its
+# attribute text (quoted values may contain ">").
+_HTML_ATTRS = r"""[^>"']*(?:(?:"[^"]*"|'[^']*')[^>"']*)*"""
+_HTML_TOKEN = re.compile(
+    r"<(?:!--.*?(?:-->|\Z)"
+    r"|((?i:script|style))\b" + _HTML_ATTRS + r">.*?(?:</(?i:script|style)\s*>|\Z)"
+    r"|(/?[a-zA-Z][\w:-]*)(" + _HTML_ATTRS + r")>)",
+    re.S,
+)
+_HTML_HREF = re.compile(r"(?:^|\s)href\s*=", re.I)
+_HTML_HIDDEN_INPUT = re.compile(r"\btype\s*=\s*[\"']?hidden\b", re.I)
+# directories (relative to root_path) whose *.html files are scanned
+HTML_DIRS = ("dist", "public", "src", ".")
+# elements that never have content or an end tag
+_HTML_VOID = frozenset(
+    ("area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr")
+)
+
 
 class UIStructureCollector:
     """
     Collects UI structure metrics from agent logs or HTML files.
     Extracts DOM node counts, URLs visited, and page information.
+    With an executor (thread or process pool), log files are parsed in parallel.
+
+    In crawl mode (crawl=True, or ui_structure.crawl.enabled in the config)
+    the running app is crawled from ui_structure.start_urls instead (see
+    UICrawler), and the pages carry real element counts.
     """
 
-    def __init__(self, app_config):
+    def __init__(
+        self,
+        app_config,
+        corpus: AppCorpus | None = None,
+        executor: Executor | None = None,
+        crawl: bool | None = None,
+    ):
         self.app_config = app_config
+        self.corpus = corpus or AppCorpus(app_config)
+        self.executor = executor
+        if crawl is None:
+            ui_cfg = app_config.ui_structure if isinstance(app_config.ui_structure, dict) else {}
+            crawl = bool((ui_cfg.get("crawl") or {}).get("enabled", False))
+        self.crawl = crawl
+        self.corpus.register_fold("ui_structure", _new_page_fold, self._agent_log_paths())
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # sent to process-pool workers, which parse their chunk sequentially
+        return {**self.__dict__, "executor": None}
 
     def collect(self) -> List[Dict[str, Any]]:
+        try:
+            return self._collect()
+        finally:
+            self.corpus.release_folds("ui_structure")
+
+    def _collect(self) -> List[Dict[str, Any]]:
         results = []
         root = Path(self.app_config.root_path)
 
+        # The live DOM replaces the estimates from logs and static files
+        if self.crawl:
+            crawled = self._collect_from_crawl()
+            if crawled:
+                return crawled
+
         # First try to get UI data from agent logs (they have DOM info)
         agent_data = self._collect_from_agent_logs(root)
         if agent_data:
@@ -34,141 +91,199 @@ class UIStructureCollector:
                 "page_id": "main",
                 "url": self.app_config.base_url,
                 "dom_node_count": 0,
-                "interactive_elements": [],
-                "forms": [],
+                "dom_unit": "elements",
+                "interactive_count": 0,
+                "form_count": 0,
             })
 
         return results
 
+    def _agent_log_paths(self) -> List[str]:
+        agents_config = self.app_config.agents if hasattr(self.app_config, 'agents') else {}
+        return agents_config.get("log_paths", []) if isinstance(agents_config, dict) else []
+
     def _collect_from_agent_logs(self, root: Path) -> List[Dict[str, Any]]:
         """Extract UI structure data from agent exploration logs."""
         results = []
-        agents_config = self.app_config.agents if hasattr(self.app_config, 'agents') else {}
-        log_paths = agents_config.get("log_paths", []) if isinstance(agents_config, dict) else []
-
-        pages_seen = {}  # url -> {dom_sizes: [], ...}
-
-        for rel_path in log_paths:
-            log_dir = root / rel_path
-            if not log_dir.exists():
-                continue
+        log_paths = self._agent_log_paths()
 
-            for log_file in log_dir.rglob("*"):
-                if log_file.suffix not in [".jsonl", ".json"]:
-                    continue
+        pages_seen = {}  # url -> {"dom": RunningStats, "selectors": DistinctCounter}
 
-                try:
-                    content = log_file.read_text(encoding="utf-8")
-                    steps = self._parse_log_content(content, log_file.suffix)
-
-                    for step in steps:
-                        url = step.get("url", "")
-                        dom_len = step.get("dom_length", 0)
-
-                        if url and dom_len:
-                            if url not in pages_seen:
-                                pages_seen[url] = {"dom_sizes": [], "actions": []}
-                            pages_seen[url]["dom_sizes"].append(dom_len)
-
-                            # Track interactive elements from actions
-                            action = step.get("action", {})
-                            if isinstance(action, dict):
-                                selector = action.get("selector", action.get("description", ""))
-                            else:
-                                selector = step.get("selector", "")
-                            if selector:
-                                pages_seen[url]["actions"].append(selector)
-
-                except Exception:
-                    continue
+        # per-file stats merge into the same totals as one pass over all logs
+        entries = self.corpus.list_files(log_paths, (".jsonl", ".json"))
+        for samples in self.corpus.map_cached("ui_structure", entries, self._page_samples, self.executor):
+            for url, data in samples.items():
+                if url not in pages_seen:
+                    pages_seen[url] = {"dom": RunningStats(), "selectors": DistinctCounter()}
+                pages_seen[url]["dom"].merge(RunningStats.from_dict(data["dom"]))
+                pages_seen[url]["selectors"].merge(DistinctCounter.from_dict(data["selectors"]))
 
         # Convert to results format
         for url, data in pages_seen.items():
-            dom_sizes = data["dom_sizes"]
+            dom = data["dom"]
             page_id = self._url_to_page_id(url)
 
             results.append({
                 "page_id": page_id,
                 "url": url,
-                "dom_node_count": int(sum(dom_sizes) / len(dom_sizes)) if dom_sizes else 0,
-                "max_dom_count": max(dom_sizes) if dom_sizes else 0,
-                "min_dom_count": min(dom_sizes) if dom_sizes else 0,
-                "interactive_elements": list(set(data["actions"])),
-                "forms": [],  # Would need HTML parsing to detect forms
+                "dom_node_count": int(dom.mean),
+                "dom_unit": "chars",  # dom_length in the logs is the HTML size
+                "max_dom_count": dom.max,
+                "min_dom_count": dom.min,
+                "dom_node_std": round(dom.std, 2),
+                "interactive_count": data["selectors"].count(),
+                "form_count": 0,  # agent logs do not record forms
             })
 
         return results
 
     def _collect_from_html_files(self, root: Path) -> List[Dict[str, Any]]:
         """Scan HTML files for basic structure info."""
-        results = []
+        entries = []
 
         # Look for HTML files in common locations
-        html_dirs = ["dist", "public", "src", "."]
-
-        for dir_name in html_dirs:
+        for dir_name in HTML_DIRS:
             html_dir = root / dir_name
             if not html_dir.exists():
                 continue
+            for html_file in sorted(html_dir.glob("*.html")):
+                entry = FileEntry.from_path(html_file)
+                if entry is not None:
+                    entries.append(entry)
+
+        # only the markup counts are cached; page_id and url depend on the
+        # path and base_url, which can change without the file changing
+        counts = self.corpus.map_cached("ui_html", entries, self._analyze_html_file, self.executor)
+        return [
+            self._structure_row(entry.path.stem, f"{self.app_config.base_url}/{entry.path.name}", **page)
+            for entry, page in zip(entries, counts)
+            if page
+        ]
+
+    def _analyze_html_file(self, entry: FileEntry) -> Dict[str, Any] | None:
+        try:
+            content = entry.path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return None
+        return self._analyze_html(content)
+
+    def _analyze_html(self, content: str) -> Dict[str, Any]:
+        """
+        Element counts and nesting depth from one pass over the markup, as
+        keyword arguments of _structure_row.
+
+        Comments and <script>/<style> bodies are skipped, end tags close
+        the nearest open element of the same name (so omitted </p> or </li>
+        do not inflate the depth), and void or self-closing elements do not
+        nest. Interactive elements are buttons, non-hidden inputs, links
+        with an href, selects and textareas.
+        """
+        tags: Dict[str, int] = {}
+        open_elements: List[str] = []
+        max_depth = 0
+        links = 0
+        hidden_inputs = 0
+
+        for raw_text, tag, attrs in _HTML_TOKEN.findall(content):
+            if raw_text:
+                # <script> / <style>: counted, body skipped, closed in place
+                name = raw_text.lower()
+                tags[name] = tags.get(name, 0) + 1
+                max_depth = max(max_depth, len(open_elements) + 1)
+                continue
+            if not tag:
+                continue  # comment
+
+            if tag[0] == "/":
+                name = tag[1:].lower()
+                if name in open_elements:
+                    while open_elements.pop() != name:
+                        pass
+                continue
 
-            for html_file in html_dir.glob("*.html"):
-                try:
-                    content = html_file.read_text(encoding="utf-8")
-                    page_data = self._analyze_html(content, html_file)
-                    if page_data:
-                        results.append(page_data)
-                except Exception:
-                    continue
-
+            name = tag.lower()
+            tags[name] = tags.get(name, 0) + 1
+            if name == "a":
+                links += _HTML_HREF.search(attrs) is not None
+            elif name == "input":
+                hidden_inputs += _HTML_HIDDEN_INPUT.search(attrs) is not None
+            if name not in _HTML_VOID and not attrs.endswith("/"):
+                open_elements.append(name)
+                if len(open_elements) > max_depth:
+                    max_depth = len(open_elements)
+
+        return dict(
+            tags=tags,
+            depth=max_depth,
+            buttons=tags.get("button", 0),
+            inputs=tags.get("input", 0) - hidden_inputs,
+            links=links,
+            selects=tags.get("select", 0),
+            textareas=tags.get("textarea", 0),
+            forms=tags.get("form", 0),
+        )
+
+    def _collect_from_crawl(self) -> List[Dict[str, Any]]:
+        """Page rows from a live crawl of ui_structure.start_urls."""
+        results = []
+        for page in UICrawler.from_config(self.app_config).crawl():
+            row = self._structure_row(
+                self._url_to_page_id(page["url"]),
+                page["url"],
+                page["tags"],
+                page["maxDepth"],
+                buttons=page["buttons"],
+                inputs=page["inputs"],
+                links=page["links"],
+                selects=page["selects"],
+                textareas=page["textareas"],
+                forms=page["forms"],
+            )
+            row.update(crawl_depth=page["crawl_depth"], fingerprint=page["fingerprint"], variants=page["variants"])
+            results.append(row)
         return results
 
-    def _analyze_html(self, content: str, file_path: Path) -> Dict[str, Any]:
-        """Basic HTML analysis without full parsing."""
-        # Count various elements using regex (simple approximation)
-        tags = re.findall(r"<(\w+)", content)
-        dom_count = len(tags)
-
-        # Count interactive elements
-        buttons = len(re.findall(r"<button", content, re.I))
-        inputs = len(re.findall(r"<input", content, re.I))
-        links = len(re.findall(r"<a\s", content, re.I))
-        selects = len(re.findall(r"<select", content, re.I))
-
-        interactive_count = buttons + inputs + links + selects
-
-        # Count forms
-        forms = len(re.findall(r"<form", content, re.I))
-
+    @staticmethod
+    def _structure_row(
+        page_id: str,
+        url: str,
+        tags: Dict[str, int],
+        depth: int,
+        buttons: int,
+        inputs: int,
+        links: int,
+        selects: int,
+        textareas: int,
+        forms: int,
+    ) -> Dict[str, Any]:
+        """Page row from element counts (static HTML or a crawled DOM)."""
         return {
-            "page_id": file_path.stem,
-            "url": f"{self.app_config.base_url}/{file_path.name}",
-            "dom_node_count": dom_count,
-            "interactive_elements": list(range(interactive_count)),  # Placeholder list
-            "interactive_count": interactive_count,
+            "page_id": page_id,
+            "url": url,
+            "dom_node_count": sum(tags.values()),
+            "dom_unit": "elements",
+            "dom_depth": depth,
+            "interactive_count": buttons + inputs + links + selects + textareas,
             "buttons": buttons,
             "inputs": inputs,
             "links": links,
-            "forms": list(range(forms)),
+            "selects": selects,
+            "textareas": textareas,
+            "form_count": forms,
+            "tag_counts": tags,
         }
 
-    def _parse_log_content(self, content: str, suffix: str) -> List[Dict]:
-        """Parse log file content based on format."""
-        if suffix == ".jsonl":
-            steps = []
-            for line in content.strip().split("\n"):
-                if line.strip():
-                    try:
-                        steps.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        continue
-            return steps
-        elif suffix == ".json":
-            try:
-                data = json.loads(content)
-                return data if isinstance(data, list) else []
-            except json.JSONDecodeError:
-                return []
-        return []
+    def _page_samples(self, entry: FileEntry) -> Dict[str, Dict[str, Any]]:
+        """Per-URL DOM size aggregates and distinct selectors from one agent log file."""
+        if entry.suffix == ".jsonl":
+            return self.corpus.fold(entry, "ui_structure")
+
+        # JSON logs only count as a bare array of steps
+        data = self.corpus.load(entry)
+        fold = _PageSampleFold()
+        for step in data if isinstance(data, list) else []:
+            fold.add(step)
+        return fold.result()
 
     def _url_to_page_id(self, url: str) -> str:
         """Convert URL to a page identifier."""
@@ -185,3 +300,43 @@ class UIStructureCollector:
         # Clean up the path
         path = path.strip("/").replace("/", "_").replace(".html", "")
         return path if path else "home"
+
+
+class _PageSampleFold:
+    """Running per-URL DOM size statistics and distinct action selectors."""
+
+    def __init__(self):
+        self.pages: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, step: Any) -> None:
+        if not isinstance(step, dict):
+            return
+        url = step.get("url", "")
+        dom_len = step.get("dom_length", 0)
+        if not (url and dom_len):
+            return
+
+        page = self.pages.get(url)
+        if page is None:
+            page = self.pages[url] = {"dom": RunningStats(), "selectors": DistinctCounter()}
+        page["dom"].add(dom_len)
+
+        # Track interactive elements from actions
+        action = step.get("action", {})
+        if isinstance(action, dict):
+            selector = action.get("selector", action.get("description", ""))
+        else:
+            selector = step.get("selector", "")
+        if selector:
+            page["selectors"].add(selector)
+
+    def result(self) -> Dict[str, Dict[str, Any]]:
+        # plain dicts so the result can be cached as JSON
+        return {
+            url: {"dom": page["dom"].to_dict(), "selectors": page["selectors"].to_dict()}
+            for url, page in self.pages.items()
+        }
+
+
+def _new_page_fold(entry: FileEntry) -> _PageSampleFold:
+    return _PageSampleFold()
@@ -1,7 +1,6 @@
 # web_complexity_lab/config.py
 from dataclasses import dataclass, field
 from typing import List, Dict, Any
-import yaml
 
 
 @dataclass
@@ -20,9 +19,13 @@ class GlobalConfig:
     project_name: str
     applications: List[AppConfig]
     output: Dict[str, Any]
+    sensitivity: Dict[str, Any] = field(default_factory=dict)
 
 
 def load_config(path: str) -> GlobalConfig:
+    # imported here: commands that never read a config do not pay for it
+    import yaml
+
     with open(path, "r", encoding="utf-8") as f:
         raw = yaml.safe_load(f)
 
@@ -43,4 +46,5 @@ def load_config(path: str) -> GlobalConfig:
         project_name=raw["project_name"],
         applications=apps,
         output=raw["output"],
+        sensitivity=raw.get("sensitivity") or {},
     )
@@ -1,21 +1,31 @@
 # web_complexity_lab/exporters/csv_exporter.py
 from typing import List, Dict, Any
 import csv
+import io
+import json
 from pathlib import Path
 
+from .files import write_if_changed
 
-def _write_rows(path: Path, rows: List[Dict[str, Any]]):
+
+def _write_rows(path: Path, rows: List[Dict[str, Any]]) -> bool:
     if not rows:
-        return
+        return False
     fieldnames = sorted(rows[0].keys())
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+    f = io.StringIO(newline="")
+    writer = csv.DictWriter(f, fieldnames=fieldnames)
+    writer.writeheader()
+    for row in rows:
+        # nested values (e.g. per-action quantiles) as JSON, not Python repr
+        writer.writerow({
+            k: json.dumps(v, ensure_ascii=False) if isinstance(v, (dict, list)) else v
+            for k, v in row.items()
+        })
+    return write_if_changed(path, f.getvalue(), newline="")
 
 
-def export_to_csv(all_app_results: List[Dict[str, Any]], out_dir: str):
+def export_to_csv(all_app_results: List[Dict[str, Any]], out_dir: str) -> List[Path]:
+    """Writes one CSV per entity; returns the files whose content changed."""
     out = Path(out_dir)
     app_rows = []
     ui_rows = []
@@ -26,15 +36,18 @@ def export_to_csv(all_app_results: List[Dict[str, Any]], out_dir: str):
 
     for r in all_app_results:
         app_rows.append(r["app_level"])
-        ui_rows.extend(r["ui_metrics"])
-        test_rows.extend(r["test_metrics"])
-        log_rows.extend(r["log_metrics"])
-        agent_rows.extend(r["agent_metrics"])
+        ui_rows.extend(r["ui_metrics"].to_records())
+        test_rows.extend(r["test_metrics"].to_records())
+        log_rows.extend(r["log_metrics"].to_records())
+        agent_rows.extend(r["agent_metrics"].to_records())
         index_rows.append(r["indices"])
 
-    _write_rows(out / "apps_metrics.csv", app_rows)
-    _write_rows(out / "ui_metrics.csv", ui_rows)
-    _write_rows(out / "test_metrics.csv", test_rows)
-    _write_rows(out / "log_metrics.csv", log_rows)
-    _write_rows(out / "agent_metrics.csv", agent_rows)
-    _write_rows(out / "complexity_indices.csv", index_rows)
+    files = {
+        "apps_metrics.csv": app_rows,
+        "ui_metrics.csv": ui_rows,
+        "test_metrics.csv": test_rows,
+        "log_metrics.csv": log_rows,
+        "agent_metrics.csv": agent_rows,
+        "complexity_indices.csv": index_rows,
+    }
+    return [out / name for name, rows in files.items() if _write_rows(out / name, rows)]
@@ -0,0 +1,26 @@
+# web_complexity_lab/exporters/files.py
+from pathlib import Path
+import os
+
+
+def write_if_changed(path: Path, text: str, newline: str | None = None) -> bool:
+    """
+    Writes text to path unless the file already holds exactly that content;
+    returns whether it was written. The content goes to a temporary file that
+    is renamed over the old one, so readers never see a half-written export.
+    newline is applied as by open(): None translates to os.linesep, "" writes
+    the text as it is.
+    """
+    if newline != "":
+        text = text.replace("\n", os.linesep if newline is None else newline)
+    data = text.encode("utf-8")
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    return True
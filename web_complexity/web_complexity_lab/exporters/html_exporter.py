@@ -2,9 +2,15 @@
 from typing import List, Dict, Any
 from pathlib import Path
 from datetime import datetime
+import re
 
+from .files import write_if_changed
 
-def export_to_html(all_app_results: List[Dict[str, Any]], out_dir: str) -> None:
+# the only part of the report that changes on every run
+_TIMESTAMP = re.compile(r'<p class="timestamp">Generated: [^<]*</p>')
+
+
+def export_to_html(all_app_results: List[Dict[str, Any]], out_dir: str) -> List[Path]:
     """
     Generates an HTML report with complexity metrics and visualizations.
     """
@@ -14,10 +20,19 @@ def export_to_html(all_app_results: List[Dict[str, Any]], out_dir: str) -> None:
     html_content = _generate_html_report(all_app_results)
 
     report_path = out / "complexity_report.html"
-    with report_path.open("w", encoding="utf-8") as f:
-        f.write(html_content)
+    written = not _same_report(report_path, html_content) and write_if_changed(report_path, html_content)
+
+    print(f"HTML report {'generated' if written else 'unchanged'}: {report_path}")
+    return [report_path] if written else []
+
 
-    print(f"HTML report generated: {report_path}")
+def _same_report(path: Path, html_content: str) -> bool:
+    """Whether the report at path differs from html_content only in its timestamp."""
+    try:
+        old = path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return False
+    return _TIMESTAMP.sub("", old) == _TIMESTAMP.sub("", html_content)
 
 
 def _generate_html_report(all_app_results: List[Dict[str, Any]]) -> str:
@@ -33,6 +48,7 @@ def _generate_html_report(all_app_results: List[Dict[str, Any]]) -> str:
             "ui_metrics": r["ui_metrics"],
             "test_metrics": r["test_metrics"],
             "agent_metrics": r["agent_metrics"],
+            "index_intervals": r.get("index_intervals"),
         })
 
     # TU Chemnitz green: #007A33 or similar
@@ -139,6 +155,10 @@ def _generate_html_report(all_app_results: List[Dict[str, Any]]) -> str:
             color: #666;
             margin-bottom: 0.2rem;
         }}
+        .index-ci {{
+            font-size: 0.7rem;
+            color: #888;
+        }}
         .index-value {{
             font-size: 1.1rem;
             font-weight: 600;
@@ -331,23 +351,23 @@ def _generate_app_cards(apps_data: List[Dict]) -> str:
         <div class="app-card">
             <div class="app-name">{app["app_id"].replace("_", " ").title()}</div>
             <div class="wcs-score">{wcs:.3f}</div>
-            <div class="wcs-label">Weighted Complexity Score (WCS)</div>
+            <div class="wcs-label">Weighted Complexity Score (WCS){_interval(app, "wcs")}</div>
             <div class="indices-grid">
                 <div class="index-item">
                     <div class="index-name">SUCI</div>
-                    <div class="index-value">{indices.get("suci", 0):.3f}</div>
+                    <div class="index-value">{indices.get("suci", 0):.3f}</div>{_interval(app, "suci")}
                 </div>
                 <div class="index-item">
                     <div class="index-name">IFCI</div>
-                    <div class="index-value">{indices.get("ifci", 0):.3f}</div>
+                    <div class="index-value">{indices.get("ifci", 0):.3f}</div>{_interval(app, "ifci")}
                 </div>
                 <div class="index-item">
                     <div class="index-name">TCI</div>
-                    <div class="index-value">{indices.get("trci", 0):.3f}</div>
+                    <div class="index-value">{indices.get("trci", 0):.3f}</div>{_interval(app, "trci")}
                 </div>
                 <div class="index-item">
                     <div class="index-name">ADI</div>
-                    <div class="index-value">{indices.get("adi", 0):.3f}</div>
+                    <div class="index-value">{indices.get("adi", 0):.3f}</div>{_interval(app, "adi")}
                 </div>
             </div>
         </div>"""
@@ -356,6 +376,15 @@ def _generate_app_cards(apps_data: List[Dict]) -> str:
     return "\n".join(cards)
 
 
+def _interval(app: Dict, name: str) -> str:
+    """The bootstrap interval of one index as a small caption ("" without --bootstrap)."""
+    intervals = app.get("index_intervals")
+    if not intervals or name not in intervals:
+        return ""
+    low, high = intervals[name]
+    return f'<div class="index-ci">{intervals["confidence"]:.0%} CI {low:.3f} &ndash; {high:.3f}</div>'
+
+
 def _generate_comparison_chart(apps_data: List[Dict]) -> str:
     """Generate visual comparison chart."""
     max_wcs = max(app["indices"].get("wcs", 0) for app in apps_data) or 1
@@ -421,6 +450,19 @@ def _generate_metrics_tables(apps_data: List[Dict]) -> str:
                 <td>Total Assertions</td>
                 <td>{app_level.get("total_assertions", 0)}</td>
             </tr>
+            <tr>
+                <td rowspan="3">Test Durations</td>
+                <td>p50 / p90 / p99 Test (ms)</td>
+                <td>{app_level.get("p50_test_duration_ms", 0):,.0f} / {app_level.get("p90_test_duration_ms", 0):,.0f} / {app_level.get("p99_test_duration_ms", 0):,.0f}</td>
+            </tr>
+            <tr>
+                <td>p50 / p90 / p99 Step (ms)</td>
+                <td>{app_level.get("p50_step_duration_ms", 0):,.0f} / {app_level.get("p90_step_duration_ms", 0):,.0f} / {app_level.get("p99_step_duration_ms", 0):,.0f}</td>
+            </tr>
+            <tr>
+                <td>p50 / p90 / p99 Agent Step (ms)</td>
+                <td>{app_level.get("p50_agent_step_ms", 0):,.0f} / {app_level.get("p90_agent_step_ms", 0):,.0f} / {app_level.get("p99_agent_step_ms", 0):,.0f}</td>
+            </tr>
             <tr>
                 <td rowspan="2">Agent Metrics</td>
                 <td>Total Episodes</td>
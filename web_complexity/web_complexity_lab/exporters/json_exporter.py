@@ -3,10 +3,22 @@ from typing import List, Dict, Any
 from pathlib import Path
 import json
 
+from ..features.metric_table import MetricTable
+from .files import write_if_changed
 
-def export_to_json(all_app_results: List[Dict[str, Any]], out_dir: str) -> None:
+
+def results_to_records(all_app_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The results with every MetricTable turned into its list of row dicts."""
+    return [
+        {k: v.to_records() if isinstance(v, MetricTable) else v for k, v in r.items()}
+        for r in all_app_results
+    ]
+
+
+def export_to_json(all_app_results: List[Dict[str, Any]], out_dir: str) -> List[Path]:
     """
-    Writes the full structured result plus convenient per-entity JSON files.
+    Writes the full structured result plus convenient per-entity JSON files;
+    returns the files whose content changed (the others are not rewritten).
 
     Layout:
       out_dir/
@@ -16,15 +28,19 @@ def export_to_json(all_app_results: List[Dict[str, Any]], out_dir: str) -> None:
         test_metrics.json              # list of per-test metrics
         log_metrics.json               # list of per-test log metrics
         agent_metrics.json             # list of per-episode agent metrics
-        complexity_indices.json        # list of per-app indices
+        complexity_indices.json        # list of per-app indices (+ bootstrap intervals)
     """
     out = Path(out_dir)
     out.mkdir(parents=True, exist_ok=True)
+    all_app_results = results_to_records(all_app_results)
+    written: List[Path] = []
+
+    def _dump(path: Path, obj: Any) -> None:
+        if write_if_changed(path, json.dumps(obj, ensure_ascii=False, indent=2)):
+            written.append(path)
 
     # 1) Full object (debug / research use)
-    full_path = out / "results_full.json"
-    with full_path.open("w", encoding="utf-8") as f:
-        json.dump(all_app_results, f, ensure_ascii=False, indent=2)
+    _dump(out / "results_full.json", all_app_results)
 
     # 2) Split views for easier analysis
     app_rows: List[Dict[str, Any]] = []
@@ -40,11 +56,10 @@ def export_to_json(all_app_results: List[Dict[str, Any]], out_dir: str) -> None:
         test_rows.extend(r["test_metrics"])
         log_rows.extend(r["log_metrics"])
         agent_rows.extend(r["agent_metrics"])
-        index_rows.append(r["indices"])
-
-    def _dump(path: Path, obj: Any) -> None:
-        with path.open("w", encoding="utf-8") as f:
-            json.dump(obj, f, ensure_ascii=False, indent=2)
+        if "index_intervals" in r:
+            index_rows.append({**r["indices"], "intervals": r["index_intervals"]})
+        else:
+            index_rows.append(r["indices"])
 
     _dump(out / "apps_metrics.json", app_rows)
     _dump(out / "ui_metrics.json", ui_rows)
@@ -52,3 +67,4 @@ def export_to_json(all_app_results: List[Dict[str, Any]], out_dir: str) -> None:
     _dump(out / "log_metrics.json", log_rows)
     _dump(out / "agent_metrics.json", agent_rows)
     _dump(out / "complexity_indices.json", index_rows)
+    return written
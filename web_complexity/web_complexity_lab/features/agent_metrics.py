@@ -1,25 +1,23 @@
 # web_complexity_lab/features/agent_metrics.py
 from typing import List, Dict, Any
 
+from .metric_table import MetricTable
 
-def compute_agent_metrics(app_id: str, episodes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+
+def compute_agent_metrics(app_id: str, episodes: List[Dict[str, Any]]) -> MetricTable:
     """
     Computes metrics from AI agent exploration logs.
     """
-    results = []
-    for ep in episodes:
-        m = {
-            "app_id": app_id,
-            "episode_id": ep.get("episode_id", "unknown"),
-            "task_id": ep.get("task_id", ""),
-            "success": ep.get("success", False),
-            "steps_count": ep.get("steps_count", 0),
-            "success_count": ep.get("success_count", 0),
-            "error_count": ep.get("error_count", 0),
-            "backtracks": ep.get("backtracks", 0),
-            "unique_urls": ep.get("unique_urls", 0),
-            "avg_dom_size": ep.get("avg_dom_size", 0),
-            "max_dom_size": ep.get("max_dom_size", 0),
-        }
-        results.append(m)
-    return results
+    return MetricTable.from_columns({
+        "app_id": [app_id] * len(episodes),
+        "episode_id": [ep.get("episode_id", "unknown") for ep in episodes],
+        "task_id": [ep.get("task_id", "") for ep in episodes],
+        "success": [ep.get("success", False) for ep in episodes],
+        "steps_count": [ep.get("steps_count", 0) for ep in episodes],
+        "success_count": [ep.get("success_count", 0) for ep in episodes],
+        "error_count": [ep.get("error_count", 0) for ep in episodes],
+        "backtracks": [ep.get("backtracks", 0) for ep in episodes],
+        "unique_urls": [ep.get("unique_urls", 0) for ep in episodes],
+        "avg_dom_size": [ep.get("avg_dom_size", 0) for ep in episodes],
+        "max_dom_size": [ep.get("max_dom_size", 0) for ep in episodes],
+    })
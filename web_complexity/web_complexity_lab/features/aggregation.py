@@ -1,46 +1,80 @@
 # web_complexity_lab/features/aggregation.py
-from typing import List, Dict, Any
-import statistics as stats
+from typing import Dict, Any, Callable, List, Optional
+import math
 
+import numpy as np
 
-def _safe_mean(values):
-    return stats.mean(values) if values else 0.0
+from .metric_table import MetricTable
 
 
-def _safe_max(values):
-    return max(values) if values else 0
+def _safe_mean(values: np.ndarray):
+    """
+    Mean of a column (0.0 if empty). Float columns are summed with
+    math.fsum; a whole mean of integers is an int, as statistics.mean gives.
+    """
+    n = len(values)
+    if not n:
+        return 0.0
+    if values.dtype.kind == "f":
+        return math.fsum(values) / n
+    mean = float(values.mean())
+    return int(mean) if mean.is_integer() else mean
+
+
+def _safe_max(values: np.ndarray):
+    if not len(values):
+        return 0
+    top = values.max()
+    # object columns hold Python values already
+    return top.item() if isinstance(top, np.generic) else top
+
+
+def _nonzero(values: np.ndarray) -> np.ndarray:
+    """The truthy values ([v for v in values if v])."""
+    return values[values.astype(bool)]
 
 
 def aggregate_per_app(
     app_id: str,
-    ui_metrics: List[Dict[str, Any]],
-    test_metrics: List[Dict[str, Any]],
-    log_metrics: List[Dict[str, Any]],
-    agent_metrics: List[Dict[str, Any]],
+    ui_metrics: MetricTable,
+    test_metrics: MetricTable,
+    log_metrics: MetricTable,
+    agent_metrics: MetricTable,
+    duration_quantiles: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """
     Aggregates per-app stats that feed into complexity indices.
+
+    Every statistic is a vectorized reduction over one column of the feature
+    tables. duration_quantiles (see features.duration_metrics) adds the
+    p50/p90/p99 test and step durations to the result.
     """
     # UI metrics aggregation
-    dom_counts = [m["dom_node_count"] for m in ui_metrics if m.get("dom_node_count")]
-    interactive_counts = [m.get("interactive_count", 0) for m in ui_metrics]
-    form_counts = [m.get("form_count", 0) for m in ui_metrics]
+    dom_all = ui_metrics.column("dom_node_count")
+    has_dom = dom_all.astype(bool)
+    dom_counts = dom_all[has_dom]
+    interactive_counts = ui_metrics.column("interactive_count")
+    form_counts = ui_metrics.column("form_count")
+    dom_depths = ui_metrics.column("dom_depth")
+    # "chars" when any DOM size is an HTML length estimate (agent logs)
+    estimated = bool((ui_metrics.column("dom_unit", "chars")[has_dom] == "chars").any())
+    dom_unit = "chars" if estimated else "elements"
 
     # Test metrics aggregation
-    steps_counts = [m["steps_count"] for m in test_metrics if m.get("steps_count")]
-    clicks = [m.get("clicks", 0) for m in test_metrics]
-    assertions = [m.get("assertions", 0) for m in test_metrics]
+    steps_counts = _nonzero(test_metrics.column("steps_count"))
+    clicks = test_metrics.column("clicks")
+    assertions = test_metrics.column("assertions")
 
     # Log metrics aggregation
-    test_durations = [m["duration_ms"] for m in log_metrics if m.get("duration_ms")]
-    failure_count = sum(1 for m in log_metrics if m.get("status") == "failed")
-    total_logs = len(log_metrics) if log_metrics else 1
+    test_durations = _nonzero(log_metrics.column("duration_ms"))
+    failure_count = int((log_metrics.column("status", None) == "failed").sum())
+    total_logs = len(log_metrics) if len(log_metrics) else 1
 
     # Agent metrics aggregation
-    agent_steps = [m["steps_count"] for m in agent_metrics if m.get("steps_count")]
-    agent_success = [1 for m in agent_metrics if m.get("success")]
-    agent_backtracks = [m.get("backtracks", 0) for m in agent_metrics]
-    agent_dom_sizes = [m.get("avg_dom_size", 0) for m in agent_metrics if m.get("avg_dom_size")]
+    agent_steps = _nonzero(agent_metrics.column("steps_count"))
+    agent_success = int(agent_metrics.column("success", False).astype(bool).sum())
+    agent_backtracks = agent_metrics.column("backtracks")
+    agent_dom_sizes = _nonzero(agent_metrics.column("avg_dom_size"))
 
     return {
         "app_id": app_id,
@@ -50,18 +84,104 @@ def aggregate_per_app(
         "max_dom_nodes": _safe_max(dom_counts),
         "avg_interactive_count": _safe_mean(interactive_counts),
         "avg_form_count": _safe_mean(form_counts),
+        "max_dom_depth": _safe_max(dom_depths),
+        "dom_unit": dom_unit,
         # Test metrics
         "total_tests": len(test_metrics),
         "avg_test_steps": _safe_mean(steps_counts),
-        "total_clicks": sum(clicks),
-        "total_assertions": sum(assertions),
+        "total_clicks": clicks.sum().item(),
+        "total_assertions": assertions.sum().item(),
         # Log metrics
         "avg_test_duration_ms": _safe_mean(test_durations),
         "failure_rate": failure_count / total_logs,
         # Agent metrics
         "total_episodes": len(agent_metrics),
         "avg_agent_steps_to_success": _safe_mean(agent_steps),
-        "agent_success_rate": len(agent_success) / len(agent_metrics) if agent_metrics else 0,
+        "agent_success_rate": agent_success / len(agent_metrics) if len(agent_metrics) else 0,
         "avg_agent_backtracks": _safe_mean(agent_backtracks),
         "avg_agent_dom_size": _safe_mean(agent_dom_sizes),
+        # Duration quantiles
+        **(duration_quantiles or {}),
     }
+
+
+def _resampled_sums(draw: Callable[[int], np.ndarray], table: MetricTable, columns: List[np.ndarray]) -> np.ndarray:
+    """(resamples, len(columns)) sums of each column over each resample of the table's rows."""
+    counts = draw(len(table))
+    return counts @ np.column_stack([np.asarray(c, dtype=np.float64) for c in columns]).reshape(len(table), len(columns))
+
+
+def _ratio(total: np.ndarray, count) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / np.maximum(count, 1), 0.0)
+
+
+def aggregate_resampled(
+    ui_metrics: MetricTable,
+    test_metrics: MetricTable,
+    log_metrics: MetricTable,
+    agent_metrics: MetricTable,
+    draw: Callable[[int], np.ndarray],
+) -> Dict[str, np.ndarray]:
+    """
+    The app-level fields the complexity indices read (see
+    models.complexity_index.INDEX_INPUTS), for a batch of bootstrap
+    resamples of the metric rows at once.
+
+    draw(n) returns a (resamples, n) matrix of how often each of n rows is
+    drawn in each resample (each row of it sums to n). Every sum over a
+    resample is then one matrix product with the table's columns, so the
+    batch needs no per-resample loop. Statistics follow aggregate_per_app.
+    """
+    # UI metrics aggregation
+    dom = ui_metrics.column("dom_node_count")
+    has_dom = dom.astype(bool)
+    chars = has_dom & (ui_metrics.column("dom_unit", "chars") == "chars")
+    ui = _resampled_sums(draw, ui_metrics, [
+        dom, has_dom, ui_metrics.column("interactive_count"), ui_metrics.column("form_count"), chars,
+    ])
+    resamples = len(ui)
+    pages = len(ui_metrics)
+
+    # Test metrics aggregation
+    steps = test_metrics.column("steps_count")
+    tests = _resampled_sums(draw, test_metrics, [
+        steps, steps.astype(bool), test_metrics.column("clicks"), test_metrics.column("assertions"),
+    ])
+
+    # Log metrics aggregation
+    durations = log_metrics.column("duration_ms")
+    logs = _resampled_sums(draw, log_metrics, [
+        durations, durations.astype(bool), log_metrics.column("status", None) == "failed",
+    ])
+
+    # Agent metrics aggregation
+    agent_steps = agent_metrics.column("steps_count")
+    agent_dom = agent_metrics.column("avg_dom_size")
+    agents = _resampled_sums(draw, agent_metrics, [
+        agent_steps, agent_steps.astype(bool),
+        agent_metrics.column("success", False).astype(bool),
+        agent_metrics.column("backtracks"),
+        agent_dom, agent_dom.astype(bool),
+    ])
+    episodes = len(agent_metrics)
+
+    return {
+        "total_pages": np.full(resamples, float(pages)),
+        "avg_dom_nodes": _ratio(ui[:, 0], ui[:, 1]),
+        "avg_interactive_count": _ratio(ui[:, 2], pages),
+        "avg_form_count": _ratio(ui[:, 3], pages),
+        "dom_unit": np.where(ui[:, 4] > 0, "chars", "elements").astype(object),
+        "total_tests": np.full(resamples, float(len(test_metrics))),
+        "avg_test_steps": _ratio(tests[:, 0], tests[:, 1]),
+        "total_clicks": tests[:, 2],
+        "total_assertions": tests[:, 3],
+        "avg_test_duration_ms": _ratio(logs[:, 0], logs[:, 1]),
+        "failure_rate": logs[:, 2] / (len(log_metrics) or 1),
+        "total_episodes": np.full(resamples, float(episodes)),
+        "avg_agent_steps_to_success": _ratio(agents[:, 0], agents[:, 1]),
+        "agent_success_rate": _ratio(agents[:, 2], episodes),
+        "avg_agent_backtracks": _ratio(agents[:, 3], episodes),
+        "avg_agent_dom_size": _ratio(agents[:, 4], agents[:, 5]),
+    }
+
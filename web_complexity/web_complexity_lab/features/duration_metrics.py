@@ -0,0 +1,52 @@
+# web_complexity_lab/features/duration_metrics.py
+from typing import List, Dict, Any
+
+from ..sketches import QuantileSketch
+
+QUANTILES = (("p50", 0.50), ("p90", 0.90), ("p99", 0.99))
+
+
+def _quantiles(sketch: QuantileSketch) -> Dict[str, float]:
+    return {name: round(sketch.quantile(q), 1) for name, q in QUANTILES}
+
+
+def compute_duration_quantiles(
+    logs: List[Dict[str, Any]],
+    episodes: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    Tail latencies per app: p50/p90/p99 of test durations, test step
+    durations and agent env step timings, plus per action type.
+
+    The per-test and per-episode sketches built by LogParser and
+    AgentLogParser are merged here, so memory does not depend on log size.
+    """
+    test_sketch = QuantileSketch()
+    step_sketch = QuantileSketch()
+    agent_sketch = QuantileSketch()
+    by_action: Dict[str, QuantileSketch] = {}
+
+    for log in logs:
+        if log.get("duration_ms"):
+            test_sketch.add(log["duration_ms"])
+        for action, data in log.get("step_duration_sketches", {}).items():
+            sketch = QuantileSketch.from_dict(data)
+            step_sketch.merge(sketch)
+            by_action.setdefault(action, QuantileSketch()).merge(sketch)
+
+    for ep in episodes:
+        for action, data in ep.get("step_duration_sketches", {}).items():
+            sketch = QuantileSketch.from_dict(data)
+            agent_sketch.merge(sketch)
+            by_action.setdefault(action, QuantileSketch()).merge(sketch)
+
+    result: Dict[str, Any] = {}
+    for label, sketch in (("test_duration_ms", test_sketch), ("step_duration_ms", step_sketch), ("agent_step_ms", agent_sketch)):
+        for name, value in _quantiles(sketch).items():
+            result[f"{name}_{label}"] = value
+
+    result["step_duration_by_action"] = {
+        action: {"count": by_action[action].count, **_quantiles(by_action[action])}
+        for action in sorted(by_action)
+    }
+    return result
@@ -1,29 +1,22 @@
 # web_complexity_lab/features/log_metrics.py
 from typing import List, Dict, Any
 
+from .metric_table import MetricTable
 
-def compute_log_metrics(app_id: str, logs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+
+def compute_log_metrics(app_id: str, logs: List[Dict[str, Any]]) -> MetricTable:
     """
     Computes metrics from test execution logs (JUnit, traces, etc.).
     """
-    results = []
-    for log in logs:
-        steps = log.get("steps", [])
-        total_duration = log.get("duration_ms", 0)
-
-        passed_steps = sum(1 for s in steps if s.get("status") == "passed")
-        failed_steps = sum(1 for s in steps if s.get("status") == "failed")
-
-        m = {
-            "app_id": app_id,
-            "test_id": log.get("test_id"),
-            "status": log.get("status"),
-            "duration_ms": total_duration,
-            "steps_count": len(steps),
-            "passed_steps": passed_steps,
-            "failed_steps": failed_steps,
-            "retries": log.get("retries", 0),
-            "failure_count": len(log.get("failures", [])),
-        }
-        results.append(m)
-    return results
+    step_statuses = [[s.get("status") for s in log.get("steps", [])] for log in logs]
+    return MetricTable.from_columns({
+        "app_id": [app_id] * len(logs),
+        "test_id": [log.get("test_id") for log in logs],
+        "status": [log.get("status") for log in logs],
+        "duration_ms": [log.get("duration_ms", 0) for log in logs],
+        "steps_count": [len(statuses) for statuses in step_statuses],
+        "passed_steps": [statuses.count("passed") for statuses in step_statuses],
+        "failed_steps": [statuses.count("failed") for statuses in step_statuses],
+        "retries": [log.get("retries", 0) for log in logs],
+        "failure_count": [len(log.get("failures", [])) for log in logs],
+    })
@@ -0,0 +1,101 @@
+# web_complexity_lab/features/metric_table.py
+from typing import List, Dict, Any, Iterable, Sequence
+
+import numpy as np
+
+
+def _to_array(values: Sequence[Any]) -> "tuple[np.ndarray, np.ndarray]":
+    """
+    Column array and validity mask for one field.
+
+    bool -> bool, int -> int64, int/float -> float64 (missing values are
+    stored as zero / False), anything else -> object (missing stays None).
+    An empty column is int64, so sums over it stay 0.
+    """
+    if not values:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool)
+    valid = np.fromiter((v is not None for v in values), dtype=bool, count=len(values))
+    present = [v for v in values if v is not None]
+    kinds = {type(v) for v in present}
+
+    if kinds <= {bool} and present:
+        return np.array([bool(v) for v in values], dtype=bool), valid
+    if kinds <= {int, float} and present:
+        dtype = np.int64 if kinds == {int} else np.float64
+        try:
+            return np.array([0 if v is None else v for v in values], dtype=dtype), valid
+        except OverflowError:
+            pass  # beyond int64: keep the Python ints
+    column = np.empty(len(values), dtype=object)
+    column[:] = list(values)
+    return column, valid
+
+
+class MetricTable:
+    """
+    Columnar table of per-entity metrics (pages, tests, log runs, episodes).
+
+    Each field is one NumPy array plus a validity mask for values that were
+    missing (None), so aggregation is a handful of vectorized reductions
+    instead of a Python loop per metric. Fields keep the order they were
+    given in; to_records() turns the table back into the row dicts the
+    exporters and JSON output use.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], valid: Dict[str, np.ndarray], length: int):
+        self.columns = columns
+        self.valid = valid
+        self.length = length
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Sequence[Any]]) -> "MetricTable":
+        """Table from one sequence of Python values per field (all the same length)."""
+        arrays: Dict[str, np.ndarray] = {}
+        valid: Dict[str, np.ndarray] = {}
+        length = 0
+        for name, values in columns.items():
+            arrays[name], valid[name] = _to_array(values)
+            length = len(values)
+        return cls(arrays, valid, length)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "MetricTable":
+        """Table from row dicts; fields come from the first row."""
+        records = list(records)
+        if not records:
+            return cls({}, {}, 0)
+        return cls.from_columns({name: [r.get(name) for r in records] for name in records[0]})
+
+    def __len__(self) -> int:
+        return self.length
+
+    @property
+    def fields(self) -> List[str]:
+        return list(self.columns)
+
+    def column(self, name: str, default: Any = 0) -> np.ndarray:
+        """
+        Values of a field, with default in place of missing ones (the
+        columnar form of [row.get(name, default) for row in rows]).
+        """
+        if name not in self.columns:
+            return np.full(self.length, default, dtype=object if isinstance(default, str) else None)
+        values, valid = self.columns[name], self.valid[name]
+        if valid.all():
+            return values
+        values = values.copy()
+        values[~valid] = default
+        return values
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Row dicts with plain Python values (None where a value was missing)."""
+        columns = []
+        for name, values in self.columns.items():
+            items = values.tolist()
+            valid = self.valid[name]
+            if not valid.all():
+                for i in np.flatnonzero(~valid).tolist():
+                    items[i] = None
+            columns.append(items)
+        names = list(self.columns)
+        return [dict(zip(names, row)) for row in zip(*columns)]
@@ -1,23 +1,18 @@
 # web_complexity_lab/features/test_metrics.py
 from typing import List, Dict, Any
 
+from .metric_table import MetricTable
 
-def compute_test_metrics(app_id: str, tests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    results = []
-    for t in tests:
-        steps = t.get("steps", [])
-        steps_count = t.get("steps_count", len(steps))
 
-        m = {
-            "app_id": app_id,
-            "test_id": t.get("test_id", "unknown"),
-            "file": t.get("file", ""),
-            "framework": t.get("framework", "playwright"),
-            "steps_count": steps_count,
-            "clicks": t.get("clicks", 0),
-            "fills": t.get("fills", 0),
-            "navigations": t.get("navigations", 0),
-            "assertions": t.get("assertions", 0),
-        }
-        results.append(m)
-    return results
+def compute_test_metrics(app_id: str, tests: List[Dict[str, Any]]) -> MetricTable:
+    return MetricTable.from_columns({
+        "app_id": [app_id] * len(tests),
+        "test_id": [t.get("test_id", "unknown") for t in tests],
+        "file": [t.get("file", "") for t in tests],
+        "framework": [t.get("framework", "playwright") for t in tests],
+        "steps_count": [t.get("steps_count", len(t.get("steps", []))) for t in tests],
+        "clicks": [t.get("clicks", 0) for t in tests],
+        "fills": [t.get("fills", 0) for t in tests],
+        "navigations": [t.get("navigations", 0) for t in tests],
+        "assertions": [t.get("assertions", 0) for t in tests],
+    })
@@ -1,26 +1,23 @@
 # web_complexity_lab/features/ui_metrics.py
 from typing import List, Dict, Any
 
+from .metric_table import MetricTable
 
-def compute_ui_metrics(app_id: str, ui_states: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+
+def compute_ui_metrics(app_id: str, ui_states: List[Dict[str, Any]]) -> MetricTable:
     """
     Computes per-page / per-state UI metrics.
     """
-    metrics = []
-    for state in ui_states:
-        interactive_elems = state.get("interactive_elements", [])
-        forms = state.get("forms", [])
-
-        m = {
-            "app_id": app_id,
-            "page_id": state.get("page_id"),
-            "url": state.get("url"),
-            "dom_node_count": state.get("dom_node_count", 0),
-            "interactive_count": state.get("interactive_count", len(interactive_elems)),
-            "form_count": len(forms),
-            "buttons": state.get("buttons", 0),
-            "inputs": state.get("inputs", 0),
-            "links": state.get("links", 0),
-        }
-        metrics.append(m)
-    return metrics
+    return MetricTable.from_columns({
+        "app_id": [app_id] * len(ui_states),
+        "page_id": [s.get("page_id") for s in ui_states],
+        "url": [s.get("url") for s in ui_states],
+        "dom_node_count": [s.get("dom_node_count", 0) for s in ui_states],
+        "dom_unit": [s.get("dom_unit", "chars") for s in ui_states],
+        "dom_depth": [s.get("dom_depth", 0) for s in ui_states],
+        "interactive_count": [s.get("interactive_count", 0) for s in ui_states],
+        "form_count": [s.get("form_count", 0) for s in ui_states],
+        "buttons": [s.get("buttons", 0) for s in ui_states],
+        "inputs": [s.get("inputs", 0) for s in ui_states],
+        "links": [s.get("links", 0) for s in ui_states],
+    })
@@ -0,0 +1,260 @@
+# web_complexity_lab/history.py
+from typing import List, Dict, Any, Iterable, Optional
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+import hashlib
+import json
+import sqlite3
+import subprocess
+
+HISTORY_FILENAME = "wcx_history.sqlite"
+DEFAULT_LAST = 10
+# shown by `wcx history` unless --metric is given
+DEFAULT_METRICS = ("wcs", "suci", "ifci", "trci", "adi", "total_tests", "avg_test_duration_ms", "p90_test_duration_ms")
+
+
+class RunHistory:
+    """
+    Append-only SQLite store of every `wcx evaluate` run.
+
+    A run is keyed by its start time (UTC, ISO 8601), the hash of the
+    configuration and, per application, the git revision of its root_path
+    when it is a git checkout. Every numeric app-level metric and index is
+    one row of metric_values, whose primary key (app_id, metric, run_id)
+    answers "the last N values of one metric of one app" with an index
+    range scan however many runs are stored. Rows are only ever inserted.
+    """
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, db_path, read_only: bool = False):
+        self.db_path = Path(db_path)
+        if read_only:
+            # never writes, so readers do not change the file or its mtime
+            uri = f"{self.db_path.resolve().as_uri()}?mode=ro"
+            self._conn = sqlite3.connect(uri, uri=True, timeout=30)
+        else:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), timeout=30)
+
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, self.SCHEMA_VERSION) or (read_only and version == 0):
+            self._conn.close()
+            # unlike the result cache, history is not thrown away
+            raise ValueError(f"{self.db_path} has history schema {version}, expected {self.SCHEMA_VERSION}")
+        if version == self.SCHEMA_VERSION:
+            return
+        with self._conn:
+            self._conn.executescript(
+                f"""
+                PRAGMA user_version = {self.SCHEMA_VERSION};
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    started_at TEXT NOT NULL,
+                    config_hash TEXT NOT NULL,
+                    project TEXT
+                );
+                CREATE INDEX IF NOT EXISTS runs_started_at ON runs (started_at);
+                CREATE TABLE IF NOT EXISTS run_apps (
+                    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+                    app_id TEXT NOT NULL,
+                    git_rev TEXT,
+                    PRIMARY KEY (run_id, app_id)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS metric_values (
+                    app_id TEXT NOT NULL,
+                    metric TEXT NOT NULL,
+                    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+                    value REAL,
+                    PRIMARY KEY (app_id, metric, run_id)
+                ) WITHOUT ROWID;
+                """
+            )
+
+    def record(self, cfg, all_app_results: List[Dict[str, Any]], started_at: Optional[str] = None) -> int:
+        """Appends one run (app_level metrics and indices of every app); returns its run_id."""
+        started_at = started_at or utc_now()
+        apps = {app.id: app for app in cfg.applications}
+        with self._conn:
+            run_id = self._conn.execute(
+                "INSERT INTO runs (started_at, config_hash, project) VALUES (?, ?, ?)",
+                (started_at, config_hash(cfg), cfg.project_name),
+            ).lastrowid
+            for r in all_app_results:
+                app = apps.get(r["app_id"])
+                self._conn.execute(
+                    "INSERT INTO run_apps VALUES (?, ?, ?)",
+                    (run_id, r["app_id"], git_revision(app.root_path) if app else None),
+                )
+                self._conn.executemany(
+                    "INSERT INTO metric_values VALUES (?, ?, ?, ?)",
+                    [(r["app_id"], metric, run_id, value) for metric, value in _numeric_fields(r)],
+                )
+        return run_id
+
+    def first_run_since(self, since: str) -> Optional[int]:
+        """The first run started at or after since (an ISO date or timestamp)."""
+        return self._conn.execute("SELECT MIN(run_id) FROM runs WHERE started_at >= ?", (since,)).fetchone()[0]
+
+    def trend(self, app_id: str, metric: str, last: int = DEFAULT_LAST, first_run: int = 0) -> List[Dict[str, Any]]:
+        """The last `last` values of one metric of one app (from first_run on), oldest first."""
+        rows = self._conn.execute(
+            """
+            SELECT v.run_id, r.started_at, a.git_rev, v.value
+            FROM metric_values v
+            JOIN runs r ON r.run_id = v.run_id
+            LEFT JOIN run_apps a ON a.run_id = v.run_id AND a.app_id = v.app_id
+            WHERE v.app_id = ? AND v.metric = ? AND v.run_id >= ?
+            ORDER BY v.run_id DESC
+            LIMIT ?
+            """,
+            (app_id, metric, first_run, last),
+        ).fetchall()
+        return [
+            {"run_id": run_id, "started_at": started_at, "git_rev": git_rev, "value": value}
+            for run_id, started_at, git_rev, value in reversed(rows)
+        ]
+
+    def run_count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "RunHistory":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def history_path(cfg) -> Path:
+    """output.history in config.yaml, else <output.dir>/wcx_history.sqlite."""
+    return Path(cfg.output.get("history") or Path(cfg.output["dir"]) / HISTORY_FILENAME)
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def config_hash(cfg) -> str:
+    """SHA-1 of the configuration, independent of key order and formatting."""
+    canonical = json.dumps(asdict(cfg), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def git_revision(root_path: str) -> Optional[str]:
+    """HEAD commit of the git checkout at root_path (None if it is not one or git is missing)."""
+    try:
+        done = subprocess.run(
+            ["git", "-C", str(root_path), "rev-parse", "HEAD"],
+            capture_output=True, text=True, timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if done.returncode != 0:
+        return None
+    return done.stdout.strip() or None
+
+
+def _numeric_fields(result: Dict[str, Any]) -> Iterable:
+    """(metric, value) for every number in app_level and indices."""
+    for source in (result["app_level"], result["indices"]):
+        for name, value in source.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                yield name, float(value)
+
+
+def _delta(series: List[Dict[str, Any]], back: int) -> Optional[float]:
+    if len(series) <= back:
+        return None
+    return round(series[-1]["value"] - series[-1 - back]["value"], 6)
+
+
+def history_report(
+    history: RunHistory,
+    app_ids: List[str],
+    metrics: List[str],
+    last: int = DEFAULT_LAST,
+    since: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    For every app and metric the last `last` values since `since`, the
+    change from the previous run and the change over the listed runs.
+    """
+    first_run = 0
+    if since:
+        first_run = history.first_run_since(since)
+        if first_run is None:
+            raise ValueError(f"no runs since {since}")
+    report: Dict[str, Any] = {"runs": history.run_count(), "apps": {}}
+    for app_id in app_ids:
+        report["apps"][app_id] = {
+            metric: {
+                "series": series,
+                "delta_previous": _delta(series, 1),
+                "delta_span": _delta(series, len(series) - 1) if len(series) > 1 else None,
+            }
+            for metric in metrics
+            for series in [history.trend(app_id, metric, last, first_run)]
+        }
+    return report
+
+
+def show_history(
+    cfg,
+    app_ids: Optional[List[str]] = None,
+    metrics: Optional[List[str]] = None,
+    last: int = DEFAULT_LAST,
+    since: Optional[str] = None,
+    as_json: bool = False,
+) -> Dict[str, Any]:
+    """
+    Trends of app metrics over the recorded runs (see history_report), for
+    all configured apps and DEFAULT_METRICS by default. Printed as one table
+    per app, or as JSON with as_json.
+    """
+    path = history_path(cfg)
+    if not path.exists():
+        raise FileNotFoundError(f"no run history at {path}; run `wcx evaluate` first")
+    app_ids = app_ids or [app.id for app in cfg.applications]
+    metrics = metrics or list(DEFAULT_METRICS)
+
+    with RunHistory(path) as history:
+        report = history_report(history, app_ids, metrics, last, since)
+
+    if as_json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        _print_history(report, metrics)
+    return report
+
+
+def _print_history(report: Dict[str, Any], metrics: List[str]) -> None:
+    print(f"=== Run history: {report['runs']} run(s) recorded ===")
+    width = max(12, *(len(m) for m in metrics))
+    for app_id, trends in report["apps"].items():
+        runs: Dict[int, Dict[str, Any]] = {}
+        for metric, trend in trends.items():
+            for point in trend["series"]:
+                runs.setdefault(point["run_id"], {**point, "values": {}})["values"][metric] = point["value"]
+        print(f"\n{app_id}")
+        if not runs:
+            print("  no recorded runs")
+            continue
+        print(f"  {'run':>5}  {'started (UTC)':<20}  {'git':<8}  " + "  ".join(f"{m:>{width}}" for m in metrics))
+        for run_id in sorted(runs):
+            run = runs[run_id]
+            values = "  ".join(_cell(run["values"].get(m), width) for m in metrics)
+            print(f"  {run_id:>5}  {run['started_at']:<20}  {(run['git_rev'] or '-')[:8]:<8}  {values}")
+        for label, key in (("change vs previous run", "delta_previous"), ("change over listed runs", "delta_span")):
+            values = "  ".join(_cell(trends[m][key], width, signed=True) for m in metrics)
+            print(f"  {label:<37}  {values}")
+
+
+def _cell(value: Optional[float], width: int, signed: bool = False) -> str:
+    if value is None:
+        return f"{'-':>{width}}"
+    text = (f"{value:+.4f}" if signed else f"{value:.4f}").rstrip("0").rstrip(".")
+    return f"{text:>{width}}"
@@ -0,0 +1,56 @@
+# web_complexity_lab/models/bootstrap.py
+from typing import Dict, Any
+
+import numpy as np
+
+from ..features.aggregation import aggregate_resampled
+from ..features.metric_table import MetricTable
+from .complexity_index import compute_raw_indices_batch
+
+DEFAULT_RESAMPLES = 1000
+CONFIDENCE = 0.95
+# resample-count cells (resamples x metric rows) scored per batch
+_MAX_CELLS = 4_000_000
+
+
+def bootstrap_intervals(
+    ui_metrics: MetricTable,
+    test_metrics: MetricTable,
+    log_metrics: MetricTable,
+    agent_metrics: MetricTable,
+    resamples: int = DEFAULT_RESAMPLES,
+    confidence: float = CONFIDENCE,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Percentile bootstrap intervals for SUCI, IFCI, TRCI, ADI and WCS.
+
+    The page, test, log-run and episode rows are resampled with replacement
+    and the app-level aggregates and indices are recomputed for every
+    resample. Resamples are drawn as count matrices and scored in batches
+    (see aggregate_resampled and compute_raw_indices_batch), not one by one
+    through the pipeline.
+    """
+    rng = np.random.default_rng(seed)
+    rows = len(ui_metrics) + len(test_metrics) + len(log_metrics) + len(agent_metrics)
+    batch = max(1, _MAX_CELLS // max(rows, 1))
+
+    scores: Dict[str, list] = {}
+    for start in range(0, resamples, batch):
+        size = min(batch, resamples - start)
+
+        def draw(n: int) -> np.ndarray:
+            if not n:
+                return np.zeros((size, 0))
+            return rng.multinomial(n, np.full(n, 1.0 / n), size=size)
+
+        columns = aggregate_resampled(ui_metrics, test_metrics, log_metrics, agent_metrics, draw)
+        for name, values in compute_raw_indices_batch(columns).items():
+            scores.setdefault(name, []).append(values)
+
+    tail = (1 - confidence) / 2 * 100
+    intervals: Dict[str, Any] = {"resamples": resamples, "confidence": confidence}
+    for name, parts in scores.items():
+        low, high = np.percentile(np.concatenate(parts), [tail, 100 - tail])
+        intervals[name] = [round(float(low), 4), round(float(high), 4)]
+    return intervals
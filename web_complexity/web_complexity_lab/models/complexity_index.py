@@ -1,31 +1,162 @@
 # web_complexity_lab/models/complexity_index.py
-from typing import Dict, Any
+from typing import List, Dict, Any, Mapping
 import math
 
-
-def _normalize(value: float, min_v: float, max_v: float) -> float:
+import numpy as np
+
+# Every index is computed on columns: one array entry per app (or per
+# historical snapshot of an app), so a whole run history is rescored in one
+# call. The single-app functions below run the same code on one-row
+# columns. Each formula keeps the order of operations of a scalar left-to-
+# right evaluation, so results do not depend on how many rows are scored
+# together.
+Columns = Mapping[str, Any]
+
+# app_level fields the indices read
+INDEX_INPUTS = (
+    "total_pages",
+    "avg_dom_nodes",
+    "avg_interactive_count",
+    "avg_form_count",
+    "total_tests",
+    "avg_test_steps",
+    "total_clicks",
+    "total_assertions",
+    "avg_test_duration_ms",
+    "failure_rate",
+    "total_episodes",
+    "avg_agent_steps_to_success",
+    "agent_success_rate",
+    "avg_agent_backtracks",
+    "avg_agent_dom_size",
+)
+
+# Tunable constants: the WCS weights (before normalization, with their
+# data-dependent overrides) and the (min, max) normalization range of each
+# index component. Every *_batch function takes a params mapping; keys it
+# leaves out keep these defaults. A parameter may also be an array of shape
+# (draws, 1), which scores every app under every draw at once (see
+# sensitivity.py).
+DEFAULT_PARAMS: Dict[str, float] = {
+    "wcs.w_suci": 0.20,
+    "wcs.w_ifci": 0.30,
+    "wcs.w_trci": 0.10,
+    "wcs.w_adi": 0.40,
+    "wcs.w_ifci_many_tests": 0.40,  # more than 20 tests
+    "wcs.w_adi_many_tests": 0.30,
+    "wcs.w_adi_backtracks": 0.45,  # agent backtracked
+    "wcs.w_ifci_backtracks": 0.25,
+    "suci.pages_min": 1,
+    "suci.pages_max": 15,
+    "suci.dom_min": 100,
+    "suci.dom_max": 10000,
+    "suci.interactive_min": 1,
+    "suci.interactive_max": 30,
+    "suci.forms_min": 0,
+    "suci.forms_max": 5,
+    "ifci.tests_min": 1,
+    "ifci.tests_max": 200,
+    "ifci.steps_min": 1,
+    "ifci.steps_max": 20,
+    "ifci.clicks_min": 1,
+    "ifci.clicks_max": 500,
+    "ifci.assertions_min": 1,
+    "ifci.assertions_max": 1000,
+    "trci.duration_min": 500,
+    "trci.duration_max": 30000,
+    "trci.failure_min": 0.0,
+    "trci.failure_max": 0.5,
+    "adi.steps_min": 3,
+    "adi.steps_max": 20,
+    "adi.backtracks_min": 0,
+    "adi.backtracks_max": 3,
+    "adi.dom_min": 100,
+    "adi.dom_max": 10000,
+    # ADI estimate for apps without agent data
+    "adi.test_count_min": 1,
+    "adi.test_count_max": 200,
+    "adi.test_steps_min": 1,
+    "adi.test_steps_max": 20,
+    "adi.test_clicks_min": 1,
+    "adi.test_clicks_max": 500,
+}
+
+# math.log1p per element: numpy's vectorized log1p may round differently
+_log1p = np.frompyfunc(math.log1p, 1, 1)
+
+
+def _clip01(x: np.ndarray) -> np.ndarray:
+    return np.maximum(0.0, np.minimum(1.0, x))
+
+
+def _params(params: Mapping[str, Any] | None) -> Mapping[str, Any]:
+    return DEFAULT_PARAMS if not params else {**DEFAULT_PARAMS, **params}
+
+
+def _range(params: Mapping[str, Any], name: str) -> tuple:
+    return params[name + "_min"], params[name + "_max"]
+
+
+def _normalize(value: np.ndarray, bounds: tuple) -> np.ndarray:
     """
     Linearly normalize value into [0, 1] given an expected range [min_v, max_v].
     """
-    if max_v <= min_v:
-        return 0.0
-    x = (value - min_v) / (max_v - min_v)
-    return max(0.0, min(1.0, x))
+    min_v, max_v = bounds
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x = _clip01((value - min_v) / (max_v - min_v))
+    return np.where(max_v > min_v, x, 0.0)
 
 
-def _log_normalize(value: float, min_v: float, max_v: float) -> float:
+def _log_normalize(value: np.ndarray, bounds: tuple) -> np.ndarray:
     """
     Logarithmic normalization for values with large ranges.
     """
-    if value <= 0:
-        return 0.0
-    if max_v <= min_v:
-        return 0.0
-    log_val = math.log1p(value)
-    log_min = math.log1p(min_v)
-    log_max = math.log1p(max_v)
-    x = (log_val - log_min) / (log_max - log_min)
-    return max(0.0, min(1.0, x))
+    min_v, max_v = bounds
+    log_val = _log1p(np.maximum(value, 0.0)).astype(np.float64)
+    log_min = math.log1p(min_v) if np.ndim(min_v) == 0 else np.log1p(min_v)
+    log_max = math.log1p(max_v) if np.ndim(max_v) == 0 else np.log1p(max_v)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x = _clip01((log_val - log_min) / (log_max - log_min))
+    return np.where((value <= 0) | (max_v <= min_v), 0.0, x)
+
+
+def _weighted_mean(parts: List[tuple]) -> np.ndarray:
+    """
+    Per row, the weighted mean of the (component, weight, present) parts
+    that are present (0.0 if none is). Absent parts add exactly 0.0, so the
+    sums equal those over the present parts alone.
+    """
+    total = 0
+    total_weight = 0
+    for component, weight, present in parts:
+        w = np.where(present, weight, 0.0)
+        total = total + component * w
+        total_weight = total_weight + w
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(total_weight > 0, total / total_weight, 0.0)
+
+
+def _mean_present(parts: List[tuple]) -> np.ndarray:
+    """Per row, the plain mean of the (component, present) parts that are present."""
+    total = 0
+    count = 0
+    for component, present in parts:
+        total = total + np.where(present, component, 0.0)
+        count = count + present.astype(np.int64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / np.maximum(count, 1), 0.0)
+
+
+def _length(columns: Columns) -> int:
+    for values in columns.values():
+        return len(values)
+    return 0
+
+
+def _col(columns: Columns, key: str) -> np.ndarray:
+    if key in columns:
+        return np.asarray(columns[key], dtype=np.float64)
+    return np.zeros(_length(columns))
 
 
 def _safe_get(app_level: Dict[str, Any], key: str, default: float = 0.0) -> float:
@@ -36,7 +167,21 @@ def _safe_get(app_level: Dict[str, Any], key: str, default: float = 0.0) -> floa
         return default
 
 
-def compute_suci(app_level: Dict[str, Any]) -> float:
+def app_level_columns(app_levels: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Index input columns from app_level dicts (per app, or per snapshot from
+    the run history). Missing or non-numeric values become 0.0.
+    """
+    columns: Dict[str, np.ndarray] = {
+        key: np.array([_safe_get(a, key) for a in app_levels], dtype=np.float64)
+        for key in INDEX_INPUTS
+    }
+    columns["dom_unit"] = np.array([a.get("dom_unit", "chars") for a in app_levels], dtype=object)
+    columns["app_id"] = np.array([a.get("app_id") for a in app_levels], dtype=object)
+    return columns
+
+
+def compute_suci_batch(columns: Columns, params: Mapping[str, Any] | None = None) -> np.ndarray:
     """
     Structural UI Complexity Index (SUCI)
 
@@ -47,61 +192,46 @@ def compute_suci(app_level: Dict[str, Any]) -> float:
       - Form count
       - Application type (SPA vs static)
     """
-    total_pages = _safe_get(app_level, "total_pages")
-    avg_dom_nodes = _safe_get(app_level, "avg_dom_nodes")
-    avg_interactive = _safe_get(app_level, "avg_interactive_count")
-    avg_forms = _safe_get(app_level, "avg_form_count")
-    total_tests = _safe_get(app_level, "total_tests")
+    p = _params(params)
+    total_pages = _col(columns, "total_pages")
+    avg_dom_nodes = _col(columns, "avg_dom_nodes")
+    avg_interactive = _col(columns, "avg_interactive_count")
+    avg_forms = _col(columns, "avg_form_count")
+    total_tests = _col(columns, "total_tests")
+    dom_unit = np.asarray(columns.get("dom_unit", ["chars"] * len(total_pages)), dtype=object)
 
     # Cap DOM nodes at reasonable values (agent logs may have character counts)
-    # Real DOM node counts are typically < 10,000
-    if avg_dom_nodes > 100000:
-        avg_dom_nodes = avg_dom_nodes / 100  # Likely character count, estimate nodes
+    # Real DOM node counts are typically < 10,000; element counts from static
+    # HTML or a crawl are taken as they are
+    # (Likely character count, estimate nodes)
+    avg_dom_nodes = np.where((avg_dom_nodes > 100000) & (dom_unit != "elements"), avg_dom_nodes / 100, avg_dom_nodes)
 
     # Normalize each component
-    n_pages = _normalize(total_pages, 1, 15)
-    n_dom = _log_normalize(avg_dom_nodes, 100, 10000)
-    n_interactive = _normalize(avg_interactive, 1, 30)
-    n_forms = _normalize(avg_forms, 0, 5)
+    n_pages = _normalize(total_pages, _range(p, "suci.pages"))
+    n_dom = _log_normalize(avg_dom_nodes, _range(p, "suci.dom"))
+    n_interactive = _normalize(avg_interactive, _range(p, "suci.interactive"))
+    n_forms = _normalize(avg_forms, _range(p, "suci.forms"))
 
     # SPA indicator: few pages but many tests suggests complex SPA
-    spa_factor = 0.0
-    if total_pages <= 3 and total_tests > 5:
-        spa_factor = 0.3  # Boost for SPAs
+    spa_factor = np.where((total_pages <= 3) & (total_tests > 5), 0.3, 0.0)  # Boost for SPAs
 
     # Many pages with few tests suggests simple static site
-    static_penalty = 0.0
-    if total_pages > 5 and total_tests <= 2:
-        static_penalty = 0.2  # Penalty for simple multi-page static sites
-
-    # Weight components
-    components = []
-    weights = []
-
-    if total_pages > 0:
-        components.append(n_pages)
-        weights.append(0.25)
-    if avg_dom_nodes > 0:
-        components.append(n_dom)
-        weights.append(0.25)
-    if avg_interactive > 0:
-        components.append(n_interactive)
-        weights.append(0.30)
-    if avg_forms > 0:
-        components.append(n_forms)
-        weights.append(0.20)
-
-    if not components:
-        return 0.0
+    # (penalty for simple multi-page static sites)
+    static_penalty = np.where((total_pages > 5) & (total_tests <= 2), 0.2, 0.0)
 
-    # Weighted average with adjustments
-    total_weight = sum(weights)
-    base_score = sum(c * w for c, w in zip(components, weights)) / total_weight
+    # Weighted average of the available components, with adjustments
+    base_score = _weighted_mean([
+        (n_pages, 0.25, total_pages > 0),
+        (n_dom, 0.25, avg_dom_nodes > 0),
+        (n_interactive, 0.30, avg_interactive > 0),
+        (n_forms, 0.20, avg_forms > 0),
+    ])
+    has_data = (total_pages > 0) | (avg_dom_nodes > 0) | (avg_interactive > 0) | (avg_forms > 0)
 
-    return max(0.0, min(1.0, base_score + spa_factor - static_penalty))
+    return np.where(has_data, _clip01(base_score + spa_factor - static_penalty), 0.0)
 
 
-def compute_ifci(app_level: Dict[str, Any]) -> float:
+def compute_ifci_batch(columns: Columns, params: Mapping[str, Any] | None = None) -> np.ndarray:
     """
     Interaction Flow Complexity Index (IFCI)
 
@@ -110,49 +240,32 @@ def compute_ifci(app_level: Dict[str, Any]) -> float:
       - Average steps per test
       - Total interactions (clicks, assertions)
     """
-    total_tests = _safe_get(app_level, "total_tests")
-    avg_steps = _safe_get(app_level, "avg_test_steps")
-    total_clicks = _safe_get(app_level, "total_clicks")
-    total_assertions = _safe_get(app_level, "total_assertions")
-    total_pages = _safe_get(app_level, "total_pages")
+    p = _params(params)
+    total_tests = _col(columns, "total_tests")
+    avg_steps = _col(columns, "avg_test_steps")
+    total_clicks = _col(columns, "total_clicks")
+    total_assertions = _col(columns, "total_assertions")
+    total_pages = _col(columns, "total_pages")
 
     # Normalize - use log scale for counts
-    n_tests = _log_normalize(total_tests, 1, 200)  # 1-200 tests range
-    n_steps = _normalize(avg_steps, 1, 20)
-    n_clicks = _log_normalize(total_clicks, 1, 500)
-    n_assertions = _log_normalize(total_assertions, 1, 1000)
-
-    components = []
-    weights = []
-
-    if total_tests > 0:
-        components.append(n_tests)
-        weights.append(0.40)  # Number of tests is most important
-    if avg_steps > 0:
-        components.append(n_steps)
-        weights.append(0.20)
-    if total_clicks > 0:
-        components.append(n_clicks)
-        weights.append(0.20)
-    if total_assertions > 0:
-        components.append(n_assertions)
-        weights.append(0.20)
-
-    if not components:
-        return 0.0
-
-    total_weight = sum(weights)
-    base_score = sum(c * w for c, w in zip(components, weights)) / total_weight
+    n_tests = _log_normalize(total_tests, _range(p, "ifci.tests"))  # 1-200 tests range
+    n_steps = _normalize(avg_steps, _range(p, "ifci.steps"))
+    n_clicks = _log_normalize(total_clicks, _range(p, "ifci.clicks"))
+    n_assertions = _log_normalize(total_assertions, _range(p, "ifci.assertions"))
+
+    base_score = _weighted_mean([
+        (n_tests, 0.40, total_tests > 0),  # Number of tests is most important
+        (n_steps, 0.20, avg_steps > 0),
+        (n_clicks, 0.20, total_clicks > 0),
+        (n_assertions, 0.20, total_assertions > 0),
+    ])
 
     # Penalize simple multi-page static sites with few tests
     # (many pages + few tests = simple navigation, not complex interactions)
-    if total_pages > 5 and total_tests <= 2:
-        base_score *= 0.4  # 60% penalty for static sites
-
-    return base_score
+    return np.where((total_pages > 5) & (total_tests <= 2), base_score * 0.4, base_score)  # 60% penalty
 
 
-def compute_trci(app_level: Dict[str, Any]) -> float:
+def compute_trci_batch(columns: Columns, params: Mapping[str, Any] | None = None) -> np.ndarray:
     """
     Temporal / Runtime Complexity Index (TRCI)
 
@@ -160,23 +273,18 @@ def compute_trci(app_level: Dict[str, Any]) -> float:
       - Test duration
       - Failure rate
     """
-    avg_duration_ms = _safe_get(app_level, "avg_test_duration_ms")
-    failure_rate = _safe_get(app_level, "failure_rate")
+    p = _params(params)
+    avg_duration_ms = _col(columns, "avg_test_duration_ms")
+    failure_rate = _col(columns, "failure_rate")
 
-    n_dur = _normalize(avg_duration_ms, 500, 30000)
-    n_fail = _normalize(failure_rate, 0.0, 0.5)
+    n_dur = _normalize(avg_duration_ms, _range(p, "trci.duration"))
+    n_fail = _normalize(failure_rate, _range(p, "trci.failure"))
 
-    components = []
-    if avg_duration_ms > 0:
-        components.append(n_dur)
-    components.append(n_fail)  # Include even if 0
+    # the failure rate counts even if 0; the duration only when known
+    return np.where(avg_duration_ms > 0, (n_dur + n_fail) / 2, n_fail)
 
-    if not components:
-        return 0.0
-    return sum(components) / len(components)
 
-
-def compute_adi(app_level: Dict[str, Any]) -> float:
+def compute_adi_batch(columns: Columns, params: Mapping[str, Any] | None = None) -> np.ndarray:
     """
     Agent Difficulty Index (ADI)
 
@@ -188,63 +296,48 @@ def compute_adi(app_level: Dict[str, Any]) -> float:
 
     If no agent data, estimate from test complexity.
     """
-    total_episodes = _safe_get(app_level, "total_episodes")
-    total_tests = _safe_get(app_level, "total_tests")
-
-    if total_episodes > 0:
-        # We have agent data
-        steps_to_success = _safe_get(app_level, "avg_agent_steps_to_success")
-        success_rate = _safe_get(app_level, "agent_success_rate")
-        backtracks = _safe_get(app_level, "avg_agent_backtracks")
-        avg_dom = _safe_get(app_level, "avg_agent_dom_size")
-
-        # Cap DOM size (may be character counts)
-        if avg_dom > 100000:
-            avg_dom = avg_dom / 100
-
-        n_steps = _normalize(steps_to_success, 3, 20)
-        n_success_inv = 1.0 - _normalize(success_rate, 0.0, 1.0)
-        n_backtracks = _normalize(backtracks, 0, 3)  # Tighter range - backtracks matter more
-        n_dom = _log_normalize(avg_dom, 100, 10000)
-
-        # Backtracks are a strong indicator of difficulty
-        base_score = (n_steps * 0.25 + n_success_inv * 0.15 + n_backtracks * 0.45 + n_dom * 0.15)
-
-        # Boost if there are also many tests (indicates complex app)
-        if total_tests > 10:
-            base_score += 0.1
-
-        # Boost for any backtracks (errors encountered = harder app)
-        if backtracks > 0:
-            base_score += 0.15
-
-        return min(1.0, base_score)
-    else:
-        # Estimate ADI from test complexity
-        # More tests and more steps suggest higher agent difficulty
-        avg_steps = _safe_get(app_level, "avg_test_steps")
-        total_clicks = _safe_get(app_level, "total_clicks")
-
-        n_tests = _log_normalize(total_tests, 1, 200)
-        n_steps = _normalize(avg_steps, 1, 20)
-        n_clicks = _log_normalize(total_clicks, 1, 500)
-
-        components = []
-        if total_tests > 0:
-            components.append(n_tests * 0.85)
-        if avg_steps > 0:
-            components.append(n_steps * 0.85)
-        if total_clicks > 0:
-            components.append(n_clicks * 0.85)
-
-        if not components:
-            return 0.0
-        return sum(components) / len(components)
-
-
-def compute_complexity_indices(app_level: Dict[str, Any]) -> Dict[str, Any]:
+    p = _params(params)
+    total_episodes = _col(columns, "total_episodes")
+    total_tests = _col(columns, "total_tests")
+
+    # With agent data
+    steps_to_success = _col(columns, "avg_agent_steps_to_success")
+    success_rate = _col(columns, "agent_success_rate")
+    backtracks = _col(columns, "avg_agent_backtracks")
+    avg_dom = _col(columns, "avg_agent_dom_size")
+
+    # Cap DOM size (may be character counts)
+    avg_dom = np.where(avg_dom > 100000, avg_dom / 100, avg_dom)
+
+    n_steps = _normalize(steps_to_success, _range(p, "adi.steps"))
+    n_success_inv = 1.0 - _normalize(success_rate, (0.0, 1.0))
+    n_backtracks = _normalize(backtracks, _range(p, "adi.backtracks"))  # Tighter range - backtracks matter more
+    n_dom = _log_normalize(avg_dom, _range(p, "adi.dom"))
+
+    # Backtracks are a strong indicator of difficulty
+    agent_score = (n_steps * 0.25 + n_success_inv * 0.15 + n_backtracks * 0.45 + n_dom * 0.15)
+    # Boost if there are also many tests (indicates complex app)
+    agent_score = np.where(total_tests > 10, agent_score + 0.1, agent_score)
+    # Boost for any backtracks (errors encountered = harder app)
+    agent_score = np.where(backtracks > 0, agent_score + 0.15, agent_score)
+    agent_score = np.minimum(1.0, agent_score)
+
+    # Without agent data: more tests and more steps suggest higher agent difficulty
+    avg_steps = _col(columns, "avg_test_steps")
+    total_clicks = _col(columns, "total_clicks")
+
+    estimate = _mean_present([
+        (_log_normalize(total_tests, _range(p, "adi.test_count")) * 0.85, total_tests > 0),
+        (_normalize(avg_steps, _range(p, "adi.test_steps")) * 0.85, avg_steps > 0),
+        (_log_normalize(total_clicks, _range(p, "adi.test_clicks")) * 0.85, total_clicks > 0),
+    ])
+
+    return np.where(total_episodes > 0, agent_score, estimate)
+
+
+def compute_raw_indices_batch(columns: Columns, params: Mapping[str, Any] | None = None) -> Dict[str, np.ndarray]:
     """
-    Computes all complexity indices for an application.
+    Unrounded indices for every row of columns (see app_level_columns).
 
     Indices:
       - SUCI: Structural UI Complexity Index
@@ -252,47 +345,91 @@ def compute_complexity_indices(app_level: Dict[str, Any]) -> Dict[str, Any]:
       - TRCI: Temporal/Runtime Complexity Index
       - ADI: Agent Difficulty Index
       - WCS: Weighted Complexity Score (composite)
+
+    With array-valued params of shape (draws, 1), each result has shape
+    (draws, rows).
     """
-    suci = compute_suci(app_level)
-    ifci = compute_ifci(app_level)
-    trci = compute_trci(app_level)
-    adi = compute_adi(app_level)
+    p = _params(params)
+    suci = compute_suci_batch(columns, p)
+    ifci = compute_ifci_batch(columns, p)
+    trci = compute_trci_batch(columns, p)
+    adi = compute_adi_batch(columns, p)
 
     # Dynamic weights based on data availability and app characteristics
-    total_tests = _safe_get(app_level, "total_tests")
-    total_episodes = _safe_get(app_level, "total_episodes")
-    backtracks = _safe_get(app_level, "avg_agent_backtracks")
+    total_tests = _col(columns, "total_tests")
+    backtracks = _col(columns, "avg_agent_backtracks")
 
-    # Base weights
-    w_suci = 0.20
-    w_ifci = 0.30
-    w_trci = 0.10
-    w_adi = 0.40  # Agent difficulty is important
+    # Base weights; agent difficulty is important
+    w_suci = p["wcs.w_suci"]
+    w_ifci = p["wcs.w_ifci"]
+    w_trci = p["wcs.w_trci"]
+    w_adi = p["wcs.w_adi"]
 
     # If app has many tests, IFCI is more reliable
-    if total_tests > 20:
-        w_ifci = 0.40
-        w_adi = 0.30
+    many_tests = total_tests > 20
+    w_ifci = np.where(many_tests, p["wcs.w_ifci_many_tests"], w_ifci)
+    w_adi = np.where(many_tests, p["wcs.w_adi_many_tests"], w_adi)
 
     # If app has backtracks, ADI is more meaningful (harder app)
-    if backtracks > 0:
-        w_adi = 0.45
-        w_ifci = 0.25
+    w_adi = np.where(backtracks > 0, p["wcs.w_adi_backtracks"], w_adi)
+    w_ifci = np.where(backtracks > 0, p["wcs.w_ifci_backtracks"], w_ifci)
 
     # Normalize weights
     total_w = w_suci + w_ifci + w_trci + w_adi
-    w_suci /= total_w
-    w_ifci /= total_w
-    w_trci /= total_w
-    w_adi /= total_w
+    w_suci = w_suci / total_w
+    w_ifci = w_ifci / total_w
+    w_trci = w_trci / total_w
+    w_adi = w_adi / total_w
 
     wcs = w_suci * suci + w_ifci * ifci + w_trci * trci + w_adi * adi
 
+    return {"suci": suci, "ifci": ifci, "trci": trci, "adi": adi, "wcs": wcs}
+
+
+def compute_complexity_indices_batch(
+    columns: Columns, params: Mapping[str, Any] | None = None
+) -> Dict[str, np.ndarray]:
+    """
+    Computes all complexity indices for every row of columns (see
+    app_level_columns), rounded like compute_complexity_indices.
+    """
+    indices = {
+        # round() per value: np.round scales by 10**4 and can differ from it
+        name: np.array([round(v, 4) for v in values.ravel().tolist()], dtype=np.float64).reshape(values.shape)
+        for name, values in compute_raw_indices_batch(columns, params).items()
+    }
+    if "app_id" in columns:
+        indices = {"app_id": np.asarray(columns["app_id"], dtype=object), **indices}
+    return indices
+
+
+def compute_suci(app_level: Dict[str, Any]) -> float:
+    """Structural UI Complexity Index of one app (see compute_suci_batch)."""
+    return compute_suci_batch(app_level_columns([app_level]))[0].item()
+
+
+def compute_ifci(app_level: Dict[str, Any]) -> float:
+    """Interaction Flow Complexity Index of one app (see compute_ifci_batch)."""
+    return compute_ifci_batch(app_level_columns([app_level]))[0].item()
+
+
+def compute_trci(app_level: Dict[str, Any]) -> float:
+    """Temporal / Runtime Complexity Index of one app (see compute_trci_batch)."""
+    return compute_trci_batch(app_level_columns([app_level]))[0].item()
+
+
+def compute_adi(app_level: Dict[str, Any]) -> float:
+    """Agent Difficulty Index of one app (see compute_adi_batch)."""
+    return compute_adi_batch(app_level_columns([app_level]))[0].item()
+
+
+def compute_complexity_indices(app_level: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Computes all complexity indices for an application (see
+    compute_complexity_indices_batch).
+    """
+    indices = compute_complexity_indices_batch(app_level_columns([app_level]))
     return {
         "app_id": app_level["app_id"],
-        "suci": round(suci, 4),
-        "ifci": round(ifci, 4),
-        "trci": round(trci, 4),
-        "adi": round(adi, 4),
-        "wcs": round(wcs, 4),
+        **{name: values[0].item() for name, values in indices.items() if name != "app_id"},
     }
@@ -1,6 +1,11 @@
 # web_complexity_lab/pipeline.py
-from typing import Dict, Any
+from typing import List, Dict, Any, Optional
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
 
+from .collectors.corpus import AppCorpus
+from .collectors.result_cache import ResultCache, CACHE_FILENAME
 from .collectors.ui_structure_collector import UIStructureCollector
 from .collectors.test_parser import TestParser
 from .collectors.log_parser import LogParser
@@ -10,66 +15,162 @@ from .features.ui_metrics import compute_ui_metrics
 from .features.test_metrics import compute_test_metrics
 from .features.log_metrics import compute_log_metrics
 from .features.agent_metrics import compute_agent_metrics
+from .features.duration_metrics import compute_duration_quantiles
 from .features.aggregation import aggregate_per_app
 
 from .models.complexity_index import compute_complexity_indices
+from .models.bootstrap import bootstrap_intervals
 from .exporters.csv_exporter import export_to_csv
 from .exporters.json_exporter import export_to_json
 from .exporters.html_exporter import export_to_html
-
-
-def run_evaluation(cfg) -> None:
-    all_app_results = []
-
-    for app in cfg.applications:
-        print(f"=== Evaluating application: {app.id} ===")
-
-        ui_structure_collector = UIStructureCollector(app)
+from .history import RunHistory, history_path, utc_now
+
+
+PARSE_POOLS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+
+
+def evaluate_app(
+    app,
+    cache_path: Optional[str] = None,
+    parse_workers: int = 1,
+    parse_pool: str = "thread",
+    crawl: Optional[bool] = None,
+    bootstrap: int = 0,
+) -> Dict[str, Any]:
+    """
+    Runs the collectors, features and indices for one application.
+
+    The per-page, per-test, per-run and per-episode metrics come back as
+    MetricTables (see features.metric_table); the exporters turn them into rows.
+
+    With cache_path, per-file collector results are kept in that SQLite file
+    and only files changed since the previous run are parsed. With
+    parse_workers > 1 the collectors parse files in a pool of that size
+    ("thread" or "process", see PARSE_POOLS); results do not depend on it.
+    crawl=True crawls ui_structure.start_urls with a browser (see UICrawler);
+    None leaves it to ui_structure.crawl.enabled in the config. With
+    bootstrap = B > 0, "index_intervals" holds 95% bootstrap intervals of
+    every index from B resamples of the metric rows (see models.bootstrap).
+    """
+    print(f"=== Evaluating application: {app.id} ===")
+
+    # every log file is listed and decoded once, then shared by the collectors;
+    # build them all first so one streamed pass feeds every collector's fold
+    cache = ResultCache(cache_path) if cache_path else None
+    corpus = AppCorpus(app, cache)
+    executor: Optional[Executor] = (
+        PARSE_POOLS[parse_pool](max_workers=parse_workers) if parse_workers > 1 else None
+    )
+
+    ui_structure_collector = UIStructureCollector(app, corpus, executor, crawl=crawl)
+    test_parser = TestParser(app, corpus, executor)
+    log_parser = LogParser(app, corpus, executor)
+    agent_parser = AgentLogParser(app, corpus, executor)
+
+    try:
         raw_ui_states = ui_structure_collector.collect()
-
-        test_parser = TestParser(app)
         raw_tests = test_parser.collect()
-
-        log_parser = LogParser(app)
         raw_logs = log_parser.collect()
-
-        agent_parser = AgentLogParser(app)
         raw_agent_logs = agent_parser.collect()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if cache is not None:
+        cache.close()
+        print(f"Cache: {cache.hits} file(s) unchanged, {cache.misses} parsed")
 
 #compute metrics and indexes
-        ui_metrics = compute_ui_metrics(app.id, raw_ui_states)
-        test_metrics = compute_test_metrics(app.id, raw_tests)
-        log_metrics = compute_log_metrics(app.id, raw_logs)
-        agent_metrics = compute_agent_metrics(app.id, raw_agent_logs)
-
-        app_level = aggregate_per_app(
-            app_id=app.id,
-            ui_metrics=ui_metrics,
-            test_metrics=test_metrics,
-            log_metrics=log_metrics,
-            agent_metrics=agent_metrics,
+    ui_metrics = compute_ui_metrics(app.id, raw_ui_states)
+    test_metrics = compute_test_metrics(app.id, raw_tests)
+    log_metrics = compute_log_metrics(app.id, raw_logs)
+    agent_metrics = compute_agent_metrics(app.id, raw_agent_logs)
+
+    app_level = aggregate_per_app(
+        app_id=app.id,
+        ui_metrics=ui_metrics,
+        test_metrics=test_metrics,
+        log_metrics=log_metrics,
+        agent_metrics=agent_metrics,
+        duration_quantiles=compute_duration_quantiles(raw_logs, raw_agent_logs),
+    )
+
+    indices = compute_complexity_indices(app_level)
+
+    result = {
+        "app_id": app.id,
+        "ui_metrics": ui_metrics,
+        "test_metrics": test_metrics,
+        "log_metrics": log_metrics,
+        "agent_metrics": agent_metrics,
+        "app_level": app_level,
+        "indices": indices,
+    }
+    if bootstrap > 0:
+        result["index_intervals"] = bootstrap_intervals(
+            ui_metrics, test_metrics, log_metrics, agent_metrics, resamples=bootstrap
         )
+    return result
 
-        indices = compute_complexity_indices(app_level)
-
-        result = {
-            "app_id": app.id,
-            "ui_metrics": ui_metrics,
-            "test_metrics": test_metrics,
-            "log_metrics": log_metrics,
-            "agent_metrics": agent_metrics,
-            "app_level": app_level,
-            "indices": indices,
-        }
-        all_app_results.append(result)
-
-    out_dir = cfg.output["dir"]
-    formats = cfg.output.get("formats", ["csv"])
 
+def export_results(all_app_results, out_dir: str, formats) -> List[Path]:
+    """Writes every configured export format; returns the files whose content changed."""
+    written: List[Path] = []
     for fmt in formats:
         if fmt == "csv":
-            export_to_csv(all_app_results, out_dir)
+            written += export_to_csv(all_app_results, out_dir)
         elif fmt == "json":
-            export_to_json(all_app_results, out_dir)
+            written += export_to_json(all_app_results, out_dir)
         elif fmt == "html":
-            export_to_html(all_app_results, out_dir)
+            written += export_to_html(all_app_results, out_dir)
+    return written
+
+
+def run_evaluation(
+    cfg,
+    jobs: int = 1,
+    use_cache: bool = True,
+    parse_workers: int = 1,
+    parse_pool: str = "thread",
+    crawl: Optional[bool] = None,
+    bootstrap: int = 0,
+    record_history: bool = True,
+) -> None:
+    """
+    Evaluates every configured application and exports the results.
+
+    With jobs > 1 the applications are evaluated in a process pool; results
+    are still collected in config order, so exports are deterministic.
+    Unless use_cache is False, per-file results are cached in
+    <output dir>/.wcx_cache.sqlite between runs. parse_workers / parse_pool
+    set up the per-application parsing pool, crawl turns the live crawl on
+    or off and bootstrap > 0 adds index intervals (see evaluate_app).
+    Unless record_history is False, the app-level metrics and indices are
+    appended to the run history (see history.RunHistory, `wcx history`).
+    """
+    started_at = utc_now()
+    out_dir = cfg.output["dir"]
+    cache_path = str(Path(out_dir) / CACHE_FILENAME) if use_cache else None
+    evaluate = partial(
+        evaluate_app,
+        cache_path=cache_path,
+        parse_workers=parse_workers,
+        parse_pool=parse_pool,
+        crawl=crawl,
+        bootstrap=bootstrap,
+    )
+
+    if jobs > 1 and len(cfg.applications) > 1:
+        workers = min(jobs, len(cfg.applications))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            all_app_results = list(pool.map(evaluate, cfg.applications))
+    else:
+        all_app_results = [evaluate(app) for app in cfg.applications]
+
+    export_results(all_app_results, out_dir, cfg.output.get("formats", ["csv"]))
+
+    if record_history:
+        path = history_path(cfg)
+        with RunHistory(path) as history:
+            run_id = history.record(cfg, all_app_results, started_at)
+        print(f"Run {run_id} recorded in {path}")
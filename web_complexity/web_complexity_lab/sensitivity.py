@@ -0,0 +1,221 @@
+# web_complexity_lab/sensitivity.py
+from typing import List, Dict, Any, Optional
+from pathlib import Path
+import csv
+import json
+
+import numpy as np
+
+from .models.complexity_index import DEFAULT_PARAMS, app_level_columns, compute_raw_indices_batch
+
+DEFAULT_DRAWS = 20000
+DEFAULT_BINS = 50
+# draws scored per vectorized call, to bound the size of the temporaries
+CHUNK_DRAWS = 8192
+
+# WCS variance below this is rounding noise (the app's score does not move)
+_MIN_VARIANCE = 1e-12
+# spread of the default distributions around each default value
+_WEIGHT_SPREAD = 0.5
+_BOUND_SPREAD = 0.25
+
+
+def default_parameter_specs() -> Dict[str, Dict[str, Any]]:
+    """
+    Uniform distributions around every DEFAULT_PARAMS value: WCS weights
+    within +-50%, normalization bounds within +-25% (bounds of 0 stay fixed).
+    """
+    specs = {}
+    for name, value in DEFAULT_PARAMS.items():
+        if not value:
+            continue
+        spread = _WEIGHT_SPREAD if name.startswith("wcs.") else _BOUND_SPREAD
+        specs[name] = {"dist": "uniform", "low": value * (1 - spread), "high": value * (1 + spread)}
+    return specs
+
+
+def sample_parameter(spec: Dict[str, Any], draws: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    draws samples of one parameter. spec is one of
+      {dist: uniform, low, high}      {dist: loguniform, low, high}
+      {dist: normal, mean, sd}        {dist: triangular, low, mode, high}
+      {dist: fixed, value}
+    Samples are clipped at 0 (weights and range bounds are not negative).
+    """
+    dist = spec.get("dist", "uniform")
+    if dist == "uniform":
+        values = rng.uniform(spec["low"], spec["high"], draws)
+    elif dist == "loguniform":
+        values = np.exp(rng.uniform(np.log(spec["low"]), np.log(spec["high"]), draws))
+    elif dist == "normal":
+        values = rng.normal(spec["mean"], spec["sd"], draws)
+    elif dist == "triangular":
+        values = rng.triangular(spec["low"], spec["mode"], spec["high"], draws)
+    elif dist == "fixed":
+        values = np.full(draws, float(spec["value"]))
+    else:
+        raise ValueError(f"unknown distribution {dist!r} (uniform, loguniform, normal, triangular, fixed)")
+    return np.maximum(values, 0.0)
+
+
+def load_app_levels(out_dir: str) -> List[Dict[str, Any]]:
+    """The per-app aggregates of the last `wcx evaluate` run (JSON, else CSV export)."""
+    out = Path(out_dir)
+    if (out / "apps_metrics.json").exists():
+        with (out / "apps_metrics.json").open(encoding="utf-8") as f:
+            return json.load(f)
+    if (out / "apps_metrics.csv").exists():
+        with (out / "apps_metrics.csv").open(newline="", encoding="utf-8") as f:
+            return list(csv.DictReader(f))
+    raise FileNotFoundError(f"no apps_metrics.json/.csv in {out}; run `wcx evaluate` first")
+
+
+def _ranks(wcs: np.ndarray) -> np.ndarray:
+    """Rank of each app per draw, 1 = most complex (ties keep config order)."""
+    order = np.argsort(-wcs, axis=-1, kind="stable")
+    return np.argsort(order, axis=-1, kind="stable") + 1
+
+
+def first_order_indices(samples: np.ndarray, centered: np.ndarray, total_var: np.ndarray, bins: int) -> np.ndarray:
+    """
+    Share of each output column's variance explained by one parameter alone
+    (first-order Sobol index), estimated from the Monte Carlo sample itself:
+    the draws are split into equal-count bins of the parameter, and the
+    variance of the per-bin means is divided by the total variance.
+
+    centered is the (draws, columns) output minus its column means and
+    total_var its column variances; columns without variance get NaN.
+    """
+    draws, columns = centered.shape
+    bins = max(1, min(bins, draws))
+    groups = np.empty(draws, dtype=np.int64)
+    groups[np.argsort(samples, kind="stable")] = np.arange(draws) * bins // draws
+    counts = np.bincount(groups, minlength=bins)
+    # one bincount for all columns: bin b of column j is slot b * columns + j
+    slots = (groups[:, None] * columns + np.arange(columns)).ravel()
+    sums = np.bincount(slots, weights=centered.ravel(), minlength=bins * columns).reshape(bins, columns)
+    between = (sums ** 2 / counts[:, None]).sum(axis=0) / draws
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(total_var > _MIN_VARIANCE, between / total_var, np.nan)
+
+
+def run_sensitivity(cfg, draws: Optional[int] = None, seed: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Monte Carlo sensitivity of the WCS ranking to the index weights and
+    normalization ranges.
+
+    Parameters are drawn from the distributions under `sensitivity` in
+    config.yaml (all DEFAULT_PARAMS around their defaults if none are
+    given), every app of the last evaluation is scored under every draw in
+    vectorized chunks, and the report gives each app's WCS spread and rank
+    distribution plus each parameter's first-order share of the WCS
+    variance. Written to <output.dir>/sensitivity.json.
+    """
+    settings = cfg.sensitivity or {}
+    draws = draws or settings.get("draws", DEFAULT_DRAWS)
+    seed = settings.get("seed", 0) if seed is None else seed
+    bins = settings.get("bins", DEFAULT_BINS)
+    specs = settings.get("parameters") or default_parameter_specs()
+    unknown = sorted(set(specs) - set(DEFAULT_PARAMS))
+    if unknown:
+        raise ValueError(f"unknown sensitivity parameters {unknown}; known: {sorted(DEFAULT_PARAMS)}")
+
+    out_dir = cfg.output["dir"]
+    app_levels = load_app_levels(out_dir)
+    if not app_levels:
+        raise ValueError(f"no applications in the metrics of {out_dir}")
+    columns = app_level_columns(app_levels)
+    app_ids = [str(a.get("app_id")) for a in app_levels]
+    n_apps = len(app_ids)
+
+    print(f"=== Sensitivity: {draws} draws of {len(specs)} parameter(s) over {n_apps} app(s) ===")
+
+    rng = np.random.default_rng(seed)
+    samples = {name: sample_parameter(spec, draws, rng) for name, spec in sorted(specs.items())}
+
+    wcs = np.empty((draws, n_apps))
+    for start in range(0, draws, CHUNK_DRAWS):
+        part = slice(start, start + CHUNK_DRAWS)
+        params = {name: values[part, None] for name, values in samples.items()}
+        wcs[part] = compute_raw_indices_batch(columns, params)["wcs"]
+
+    baseline = compute_raw_indices_batch(columns)["wcs"]
+    baseline_ranks = _ranks(baseline)
+    ranks = _ranks(wcs)
+
+    means = wcs.mean(axis=0)
+    total_var = wcs.var(axis=0)
+    p5, p95 = np.percentile(wcs, [5, 95], axis=0)
+    apps = []
+    for j, app_id in enumerate(app_ids):
+        rank_share = np.bincount(ranks[:, j], minlength=n_apps + 1)[1:] / draws
+        apps.append({
+            "app_id": app_id,
+            "baseline_wcs": round(float(baseline[j]), 4),
+            "baseline_rank": int(baseline_ranks[j]),
+            "wcs_mean": round(float(means[j]), 4),
+            "wcs_std": round(float(np.sqrt(total_var[j])), 4),
+            "wcs_p5": round(float(p5[j]), 4),
+            "wcs_p95": round(float(p95[j]), 4),
+            "mean_rank": round(float(ranks[:, j].mean()), 3),
+            "rank_stability": round(float(rank_share[baseline_ranks[j] - 1]), 4),
+            "rank_distribution": {str(r + 1): round(float(share), 4) for r, share in enumerate(rank_share)},
+        })
+
+    # Spearman correlation of each draw's ranking with the baseline ranking
+    if n_apps > 1:
+        d2 = ((ranks - baseline_ranks) ** 2).sum(axis=1)
+        spearman = 1 - 6 * d2 / (n_apps * (n_apps ** 2 - 1))
+        mean_spearman = round(float(spearman.mean()), 4)
+    else:
+        mean_spearman = 1.0
+
+    # shares are averaged over the apps whose WCS varies at all
+    centered = wcs - means
+    contributions = []
+    for name, values in samples.items():
+        shares = first_order_indices(values, centered, total_var, bins)
+        varying = shares[~np.isnan(shares)]
+        contributions.append({
+            "parameter": name,
+            "mean_share": round(float(varying.mean()), 4) if len(varying) else 0.0,
+            "by_app": {
+                app_id: None if np.isnan(share) else round(float(share), 4)
+                for app_id, share in zip(app_ids, shares)
+            },
+        })
+    contributions.sort(key=lambda c: c["mean_share"], reverse=True)
+
+    report = {
+        "draws": draws,
+        "seed": seed,
+        "parameters": specs,
+        "same_ranking_share": round(float((ranks == baseline_ranks).all(axis=1).mean()), 4),
+        "mean_spearman": mean_spearman,
+        "apps": apps,
+        "variance_contributions": contributions,
+    }
+
+    _print_report(report)
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    with (out / "sensitivity.json").open("w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Report written to: {out / 'sensitivity.json'}")
+    return report
+
+
+def _print_report(report: Dict[str, Any], top: int = 10) -> None:
+    print(
+        f"Same ranking as baseline in {report['same_ranking_share']:.1%} of draws "
+        f"(mean Spearman {report['mean_spearman']:.3f})"
+    )
+    for app in report["apps"]:
+        print(
+            f"  {app['app_id']}: WCS {app['baseline_wcs']:.3f} "
+            f"[p5 {app['wcs_p5']:.3f}, p95 {app['wcs_p95']:.3f}], "
+            f"rank {app['baseline_rank']} kept in {app['rank_stability']:.1%} of draws"
+        )
+    print("Largest first-order shares of WCS variance:")
+    for c in report["variance_contributions"][:top]:
+        print(f"  {c['parameter']:<28} {c['mean_share']:.3f}")
@@ -0,0 +1,297 @@
+# web_complexity_lab/serve.py
+from typing import List, Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+import hashlib
+import json
+import threading
+
+from .history import DEFAULT_LAST, DEFAULT_METRICS, RunHistory, history_path, history_report
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# rendered responses kept per data generation
+RESPONSE_CACHE_SIZE = 512
+
+TABLES = ("ui_metrics", "test_metrics", "log_metrics", "agent_metrics")
+# query parameters of /tables/<name> that are not field filters
+_PAGING_PARAMS = {"offset", "limit", "sort"}
+
+ENDPOINTS = {
+    "/apps": "indices (and bootstrap intervals) of every app",
+    "/apps/<app_id>": "app-level metrics and indices of one app",
+    "/apps/<app_id>/tests/<test_id>": "one test with its log runs and agent episodes",
+    "/tables/<table>?<field>=<value>&sort=[-]<field>&offset=0&limit=100": f"rows of {', '.join(TABLES)}",
+    "/history?app=<app_id>&metric=<metric>&last=10&since=<date>": "trends across recorded runs",
+}
+
+
+class NotFound(Exception):
+    pass
+
+
+class BadRequest(Exception):
+    pass
+
+
+class ResultStore:
+    """
+    The results_full.json of an output directory, loaded once and indexed.
+
+    Each load is an immutable _Results snapshot; a request is routed on the
+    snapshot it started with, so a reload by another thread cannot change
+    the data under it. Every rendered response is cached with its ETag:
+    each request only stats results_full.json (and, for /history, the run
+    history) and the cache key holds those mtimes, so responses are
+    rendered again only after `wcx evaluate` or `wcx watch` replaced them.
+    """
+
+    def __init__(self, out_dir: str, history_db: Optional[Path] = None):
+        self.results_path = Path(out_dir) / "results_full.json"
+        self.history_db = history_db
+        self._lock = threading.Lock()
+        self._loaded: Optional[_Results] = None
+        self._responses: "OrderedDict[Tuple, Tuple[int, bytes, str]]" = OrderedDict()
+        self.refresh()
+
+    # ------------------------------------------------------------------
+    def refresh(self) -> "_Results":
+        """The loaded results, reloaded first if results_full.json changed."""
+        mtime = _mtime_ns(self.results_path)
+        loaded = self._loaded
+        # while being replaced (mtime None) keep serving what was loaded
+        if loaded is not None and mtime in (None, loaded.mtime_ns):
+            return loaded
+        with self._lock:
+            loaded = self._loaded
+            if loaded is not None and mtime in (None, loaded.mtime_ns):
+                return loaded
+            if mtime is None:
+                raise FileNotFoundError(
+                    f"no {self.results_path}; run `wcx evaluate` with json in output.formats first"
+                )
+            with self.results_path.open(encoding="utf-8") as f:
+                self._loaded = _Results(json.load(f), mtime)
+            self._responses.clear()
+            return self._loaded
+
+    def response(self, url: str) -> Tuple[int, bytes, str]:
+        """(status, JSON body, ETag) for a request URL, rendered once per data version."""
+        data = self.refresh()
+        key: Tuple = (data.mtime_ns, url)
+        if urlsplit(url).path.rstrip("/") == "/history":
+            # stat before querying: newer rows can only be cached under an older key
+            key += (_mtime_ns(self.history_db) if self.history_db else None,)
+        with self._lock:
+            cached = self._responses.get(key)
+            if cached is not None:
+                self._responses.move_to_end(key)
+                return cached
+        try:
+            status, payload = 200, self._route(data, url)
+        except NotFound as e:
+            status, payload = 404, {"error": str(e)}
+        except BadRequest as e:
+            status, payload = 400, {"error": str(e)}
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        rendered = (status, body, f'"{hashlib.sha1(body).hexdigest()}"')
+        with self._lock:
+            self._responses[key] = rendered
+            if len(self._responses) > RESPONSE_CACHE_SIZE:
+                self._responses.popitem(last=False)
+        return rendered
+
+    # ------------------------------------------------------------------
+    def _route(self, data: "_Results", url: str) -> Any:
+        parts = urlsplit(url)
+        segments = [unquote(s) for s in parts.path.split("/") if s]
+        query = {k: v[-1] for k, v in parse_qs(parts.query, keep_blank_values=True).items()}
+
+        if not segments:
+            return {"endpoints": ENDPOINTS}
+        if segments == ["apps"]:
+            return [data.summary(app) for app in data.apps.values()]
+        if segments[0] == "apps" and len(segments) == 2:
+            app = data.app(segments[1])
+            return {**data.summary(app), "app_level": app["app_level"]}
+        if segments[0] == "apps" and len(segments) == 4 and segments[2] == "tests":
+            return data.test(data.app(segments[1])["app_id"], segments[3])
+        if segments[0] == "tables" and len(segments) == 2:
+            return data.table(segments[1], query)
+        if segments == ["history"]:
+            return self._history(data, query)
+        raise NotFound(f"no endpoint {parts.path}; see / for the list")
+
+    def _history(self, data: "_Results", query: Dict[str, str]) -> Dict[str, Any]:
+        if self.history_db is None or not self.history_db.exists():
+            raise NotFound("no run history recorded")
+        app_ids = [query["app"]] if "app" in query else list(data.apps)
+        metrics = [query["metric"]] if "metric" in query else list(DEFAULT_METRICS)
+        last = _int_param(query, "last", DEFAULT_LAST)
+        try:
+            # sqlite connections are per thread, and cheap to open; read-only
+            # so serving never writes to (or touches the mtime of) the history
+            with RunHistory(self.history_db, read_only=True) as history:
+                return history_report(history, app_ids, metrics, last, query.get("since"))
+        except ValueError as e:
+            raise NotFound(str(e))
+
+
+class _Results:
+    """
+    One load of results_full.json. Tables are kept as row lists with a
+    per-field index (value -> row positions) built the first time a field
+    is filtered on, so filters are set intersections instead of scans.
+    """
+
+    def __init__(self, results: List[Dict[str, Any]], mtime_ns: int):
+        self.mtime_ns = mtime_ns
+        self.apps = {r["app_id"]: r for r in results}
+        self.tables = {name: [row for r in results for row in r.get(name, [])] for name in TABLES}
+        self._field_index: Dict[Tuple[str, str], Dict[str, List[int]]] = {}
+        self._tests = {(row["app_id"], row["test_id"]): row for row in self.tables["test_metrics"]}
+
+    def app(self, app_id: str) -> Dict[str, Any]:
+        if app_id not in self.apps:
+            raise NotFound(f"unknown app {app_id!r}")
+        return self.apps[app_id]
+
+    @staticmethod
+    def summary(app: Dict[str, Any]) -> Dict[str, Any]:
+        summary = {"app_id": app["app_id"], "indices": app["indices"]}
+        if "index_intervals" in app:
+            summary["intervals"] = app["index_intervals"]
+        return summary
+
+    def test(self, app_id: str, test_id: str) -> Dict[str, Any]:
+        test = self._tests.get((app_id, test_id))
+        runs = self._rows("log_metrics", {"app_id": app_id, "test_id": test_id})
+        episodes = self._rows("agent_metrics", {"app_id": app_id, "episode_id": test_id})
+        if test is None and not runs:
+            raise NotFound(f"unknown test {test_id!r} of {app_id!r}")
+        return {"test": test, "runs": runs, "episodes": episodes}
+
+    def _rows(self, table: str, filters: Dict[str, str]) -> List[Dict[str, Any]]:
+        rows = self.tables[table]
+        positions: Optional[set] = None
+        for field, value in filters.items():
+            matches = self._lookup(table, field).get(value, ())
+            positions = set(matches) if positions is None else positions.intersection(matches)
+        if positions is None:
+            return list(rows)
+        return [rows[i] for i in sorted(positions)]
+
+    def _lookup(self, table: str, field: str) -> Dict[str, List[int]]:
+        """value (as it appears in a query string) -> positions of the rows holding it."""
+        key = (table, field)
+        index = self._field_index.get(key)
+        if index is None:
+            # the snapshot never changes: threads racing here build equal indexes
+            index = {}
+            for i, row in enumerate(self.tables[table]):
+                index.setdefault(_query_value(row.get(field)), []).append(i)
+            self._field_index[key] = index
+        return index
+
+    def table(self, table: str, query: Dict[str, str]) -> Dict[str, Any]:
+        if table not in self.tables:
+            raise NotFound(f"unknown table {table!r}; tables: {', '.join(TABLES)}")
+        offset = _int_param(query, "offset", 0)
+        limit = min(_int_param(query, "limit", DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE)
+        rows = self._rows(table, {k: v for k, v in query.items() if k not in _PAGING_PARAMS})
+
+        sort = query.get("sort")
+        if sort:
+            field = sort.lstrip("-")
+            # rows without the field (or with None) go last in either direction
+            present = [r for r in rows if r.get(field) is not None]
+            missing = [r for r in rows if r.get(field) is None]
+            try:
+                present.sort(key=lambda r: r[field], reverse=sort.startswith("-"))
+            except TypeError:
+                raise BadRequest(f"cannot sort {table} by {field!r}: mixed value types")
+            rows = present + missing
+
+        return {
+            "table": table,
+            "total": len(rows),
+            "offset": offset,
+            "limit": limit,
+            "rows": rows[offset:offset + limit],
+        }
+
+
+def _mtime_ns(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _query_value(value: Any) -> str:
+    """How a field value is written in a query string (true/false for booleans)."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return "" if value is None else str(value)
+
+
+def _int_param(query: Dict[str, str], name: str, default: int) -> int:
+    try:
+        value = int(query.get(name, default))
+    except ValueError:
+        raise BadRequest(f"{name} must be an integer")
+    if value < 0:
+        raise BadRequest(f"{name} must not be negative")
+    return value
+
+
+class _Handler(BaseHTTPRequestHandler):
+    store: ResultStore
+
+    def do_GET(self) -> None:
+        status, body, etag = self.store.response(self.path)
+        if status == 200 and etag in _etags(self.headers.get("If-None-Match", "")):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        # cacheable, but revalidated on every poll
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass  # one line per dashboard poll is noise
+
+
+def _etags(header: str) -> List[str]:
+    return [tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()]
+
+
+def run_server(cfg, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+    """
+    Serves the results of the last evaluation (and the run history) as a
+    JSON API on http://host:port/ until interrupted; see ENDPOINTS. Uses
+    only http.server, so it runs offline.
+    """
+    store = ResultStore(cfg.output["dir"], history_path(cfg))
+    handler = type("Handler", (_Handler,), {"store": store})
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f"Serving {store.results_path} on http://{host}:{server.server_port}/ ; Ctrl+C to stop")
+    for path, description in ENDPOINTS.items():
+        print(f"  {path:<70} {description}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Stopped serving")
+    finally:
+        server.server_close()
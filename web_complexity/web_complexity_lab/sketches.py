@@ -0,0 +1,255 @@
+# web_complexity_lab/sketches.py
+from typing import List, Dict, Any
+import hashlib
+import math
+
+
+class RunningStats:
+    """
+    One-pass count / sum / mean / min / max / variance of a numeric stream.
+
+    Values are folded in with Welford's update and two partial results combine
+    with Chan et al.'s formula, so stats built per file or per shard merge into
+    the same result as a single pass over everything. The mean is reported as
+    sum / count, which is exact for the integer DOM sizes the collectors feed.
+    """
+
+    __slots__ = ("count", "total", "min", "max", "_mean", "_m2")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, x) -> None:
+        if self.count == 0:
+            self.min = self.max = x
+        else:
+            self.min = min(self.min, x)
+            self.max = max(self.max, x)
+        self.count += 1
+        self.total += x
+        delta = x - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (x - self._mean)
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Fold other into self (in place) and return self."""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            for name in self.__slots__:
+                setattr(self, name, getattr(other, name))
+            return self
+
+        n = self.count + other.count
+        delta = other._mean - self._mean
+        self._mean += delta * other.count / n
+        self._m2 += other._m2 + delta * delta * self.count * other.count / n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.count = n
+        self.total += other.total
+        return self
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0
+
+    @property
+    def variance(self) -> float:
+        """Population variance."""
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+            "mean": self._mean,
+            "m2": self._m2,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RunningStats":
+        stats = cls()
+        stats.count = data["count"]
+        stats.total = data["total"]
+        stats.min = data["min"]
+        stats.max = data["max"]
+        stats._mean = data["mean"]
+        stats._m2 = data["m2"]
+        return stats
+
+
+class DistinctCounter:
+    """
+    Mergeable distinct count.
+
+    Exact (a set of 64-bit hashes) up to EXACT_LIMIT values, then a
+    HyperLogLog with 2**P registers (~1.6% standard error) so memory stays
+    bounded however many distinct values a long log contains. Merging two
+    counters gives the same state as counting both streams together.
+    """
+
+    EXACT_LIMIT = 1024
+    P = 12
+
+    def __init__(self):
+        self.hashes = set()
+        self.registers = None  # bytearray once the exact set overflows
+
+    def add(self, value) -> None:
+        self._add_hash(_hash64(value))
+
+    def _add_hash(self, h: int) -> None:
+        if self.registers is None:
+            self.hashes.add(h)
+            if len(self.hashes) > self.EXACT_LIMIT:
+                self._to_registers()
+            return
+
+        idx = h >> (64 - self.P)
+        rest = h & ((1 << (64 - self.P)) - 1)
+        rank = (64 - self.P) - rest.bit_length() + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def _to_registers(self) -> None:
+        hashes, self.hashes = self.hashes, set()
+        self.registers = bytearray(1 << self.P)
+        for h in hashes:
+            self._add_hash(h)
+
+    def merge(self, other: "DistinctCounter") -> "DistinctCounter":
+        """Fold other into self (in place) and return self."""
+        if other.registers is None:
+            for h in other.hashes:
+                self._add_hash(h)
+            return self
+
+        if self.registers is None:
+            self._to_registers()
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+        return self
+
+    def count(self) -> int:
+        if self.registers is None:
+            return len(self.hashes)
+
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # small-range correction (linear counting)
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self.registers is None:
+            return {"hashes": sorted(self.hashes)}
+        return {"registers": self.registers.hex()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DistinctCounter":
+        counter = cls()
+        if "registers" in data:
+            counter.registers = bytearray.fromhex(data["registers"])
+        else:
+            counter.hashes = set(data["hashes"])
+        return counter
+
+
+class QuantileSketch:
+    """
+    KLL quantile sketch (Karnin, Lang & Liberty).
+
+    Values are buffered in levels; when a level reaches its capacity it is
+    sorted and every other item is promoted to the next level with twice the
+    weight. Memory is O(k) however many values are added, quantiles are exact
+    until the first compaction (< k values), and two sketches merge by
+    concatenating their levels and compacting. Compaction alternates between
+    odd and even items instead of flipping a coin, so results are reproducible.
+    """
+
+    def __init__(self, k: int = 200):
+        self.k = k
+        self.count = 0
+        self.levels: List[List[float]] = [[]]
+        self._flips: List[int] = [0]
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def add(self, x: float) -> None:
+        self.levels[0].append(x)
+        self.count += 1
+        if len(self.levels[0]) >= self._capacity(0):
+            self._compress()
+
+    def _compress(self) -> None:
+        h = 0
+        while h < len(self.levels):
+            if len(self.levels[h]) >= self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append([])
+                    self._flips.append(0)
+                items = sorted(self.levels[h])
+                # an odd item out stays behind with its current weight
+                self.levels[h] = [items.pop()] if len(items) % 2 else []
+                self.levels[h + 1].extend(items[self._flips[h]::2])
+                self._flips[h] ^= 1
+            h += 1
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Fold other into self (in place) and return self."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+            self._flips.append(0)
+        for h, items in enumerate(other.levels):
+            self.levels[h].extend(items)
+        self.count += other.count
+        while any(len(items) >= self._capacity(h) for h, items in enumerate(self.levels)):
+            self._compress()
+        return self
+
+    def quantile(self, q: float) -> float:
+        """Nearest-rank q-quantile (0 <= q <= 1); 0.0 for an empty sketch."""
+        weighted = sorted(
+            (value, 1 << h) for h, items in enumerate(self.levels) for value in items
+        )
+        if not weighted:
+            return 0.0
+        target = q * sum(w for _, w in weighted)
+        cumulative = 0
+        for value, weight in weighted:
+            cumulative += weight
+            if cumulative >= target:
+                return value
+        return weighted[-1][0]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"k": self.k, "count": self.count, "levels": self.levels, "flips": self._flips}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        sketch = cls(data["k"])
+        sketch.count = data["count"]
+        sketch.levels = [list(items) for items in data["levels"]]
+        sketch._flips = list(data["flips"])
+        return sketch
+
+
+def _hash64(value) -> int:
+    digest = hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
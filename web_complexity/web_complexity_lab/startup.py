@@ -0,0 +1,98 @@
+# web_complexity_lab/startup.py
+from typing import List, Dict, Any
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+# milliseconds `wcx --help` may take on top of a bare `python -c pass`
+DEFAULT_BUDGET_MS = 50.0
+DEFAULT_REPEATS = 15
+# loaded by the commands that use them, never by `wcx --help`
+HEAVY_MODULES = (
+    "numpy",
+    "yaml",
+    "asyncio",
+    "sqlite3",
+    "http.server",
+    "concurrent.futures.process",
+    "web_complexity_lab.pipeline",
+    "web_complexity_lab.exporters.html_exporter",
+)
+
+HELP_COMMAND = ["-m", "web_complexity_lab.cli", "--help"]
+
+
+def _median_ms(args: List[str], repeats: int) -> float:
+    """Median wall time of `python <args>` in fresh interpreters."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], stdout=subprocess.DEVNULL, check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def imported_modules(args: List[str]) -> Dict[str, int]:
+    """Modules imported by `python <args>` with their cumulative import time in microseconds."""
+    done = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True,
+    )
+    modules = {}
+    for line in done.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        fields = line.split("|")
+        if len(fields) == 3 and fields[1].strip().isdigit():
+            modules[fields[2].strip()] = int(fields[1])
+    return modules
+
+
+def check_startup(budget_ms: float = DEFAULT_BUDGET_MS, repeats: int = DEFAULT_REPEATS) -> Dict[str, Any]:
+    """
+    Times `wcx --help` against a bare interpreter and lists the HEAVY_MODULES
+    it imports. ok is False if it is over budget or imports any of them.
+    """
+    bare = _median_ms(["-c", "pass"], repeats)
+    wcx = _median_ms(HELP_COMMAND, repeats)
+    modules = imported_modules(HELP_COMMAND)
+    heavy = sorted(m for m in modules if m in HEAVY_MODULES)
+    overhead = wcx - bare
+    return {
+        "bare_ms": round(bare, 1),
+        "help_ms": round(wcx, 1),
+        "overhead_ms": round(overhead, 1),
+        "budget_ms": budget_ms,
+        "heavy_imports": heavy,
+        "slowest_imports": sorted(modules.items(), key=lambda kv: kv[1], reverse=True)[:5],
+        "ok": overhead <= budget_ms and not heavy,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m web_complexity_lab.startup",
+        description="Fail if `wcx --help` starts slower than the budget or imports heavy modules",
+    )
+    parser.add_argument(
+        "--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="Allowed overhead over a bare interpreter"
+    )
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Runs per measurement (median)")
+    args = parser.parse_args()
+
+    report = check_startup(args.budget_ms, args.repeats)
+    print(
+        f"wcx --help: {report['help_ms']} ms, bare interpreter: {report['bare_ms']} ms, "
+        f"overhead {report['overhead_ms']} ms (budget {report['budget_ms']:g} ms)"
+    )
+    for name, micros in report["slowest_imports"]:
+        print(f"  {name:<50} {micros / 1000:.1f} ms")
+    if report["heavy_imports"]:
+        print(f"Imported at startup: {', '.join(report['heavy_imports'])}")
+    if not report["ok"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
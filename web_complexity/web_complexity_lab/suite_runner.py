@@ -0,0 +1,306 @@
+# web_complexity_lab/suite_runner.py
+from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
+from pathlib import Path
+import heapq
+import json
+import os
+import secrets
+import socket
+import subprocess
+import sys
+import time
+
+from .collectors.log_parser import LogParser
+
+# Generated tests connect to this endpoint instead of launching their own browser
+WS_ENDPOINT_ENV = "PW_WS_ENDPOINT"
+
+DEFAULT_EXPECTED_MS = 1000.0
+
+
+def discover_generated_tests(cfg, app_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Finds the Python test files (test_*.py) under every app's tests.test_paths
+    and attaches the expected duration taken from the app's JSON step logs.
+    """
+    tests: List[Dict[str, Any]] = []
+
+    for app in cfg.applications:
+        if app_ids and app.id not in app_ids:
+            continue
+
+        root = Path(app.root_path)
+        history = _historical_durations(app)
+
+        for rel_path in app.tests.get("test_paths", []):
+            test_dir = root / rel_path
+            if not test_dir.exists():
+                continue
+            for test_file in sorted(test_dir.rglob("test_*.py")):
+                if not test_file.is_file():
+                    continue
+                tests.append({
+                    "app_id": app.id,
+                    "root_path": str(root),
+                    "file": str(test_file),
+                    "test_id": test_file.stem,
+                    "expected_ms": history.get(test_file.stem),
+                })
+
+    # Tests without history get the mean of the known ones
+    known = [t["expected_ms"] for t in tests if t["expected_ms"]]
+    fallback = sum(known) / len(known) if known else DEFAULT_EXPECTED_MS
+    for t in tests:
+        if not t["expected_ms"]:
+            t["expected_ms"] = fallback
+
+    return tests
+
+
+def _historical_durations(app) -> Dict[str, float]:
+    """test_id -> total duration (ms) summed from the per-step `duration` fields."""
+    return {
+        rec["test_id"]: rec["duration_ms"]
+        for rec in LogParser(app).collect()
+        if rec.get("duration_ms")
+    }
+
+
+def _lpt_order(tests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return sorted(tests, key=lambda t: (-t["expected_ms"], t["file"]))
+
+
+def plan_shards(tests: List[Dict[str, Any]], n: int) -> List[List[Dict[str, Any]]]:
+    """
+    Longest-processing-time-first: hand each test (longest first) to the
+    shard with the smallest expected load so far.
+    """
+    n = max(1, n)
+    shards: List[List[Dict[str, Any]]] = [[] for _ in range(n)]
+    heap: List[Tuple[float, int]] = [(0.0, i) for i in range(n)]
+
+    for t in _lpt_order(tests):
+        load, i = heapq.heappop(heap)
+        shards[i].append(t)
+        heapq.heappush(heap, (load + t["expected_ms"], i))
+
+    return shards
+
+
+# Run by the Node.js bundled with Playwright for Python: launches one Chromium
+# and serves it on ws://<host>:<port><ws path> until terminated.
+# argv: driver package directory, host, port, ws path
+_LAUNCH_SERVER_JS = """\
+const { chromium } = require(process.argv[1]);
+chromium
+  .launchServer({ host: process.argv[2], port: Number(process.argv[3]), wsPath: process.argv[4] })
+  .catch((error) => { console.error(error.message); process.exit(1); });
+"""
+
+
+class BrowserServer:
+    """
+    One Chromium shared by all workers of a pool.
+
+    The Python API has no BrowserType.launch_server, and `playwright
+    run-server` launches a new browser for every client. So this runs
+    chromium.launchServer() of the Node.js driver that ships with
+    Playwright for Python: every chromium.connect(ws_endpoint) gets its own
+    context in that single browser process.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", startup_timeout: float = 30.0):
+        self.host = host
+        self.startup_timeout = startup_timeout
+        self.ws_endpoint = ""
+        self._proc: Optional[subprocess.Popen] = None
+
+    def __enter__(self) -> "BrowserServer":
+        node, package_dir, env = _playwright_driver()
+        port = _free_port(self.host)
+        ws_path = f"/wcx-{secrets.token_hex(8)}"
+        self._proc = subprocess.Popen(
+            [node, "-e", _LAUNCH_SERVER_JS, package_dir, self.host, str(port), ws_path],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+
+        # the server listens once the browser is up
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self._proc.poll() is not None:
+                error = self._proc.stderr.read().strip()
+                self._proc = None
+                raise RuntimeError(f"browser server exited early: {error or 'no output'}")
+            try:
+                with socket.create_connection((self.host, port), timeout=0.5):
+                    break
+            except OSError:
+                time.sleep(0.1)
+        else:
+            self.__exit__(None, None, None)
+            raise RuntimeError(f"browser server did not listen on port {port}")
+
+        self.ws_endpoint = f"ws://{self.host}:{port}{ws_path}"
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._proc is None:
+            return
+        # SIGTERM: Playwright closes the browser before exiting
+        self._proc.terminate()
+        try:
+            self._proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+        self._proc.stderr.close()
+        self._proc = None
+
+
+def _playwright_driver() -> Tuple[str, str, Dict[str, str]]:
+    """(node executable, driver package directory, environment) of Playwright for Python."""
+    try:
+        from playwright._impl._driver import compute_driver_executable, get_driver_env
+    except ImportError:
+        raise RuntimeError("the shared browser needs Playwright for Python (pip install playwright)")
+    node, cli = compute_driver_executable()
+    return str(node), str(Path(cli).parent), get_driver_env()
+
+
+def _free_port(host: str) -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind((host, 0))
+        return s.getsockname()[1]
+
+
+def _run_one(test: Dict[str, Any], env: Dict[str, str], timeout: Optional[float]) -> Dict[str, Any]:
+    """Run one generated test file in its own pytest process."""
+    cmd = [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", test["file"]]
+    start = time.monotonic()
+    try:
+        proc = subprocess.run(
+            cmd,
+            cwd=test["root_path"],
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+        returncode = proc.returncode
+        output = proc.stdout + proc.stderr
+    except subprocess.TimeoutExpired:
+        returncode = -1
+        output = f"timed out after {timeout}s"
+    duration_ms = round((time.monotonic() - start) * 1000, 1)
+
+    # generated tests record a failing step and go on, so pytest may still pass
+    steps = _read_step_log(Path(test["file"]))
+    failed_steps = sum(1 for s in steps if s.get("status", "passed") not in ("passed", "skipped"))
+
+    return {
+        "app_id": test["app_id"],
+        "test_id": test["test_id"],
+        "file": test["file"],
+        "status": "passed" if returncode == 0 and not failed_steps else "failed",
+        "returncode": returncode,
+        "failed_steps": failed_steps,
+        "expected_ms": round(test["expected_ms"], 1),
+        "duration_ms": duration_ms,
+        "output_tail": output[-4000:],
+        "steps": steps,
+    }
+
+
+def _read_step_log(test_file: Path) -> List[Dict[str, Any]]:
+    """Steps streamed by the generated test into tests/logs/<name>.jsonl (or the older .json)."""
+    log_path = test_file.parent.parent / "logs" / f"{test_file.stem}.jsonl"
+    try:
+        with log_path.open(encoding="utf-8") as f:
+            return list(LogParser._iter_jsonl_steps(f))
+    except OSError:
+        pass
+
+    try:
+        data = json.loads(log_path.with_suffix(".json").read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return []
+    return data if isinstance(data, list) else []
+
+
+def run_generated_tests(
+    cfg,
+    workers: int = 0,
+    shard: Optional[Tuple[int, int]] = None,
+    app_ids: Optional[List[str]] = None,
+    shared_browser: bool = True,
+    timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Runs the generated Python tests of all configured apps on a pool of
+    worker processes, longest expected test first, and writes
+
+      out_dir/test_runs/<app_id>/<test_id>.json   # per-test record + steps
+      out_dir/test_runs/report.json               # merged report
+
+    shard=(k, m) runs only the k-th (1-based) of m LPT-balanced shards, for
+    splitting the suite across machines.
+    """
+    workers = workers or os.cpu_count() or 1
+    tests = discover_generated_tests(cfg, app_ids)
+    if shard:
+        index, total = shard
+        tests = plan_shards(tests, total)[index - 1]
+
+    print(f"=== Running {len(tests)} generated tests on {workers} workers ===")
+
+    env = dict(os.environ)
+    results: List[Dict[str, Any]] = []
+    wall_start = time.monotonic()
+
+    with ExitStack() as stack:
+        if shared_browser and tests:
+            server = stack.enter_context(BrowserServer())
+            env[WS_ENDPOINT_ENV] = server.ws_endpoint
+            print(f"Shared browser server: {server.ws_endpoint}")
+
+        # The executor queue is FIFO, so submitting in LPT order makes idle
+        # workers always pick the longest remaining test.
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_one, t, env, timeout) for t in _lpt_order(tests)]
+            for fut in as_completed(futures):
+                r = fut.result()
+                results.append(r)
+                print(f"[{r['status'].upper()}] {r['app_id']}/{r['test_id']} ({r['duration_ms']:.0f} ms)")
+
+    wall_ms = round((time.monotonic() - wall_start) * 1000, 1)
+    results.sort(key=lambda r: (r["app_id"], r["file"]))
+
+    out = Path(cfg.output["dir"]) / "test_runs"
+    for r in results:
+        app_dir = out / r["app_id"]
+        app_dir.mkdir(parents=True, exist_ok=True)
+        with (app_dir / f"{r['test_id']}.json").open("w", encoding="utf-8") as f:
+            json.dump(r, f, ensure_ascii=False, indent=2)
+
+    sum_ms = round(sum(r["duration_ms"] for r in results), 1)
+    report = {
+        "workers": workers,
+        "shard": list(shard) if shard else None,
+        "total_tests": len(results),
+        "passed": sum(1 for r in results if r["status"] == "passed"),
+        "failed": sum(1 for r in results if r["status"] != "passed"),
+        "wall_time_ms": wall_ms,
+        "sum_test_time_ms": sum_ms,
+        "speedup": round(sum_ms / wall_ms, 2) if wall_ms else 0.0,
+        "tests": [{k: v for k, v in r.items() if k not in ("steps", "output_tail")} for r in results],
+    }
+    out.mkdir(parents=True, exist_ok=True)
+    with (out / "report.json").open("w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"Report written to: {out / 'report.json'}")
+    return report
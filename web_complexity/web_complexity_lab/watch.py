@@ -0,0 +1,123 @@
+# web_complexity_lab/watch.py
+from typing import List, Dict, Any, Optional, Tuple
+from pathlib import Path
+import time
+
+from .collectors.result_cache import CACHE_FILENAME
+from .collectors.ui_structure_collector import HTML_DIRS
+from .pipeline import evaluate_app, export_results
+
+DEFAULT_INTERVAL = 1.0
+DEFAULT_DEBOUNCE = 2.0
+# what the collectors read below the test, JUnit and agent log paths
+WATCHED_SUFFIXES = (".ts", ".py", ".json", ".jsonl", ".xml")
+
+Snapshot = Dict[Path, Tuple[int, int]]
+
+
+def watched_files(app) -> Snapshot:
+    """
+    (size, mtime_ns) of every file the collectors of one app read: the tests,
+    JUnit and agent log paths (recursively) and the *.html files of HTML_DIRS.
+    """
+    root = Path(app.root_path)
+    agents_cfg = app.agents if isinstance(app.agents, dict) else {}
+    rel_paths = (
+        list(app.tests.get("test_paths", []))
+        + list(app.logs.get("junit_paths", []))
+        + list(agents_cfg.get("log_paths", []))
+    )
+
+    snapshot: Snapshot = {}
+    for rel in rel_paths:
+        directory = root / rel
+        if directory.is_dir():
+            _stat_all(directory.rglob("*"), snapshot, WATCHED_SUFFIXES)
+    for rel in HTML_DIRS:
+        directory = root / rel
+        if directory.is_dir():
+            _stat_all(directory.glob("*.html"), snapshot, (".html",))
+    return snapshot
+
+
+def _stat_all(paths, snapshot: Snapshot, suffixes: Tuple[str, ...]) -> None:
+    for p in paths:
+        if p.suffix not in suffixes:
+            continue
+        try:
+            st = p.stat()
+        except OSError:
+            continue  # removed while listing
+        if not p.is_dir():
+            snapshot[p] = (st.st_size, st.st_mtime_ns)
+
+
+def changed_files(before: Snapshot, after: Snapshot) -> List[Path]:
+    """Files added, removed or modified between two snapshots."""
+    return sorted(p for p in before.keys() | after.keys() if before.get(p) != after.get(p))
+
+
+def run_watch(
+    cfg,
+    interval: float = DEFAULT_INTERVAL,
+    debounce: float = DEFAULT_DEBOUNCE,
+    parse_workers: int = 1,
+    parse_pool: str = "thread",
+    max_cycles: Optional[int] = None,
+) -> None:
+    """
+    Keeps the exports up to date while tests and logs are being written.
+
+    Evaluates every app once, then polls the files each app's collectors
+    read every `interval` seconds. Changes are collected until none arrived
+    for `debounce` seconds; then only the touched apps are re-evaluated.
+    The result cache (always on here) re-parses only the files that changed
+    and the other apps keep their results in memory. Exports are written
+    through export_results, which leaves unchanged files alone. Runs until
+    interrupted, or for max_cycles re-evaluations. Watch cycles are not
+    added to the run history.
+    """
+    out_dir = cfg.output["dir"]
+    formats = cfg.output.get("formats", ["csv"])
+    cache_path = str(Path(out_dir) / CACHE_FILENAME)
+
+    def evaluate(app) -> Dict[str, Any]:
+        return evaluate_app(app, cache_path=cache_path, parse_workers=parse_workers, parse_pool=parse_pool)
+
+    snapshots = {app.id: watched_files(app) for app in cfg.applications}
+    results = {app.id: evaluate(app) for app in cfg.applications}
+    export_results(list(results.values()), out_dir, formats)
+
+    files = sum(len(s) for s in snapshots.values())
+    print(f"Watching {files} file(s) of {len(snapshots)} app(s) every {interval:g}s; Ctrl+C to stop")
+
+    pending: Dict[str, int] = {}
+    last_change = 0.0
+    cycles = 0
+    try:
+        while max_cycles is None or cycles < max_cycles:
+            time.sleep(interval)
+            for app in cfg.applications:
+                current = watched_files(app)
+                changed = changed_files(snapshots[app.id], current)
+                if changed:
+                    snapshots[app.id] = current
+                    pending[app.id] = pending.get(app.id, 0) + len(changed)
+                    last_change = time.monotonic()
+
+            if not pending or time.monotonic() - last_change < debounce:
+                continue
+
+            for app in cfg.applications:
+                if app.id not in pending:
+                    continue
+                print(f"{app.id}: {pending[app.id]} file change(s)")
+                before = results[app.id]["indices"]["wcs"]
+                results[app.id] = evaluate(app)
+                print(f"{app.id}: WCS {before} -> {results[app.id]['indices']['wcs']}")
+            written = export_results([results[app.id] for app in cfg.applications], out_dir, formats)
+            print(f"Exports rewritten: {', '.join(p.name for p in written) or 'none'}")
+            pending = {}
+            cycles += 1
+    except KeyboardInterrupt:
+        print("Stopped watching")